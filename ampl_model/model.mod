@@ -52,14 +52,15 @@ s.t. ReleaseDate {J in JOBS, t in 0..H: t < r[J] + p[J]}:
 # (4) Capacità della macchina:
 #     in ogni istante t può esserci *al massimo un job in lavorazione*
 #
-#     Un job che finisce a time = τ occupa la macchina nei tempi:
-#         [τ - p[j], ..., τ - 1]
+#     Un job che finisce a time = τ occupa la macchina negli slot:
+#         [τ - p[j] + 1, ..., τ]      (slot t = intervallo [t-1, t))
 #
 #     Per ogni time-slot t controlliamo tutti i job che potrebbero
-#     ancora essere in lavorazione in quell'intervallo.
+#     essere in lavorazione in quello slot, cioè quelli che
+#     terminano in τ ∈ [t, t + p[j] - 1].
 #
 s.t. MachineCapacity {t in 0..H}:
-    sum {J in JOBS, tau in max(0, t - p[J] + 1) .. t} x[J, tau]  <= 1;
+    sum {J in JOBS, tau in t .. min(H, t + p[J] - 1)} x[J, tau]  <= 1;
 
 
 # (5) Vincolo di tardività:
@@ -38,7 +38,7 @@ s.t. ReleaseDate {J in JOBS, t in 0..H: t < r[J] + p[J]}:
     x[J,t] = 0;
 
 s.t. MachineCapacity {t in 0..H}:
-    sum {J in JOBS, tau in max(0, t - p[J] + 1) .. t} x[J, tau] <= 1;
+    sum {J in JOBS, tau in t .. min(H, t + p[J] - 1)} x[J, tau] <= 1;
 
 s.t. Tardiness {J in JOBS}:
     C[J] <= d[J] + H * U[J];
@@ -0,0 +1,228 @@
+# algorithm_selection.py
+#
+# Selezione per istanza della configurazione del B&B, senza correre tutte le
+# strategie in parallelo (portfolio.py): si calcolano feature economiche
+# dell'istanza e si sceglie la configurazione con il tempo previsto minimo.
+#
+# Feature (vettoriali con numpy, più Moore e l'euristica, O(n log n)):
+#   - n, H (orizzonte max d - min r)
+#   - tightness     : slack medio (d - r - p) / p
+#   - release_spread: (max r - min r) / H
+#   - load          : sum p / H
+#   - moore_gap     : (UB euristico - lower bound di Moore) / n
+#   - blocks        : blocchi indipendenti (finestre [r, d] che non si
+#                     sovrappongono, ordinando per r)
+#
+# Modello: k-nearest-neighbour per configurazione sulle feature
+# standardizzate; il tempo previsto è la media dei log(runtime) dei k
+# vicini. Si addestra sui CSV dei benchmark (tests/tests_with_scal_param.py,
+# colonne "feat_*", "config", "runtime_s") e si salva in JSON:
+#
+#   python branch_and_bound/algorithm_selection.py retrain tests/results/*.csv
+#
+# Le righe ferme al node_limit contano PENALTY volte il loro tempo.
+
+import argparse
+import csv
+import json
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+from bb import heuristic_upper_bound
+from config import SolverConfig
+from lower_bound.lower_bound import compute_lb_moore
+
+FEATURES = ("n", "H", "tightness", "release_spread", "load", "moore_gap", "blocks")
+_LOG_FEATURES = ("n", "H", "blocks")               # scala logaritmica nella distanza
+
+# configurazioni tra cui si sceglie (kwargs di SolverConfig)
+CANDIDATES: Dict[str, Dict] = {
+    "adaptive": {},
+    "PEDD_only": {"bounds": ("moore",)},
+    "PEDD+KP": {"bounds": ("moore", "kp"), "adaptive_bounds": False},
+    "edd": {"branching": "edd"},
+    "min_slack": {"branching": "min_slack"},
+    "best_first": {"branching": "edd", "node_selection": "best_first"},
+}
+DEFAULT = "adaptive"
+DEFAULT_MODEL = os.path.join(os.path.dirname(__file__), "selector_model.json")
+PENALTY = 10
+
+
+# ==========================
+# FEATURE
+# ==========================
+
+def instance_features(jobs: List[Job]) -> Dict[str, float]:
+    """Feature dell'istanza (chiavi FEATURES)."""
+    n = len(jobs)
+    if n == 0:
+        return dict.fromkeys(FEATURES, 0.0)
+    r = np.fromiter((job.r for job in jobs), dtype=np.int64, count=n)
+    p = np.fromiter((job.p for job in jobs), dtype=np.int64, count=n)
+    d = np.fromiter((job.d for job in jobs), dtype=np.int64, count=n)
+    H = max(1, int(d.max() - r.min()))
+
+    # un blocco finisce dove la prossima release non precede nessuna scadenza
+    order = np.argsort(r, kind="stable")
+    reach = np.maximum.accumulate(d[order])
+    blocks = 1 + int(np.count_nonzero(r[order][1:] >= reach[:-1]))
+
+    ub, _ = heuristic_upper_bound(jobs)
+    return {
+        "n": float(n),
+        "H": float(H),
+        "tightness": float(np.mean((d - r - p) / np.maximum(p, 1))),
+        "release_spread": float(r.max() - r.min()) / H,
+        "load": float(p.sum()) / H,
+        "moore_gap": (ub - compute_lb_moore(jobs)) / n,
+        "blocks": float(blocks),
+    }
+
+
+def _vector(features: Dict[str, float]) -> np.ndarray:
+    return np.array([math.log1p(features[f]) if f in _LOG_FEATURES else features[f]
+                     for f in FEATURES], dtype=float)
+
+
+# ==========================
+# MODELLO
+# ==========================
+
+def train(rows: Sequence[Dict], k: int = 5) -> Dict:
+    """
+    rows: dizionari con FEATURES, "config" (chiave di CANDIDATES), "runtime_s"
+          e opzionale "hit_node_limit". Restituisce il modello (serializzabile).
+    """
+    X = np.array([_vector(row) for row in rows], dtype=float)
+    if len(X) == 0:
+        raise ValueError("train: nessuna riga utilizzabile")
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    points: Dict[str, List] = {}
+    for row, x in zip(rows, X):
+        seconds = max(float(row["runtime_s"]), 1e-6)
+        if row.get("hit_node_limit"):
+            seconds *= PENALTY
+        points.setdefault(row["config"], []).append([*((x - mean) / std), math.log(seconds)])
+    return {"features": list(FEATURES), "k": k, "mean": mean.tolist(), "std": std.tolist(),
+            "configs": {name: CANDIDATES[name] for name in points},
+            "points": points}
+
+
+def predict(model: Dict, features: Dict[str, float]) -> Dict[str, float]:
+    """Secondi previsti per ogni configurazione del modello."""
+    z = (_vector(features) - np.array(model["mean"])) / np.array(model["std"])
+    out = {}
+    for name, pts in model["points"].items():
+        pts = np.array(pts, dtype=float)
+        dist = np.linalg.norm(pts[:, :-1] - z, axis=1)
+        near = np.argsort(dist, kind="stable")[:model["k"]]
+        out[name] = float(np.exp(pts[near, -1].mean()))
+    return out
+
+
+def load_model(path: str = DEFAULT_MODEL) -> Optional[Dict]:
+    """Modello salvato da retrain (None se il file non esiste)."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def select_config(jobs: List[Job], model: Optional[Dict] = None, **overrides) -> SolverConfig:
+    """
+    SolverConfig prevista più veloce per l'istanza (model None = DEFAULT_MODEL;
+    senza modello si usa DEFAULT). overrides: altri kwargs di SolverConfig
+    (node_limit, solutions, ...).
+    """
+    model = model if model is not None else load_model()
+    name = DEFAULT
+    if model is not None:
+        times = predict(model, instance_features(jobs))
+        name = min(times, key=lambda c: (times[c], c != DEFAULT))
+    params = dict(model["configs"][name]) if model is not None else dict(CANDIDATES[name])
+    if "bounds" in params:
+        params["bounds"] = tuple(params["bounds"])
+    params.update(overrides)
+    params.setdefault("name", name)
+    return SolverConfig(**params)
+
+
+# ==========================
+# RIADDESTRAMENTO DAI CSV
+# ==========================
+
+def read_rows(paths: Sequence[str]) -> List[Dict]:
+    """Righe dei CSV con tutte le feature e una configurazione di CANDIDATES."""
+    rows = []
+    for path in paths:
+        with open(path, newline="") as f:
+            for raw in csv.DictReader(f):
+                if raw.get("config") not in CANDIDATES or not raw.get("runtime_s"):
+                    continue
+                if any(not raw.get(f"feat_{name}") for name in FEATURES):
+                    continue
+                row = {name: float(raw[f"feat_{name}"]) for name in FEATURES}
+                row["config"] = raw["config"]
+                row["runtime_s"] = float(raw["runtime_s"])
+                row["hit_node_limit"] = raw.get("hit_node_limit") == "True"
+                rows.append(row)
+    return rows
+
+
+def evaluate(rows: Sequence[Dict], k: int = 5) -> Dict[str, float]:
+    """
+    Leave-one-instance-out: per ogni istanza (stesse feature) si addestra
+    sulle altre e si confronta il tempo della configurazione scelta con
+    DEFAULT e con la migliore a posteriori. Restituisce i tempi totali.
+    """
+    instances: Dict[tuple, Dict[str, float]] = {}
+    for row in rows:
+        seconds = row["runtime_s"] * (PENALTY if row["hit_node_limit"] else 1)
+        instances.setdefault(tuple(row[f] for f in FEATURES), {})[row["config"]] = seconds
+    total = {"selected": 0.0, "default": 0.0, "oracle": 0.0}
+    for key, times in instances.items():
+        if DEFAULT not in times:
+            continue
+        model = train([row for row in rows if tuple(row[f] for f in FEATURES) != key], k=k)
+        pred = predict(model, dict(zip(FEATURES, key)))
+        pred = {c: t for c, t in pred.items() if c in times}
+        choice = min(pred, key=lambda c: (pred[c], c != DEFAULT)) if pred else DEFAULT
+        total["selected"] += times[choice]
+        total["default"] += times[DEFAULT]
+        total["oracle"] += min(times.values())
+    return total
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Selezione della configurazione del B&B per istanza")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rt = sub.add_parser("retrain", help="addestra il modello dai CSV dei benchmark")
+    rt.add_argument("csv", nargs="+", help="CSV con colonne feat_*, config, runtime_s")
+    rt.add_argument("-o", "--output", default=DEFAULT_MODEL)
+    rt.add_argument("-k", type=int, default=5, help="vicini per la previsione")
+    args = parser.parse_args(argv)
+
+    rows = read_rows(args.csv)
+    if not rows:
+        raise SystemExit("Nessuna riga con feature e configurazione nota nei CSV")
+    model = train(rows, k=args.k)
+    with open(args.output, "w") as f:
+        json.dump(model, f)
+    counts = ", ".join(f"{name}={len(pts)}" for name, pts in model["points"].items())
+    print(f"[OK] modello salvato in {args.output} ({len(rows)} righe: {counts})")
+    total = evaluate(rows, k=args.k)
+    print(f"Leave-one-out: selezionata {total['selected']:.2f}s, "
+          f"default {total['default']:.2f}s, migliore {total['oracle']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
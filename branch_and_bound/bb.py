@@ -1,6 +1,9 @@
 # bb.py
 
 from typing import List, Set, Tuple, Optional
+import copy
+import heapq
+import itertools
 import time
 import sys
 import os
@@ -11,15 +14,61 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from node import Node
 from bbStats import BnBStats
 from branch_and_bound.job import Job
-from lower_bound.lower_bound import compute_lb_moore  # <-- MOORE come LB
+from config import SolverConfig
+from feasibility import FeasibilityOracle
+from transposition import TranspositionTable
+from trail import SearchState, job_bits, edd_entries
+from solution_pool import SolutionPool
+from checkpoint import save_checkpoint, load_checkpoint, check_picklable
+from special_cases import solve_special
+from subset_dp import solve_tail, mask_to_ids
+from progress import ProgressReporter
+from callbacks import active_hooks
 
 # ==========================
 # Global per B&B
 # ==========================
 best_int: Optional[int] = None             # miglior numero di tardy trovato
-best_solutions: List[Set[int]] = []        # lista dei set T ottimi
+pool = SolutionPool()                      # set T ottimi (o solo il loro numero)
 stats = BnBStats()                         # statistiche globali
 
+# Configurazione corrente (bound, branching, selezione nodi, limiti)
+# e pipeline di lower bound costruita da essa
+current_config = SolverConfig()
+pipeline = current_config.make_pipeline()
+
+# Oracolo di fattibilità con memoria (creato per istanza in branch_and_bound)
+oracle: Optional[FeasibilityOracle] = None
+
+# Tabella di trasposizione degli stati (T, S) già chiusi
+tt: Optional[TranspositionTable] = None
+
+# Incumbent condiviso con altri processi (portfolio.py): oggetto con
+# read() -> (valore migliore noto, suo set T) e publish(valore, set T);
+# None = da soli
+incumbent_channel = None
+SHARE_EVERY = 64                            # nodi tra due sincronizzazioni
+
+# Avanzamento (config.progress_every, vedi progress.py): reporter della
+# ricerca in corso e funzione che riceve le righe (None = print)
+progress: Optional[ProgressReporter] = None
+progress_out = None
+PROGRESS_EVERY = 256                        # nodi tra due letture dell'orologio
+_frontier_bound: Optional[int] = None       # bound del nodo estratto (best-first)
+
+# Callback della ricerca (callbacks.py, installati con set_callbacks):
+# None = evento non ascoltato, il punto di aggancio costa un confronto
+callbacks = None
+_on_node = _on_prune = _on_incumbent = _on_branch = _on_bound = None
+
+# Checkpoint: ricerca in corso (per ricostruire la frontiera)
+_run_args = None                            # (jobs, test fattibilità, select_job) originali
+_active_state: Optional[SearchState] = None # stato della DFS corrente
+_dfs_queue: List[Node] = []                 # radici DFS ancora da visitare dopo quella corrente
+_open_nodes: list = []                      # heap della best-first
+_last_checkpoint = 0.0
+_start_time = 0.0
+
 
 # ==========================
 # EURISTICA UPPER BOUND
@@ -55,21 +104,34 @@ def heuristic_upper_bound(jobs: List[Job]) -> Tuple[int, Set[int]]:
 # RESET GLOBALI
 # ==========================
 
-def reset(jobs: List[Job]) -> None:
+def reset(jobs: List[Job], keep_caches: bool = False) -> None:
     """
     Inizializza:
       - best_int (upper bound iniziale)
-      - best_solutions (lista con il primo set ottimo trovato dall'euristica)
+      - pool (con il primo set ottimo trovato dall'euristica)
       - stats (statistiche a zero)
+      - pipeline (statistiche adattive e tagli dipendono dall'istanza)
+      - oracle (cache e nogood dipendono dall'istanza)
+      - tt (le chiavi condivise danno hit già nella stessa visita: una
+        tabella ereditata renderebbe la ricerca non ripetibile)
+
+    keep_caches: oracle e tt tenuti (già aggiornati all'istanza dal
+    chiamante, vedi incremental.py).
 
     Nota: conserva SEMPRE anche il set vuoto se l'UB è 0.
     """
-    global best_int, best_solutions, stats
+    global best_int, stats, oracle, tt
 
     best_int, first_sol = heuristic_upper_bound(jobs)
-    best_solutions = [first_sol]    # conserva anche set() vuoto
+    pool.reset(best_int, first_sol)    # conserva anche set() vuoto
 
     stats.reset()
+    pipeline.reset()
+    if not keep_caches:
+        oracle = None
+        tt = None
+    elif tt is not None and tt.signature != TranspositionTable.instance_signature(jobs):
+        tt = None
 
 
 # ==========================
@@ -79,85 +141,660 @@ def reset(jobs: List[Job]) -> None:
 def branch_and_bound(node: Node,
                      jobs: List[Job],
                      is_on_time_schedulable,
-                     select_job) -> None:
+                     select_job,
+                     config: Optional[SolverConfig] = None) -> None:
     """
-    Ricorsione Branch & Bound per 1 | r_j | sum U_j.
+    Branch & Bound per 1 | r_j | sum U_j a partire da node.
 
     - Usa:
         * test di fattibilità di S via is_on_time_schedulable (es. EDD preemptive)
-        * Algoritmo di Moore (rilassando le release) come lower bound numerico.
+        * la pipeline di lower bound (Moore, knapsack, Lagrangiano, LP),
+          interrotta appena il nodo è potato.
     - NON usa più EDD preemptive come LB numerico.
+
+    config (SolverConfig) sceglie bound, soglie, branching e selezione
+    dei nodi; se None resta quella corrente del modulo.
+
+    Dalla radice, se l'istanza è di una classe polinomiale (special_cases)
+    e config.fast_paths è attivo, l'ottimo si calcola direttamente: in
+    modalità "proof" la ricerca finisce lì, altrimenti diventa l'incumbent
+    e il B&B cerca solo gli altri set ottimi.
+
+    La DFS lavora sul solo node passato (T, S modificati sul posto e
+    ripristinati con la trail, vedi trail.py): a fine ricerca node è
+    tornato com'era.
     """
-    global best_int, best_solutions, stats
+    global best_int
+    _set_config(config)
 
     # Inizializza UB + set alla prima chiamata
     if best_int is None:
         best_int, first_sol = heuristic_upper_bound(jobs)
-        best_solutions = [first_sol]
+        pool.reset(best_int, first_sol)
+
+    if current_config.fast_paths and not node.T and not node.S and _fast_path(jobs):
+        return
+
+    _run(jobs, is_on_time_schedulable, select_job, [(0, node)])
+
+
+def _fast_path(jobs: List[Job]) -> bool:
+    """
+    Classi polinomiali: aggiorna l'incumbent con l'ottimo esatto.
+    True se la ricerca è già conclusa (modalità "proof": l'ottimo è
+    dimostrato, anche quando non batte l'incumbent, es. quello fittizio di
+    iterative_deepening).
+    """
+    global best_int
+    res = solve_special(jobs)
+    if res is None:
+        return False
+    stats.caso_speciale = res["class"]
+    if res["tardy"] < best_int:
+        best_int = res["tardy"]
+        pool.reset(best_int, res["tardy_set"])
+        if _on_incumbent is not None:
+            _on_incumbent(best_int, set(res["tardy_set"]))
+    return current_config.solutions == "proof"
+
+
+def resume(path: str,
+           is_on_time_schedulable=None,
+           select_job=None,
+           config: Optional[SolverConfig] = None) -> List[Job]:
+    """
+    Riprende una ricerca dal checkpoint in path (vedi checkpoint.py):
+    incumbent, pool, statistiche e frontiera tornano come al salvataggio.
+    is_on_time_schedulable / select_job / config sostituiscono quelli salvati
+    (es. config con node_limit più alto). Restituisce i job dell'istanza.
+    """
+    global best_int, oracle, tt
+    data = load_checkpoint(path)
+    jobs = [Job(*t) for t in data["jobs"]]
+
+    _set_config(config if config is not None else data["config"])
+    pipeline.reset()
+    oracle = None
+    tt = None
+
+    best_int = data["best_int"]
+    pool.__dict__.update(data["pool"].__dict__)     # stessi oggetti importati altrove
+    stats.__dict__.update(data["stats"].__dict__)
+    stats.hit_node_limit = False
+    stats.checkpoint_al_limite = False
+
+    frontier = [(key, Node(T=T, S=S, depth=depth, branch_job=job))
+                for key, T, S, depth, job in data["frontier"]]
+    _run(jobs,
+         is_on_time_schedulable or data["is_on_time_schedulable"],
+         select_job or data["select_job"],
+         frontier, elapsed=data["elapsed"], append=True)
+    return jobs
+
+
+def _run(jobs: List[Job], is_on_time_schedulable, select_job, frontier,
+         elapsed: float = 0.0, append: bool = False) -> None:
+    """
+    Visita a partire dalla frontiera [(chiave, nodo)]: in DFS i nodi si
+    visitano nell'ordine dato (a fine ricerca tornano com'erano), in
+    best-first diventano l'heap iniziale.
+    """
+    global _run_args, _active_state, _dfs_queue, _last_checkpoint, _start_time, progress, _frontier_bound
+    if current_config.checkpoint_path is not None:
+        check_picklable(is_on_time_schedulable=is_on_time_schedulable,
+                        select_job=select_job, config=current_config)
+    pool.configure(current_config.solutions, current_config.pool_limit,
+                   current_config.solutions_file, append=append)
+
+    feasible = _make_oracle(jobs, is_on_time_schedulable)
+    _make_tt(jobs)
+    bits = job_bits(jobs)
+    edd = edd_entries(jobs, bits)
+
+    _run_args = (jobs, is_on_time_schedulable, select_job)
+    _start_time = time.time() - elapsed
+    _last_checkpoint = time.time()
+    _frontier_bound = None
+    progress = None
+    if current_config.progress_every is not None:
+        progress = ProgressReporter(current_config.progress_every, out=progress_out)
+        progress.restart(elapsed, stats.nodi_generati)
+
+    select = current_config.select_job(select_job)
+    if current_config.node_selection == "best_first":
+        _best_first(frontier, jobs, feasible, select, bits, edd)
+    else:
+        _dfs_queue = [node for _, node in frontier]
+        while _dfs_queue and not (stats.hit_node_limit or stats.hit_target):
+            _active_state = SearchState(jobs, _dfs_queue.pop(0), bits, edd)
+            _dfs(_active_state, jobs, feasible, select)
+            _active_state.undo_to(0)        # fissaggi della radice
+        _active_state = None
+    if incumbent_channel is not None:
+        _share_incumbent()
+    if progress is not None:
+        done = not stats.hit_node_limit
+        progress.report(stats, best_int, best_int if done else _global_bound(), final=done)
+    pool.close()
+    _sync_oracle_stats()
+    _sync_tt_stats()
+
+
+# ==========================
+# CHECKPOINT
+# ==========================
+
+def _checkpoint_due() -> bool:
+    return (current_config.checkpoint_path is not None
+            and time.time() - _last_checkpoint >= current_config.checkpoint_every)
+
+
+def _write_checkpoint(frontier) -> None:
+    """frontier: [(chiave, T, S, depth, job di branching)] nell'ordine di visita."""
+    global _last_checkpoint
+    jobs, is_on_time_schedulable, select_job = _run_args
+    _sync_oracle_stats()
+    _sync_tt_stats()
+    save_checkpoint(current_config.checkpoint_path, {
+        "jobs": [(job.id, job.r, job.p, job.d) for job in jobs],
+        "config": current_config,
+        "frontier": frontier,
+        "best_int": best_int,
+        "pool": pool,
+        "stats": stats,
+        "is_on_time_schedulable": is_on_time_schedulable,
+        "select_job": select_job,
+        "elapsed": time.time() - _start_time,
+    })
+    stats.checkpoint_scritti += 1
+    _last_checkpoint = time.time()
+
+
+def _dfs_frontier() -> list:
+    """Nodo corrente + fratelli in sospeso + radici ancora in coda."""
+    out = [(0,) + item for item in _active_state.frontier()]
+    out += [(0, set(n.T), set(n.S), n.depth, n.branch_job) for n in _dfs_queue]
+    return out
+
+
+def _best_first_frontier(current_key, current: Node) -> list:
+    items = [(current_key, current)] + [(key, n) for key, _, _, n in _open_nodes]
+    return [(key, set(n.T), set(n.S), n.depth, n.branch_job) for key, n in items]
+
+
+def _set_config(new_config: Optional[SolverConfig]) -> None:
+    """Installa una nuova configurazione (e la sua pipeline) se passata."""
+    global current_config, pipeline
+    if new_config is not None and new_config is not current_config:
+        current_config = new_config
+        pipeline = current_config.make_pipeline()
+        pipeline.on_bound = _on_bound
+
+
+def set_callbacks(cb) -> None:
+    """Installa un SearchCallbacks (vedi callbacks.py) per le ricerche successive; None li toglie."""
+    global callbacks, _on_node, _on_prune, _on_incumbent, _on_branch, _on_bound
+    callbacks = cb
+    hooks = active_hooks(cb)
+    _on_node, _on_prune = hooks["on_node"], hooks["on_prune"]
+    _on_incumbent, _on_branch, _on_bound = hooks["on_incumbent"], hooks["on_branch"], hooks["on_bound"]
+    pipeline.on_bound = _on_bound
+
+
+def _global_bound() -> Optional[int]:
+    """
+    Lower bound sull'ottimo durante la ricerca (per il report): in
+    best-first il bound del nodo estratto (il minimo degli aperti), in DFS
+    quello della radice.
+    """
+    bounds = [b for b in (stats.lb_radice, _frontier_bound) if b is not None]
+    return max(bounds) if bounds else None
+
+
+def _share_incumbent() -> None:
+    """Prende l'incumbent degli altri processi se migliore, altrimenti pubblica il proprio."""
+    global best_int
+    shared, shared_set = incumbent_channel.read()
+    if shared < best_int:
+        best_int = shared
+        pool.adopt(shared, shared_set)
+        if _on_incumbent is not None:
+            _on_incumbent(best_int, None)
+    elif best_int < shared:
+        incumbent_channel.publish(best_int, pool.solutions()[0])
+
+
+def _make_oracle(jobs: List[Job], is_on_time_schedulable):
+    """
+    Avvolge is_on_time_schedulable in un FeasibilityOracle (riusato se
+    stessa istanza e stesso test). Con feas_cache_size = 0 usa il test nudo.
+    """
+    global oracle
+    if current_config.feas_cache_size <= 0:
+        oracle = None
+        return is_on_time_schedulable
+    if oracle is None or oracle.jobs is not jobs or oracle.test is not is_on_time_schedulable:
+        oracle = FeasibilityOracle(jobs, is_on_time_schedulable,
+                                   cache_size=current_config.feas_cache_size,
+                                   learn_nogoods=current_config.nogoods)
+    return oracle
+
+
+def _sync_oracle_stats() -> None:
+    if oracle is not None:
+        stats.feas_chiamate = oracle.calls
+        stats.feas_cache_hit = oracle.cache_hits
+        stats.nogood_hit = oracle.nogood_hits
+        stats.nogood_appresi = oracle.n_nogoods
+
+
+def _make_tt(jobs: List[Job]) -> None:
+    """Tabella di trasposizione (riusata se stessa istanza); None se tt_size = 0."""
+    global tt
+    if current_config.tt_size <= 0:
+        tt = None
+        return
+    if tt is None or tt.signature != TranspositionTable.instance_signature(jobs):
+        tt = TranspositionTable(jobs, max_entries=current_config.tt_size)
+    tt.max_entries = current_config.tt_size
+    tt.new_search()
+
+
+def _sync_tt_stats() -> None:
+    if tt is not None:
+        stats.tt_lookup = tt.lookups
+        stats.tt_hit = tt.hits
+        stats.tt_voci = len(tt)
+        stats.tt_eviction = tt.evictions
+        stats.tt_memoria_kb = tt.memory_bytes() / 1024
+
+
+def _expand(state: SearchState, jobs: List[Job], is_on_time_schedulable, select_job) -> Optional[int]:
+    """
+    Valuta il nodo corrente (state.node): fattibilità di S, lower bound,
+    potatura, foglia. I fissaggi per costi ridotti passano dalla trail.
+    Restituisce il job su cui fare branching, oppure None se il nodo è chiuso.
+    """
+    global best_int, stats
+    node = state.node
+
+    # 0) Limite sui nodi, oppure incumbent già al valore cercato (stop_at)
+    if current_config.node_limit is not None and stats.nodi_generati >= current_config.node_limit:
+        stats.hit_node_limit = True
+        return None
+    if current_config.stop_at is not None and best_int <= current_config.stop_at:
+        stats.hit_target = True
+        return None
+
+    if incumbent_channel is not None and stats.nodi_generati % SHARE_EVERY == 0:
+        _share_incumbent()
+    if progress is not None and stats.nodi_generati % PROGRESS_EVERY == 0:
+        progress.tick(stats, best_int, _global_bound())
 
     # 1) Statistiche nodo
     stats.nodi_generati += 1
     stats.profondità_totale += node.depth
-
-    # 2) Job già decisi (S on-time, T tardy)
-    decided_jobs = node.T.union(node.S)
-    jobs_remain = [job for job in jobs if job.id not in decided_jobs]
+    if _on_node is not None:
+        _on_node(node)
+
+    # il nodo può essere condiviso: niente LP o chiavi di un altro nodo
+    node.lp_value = None
+    node.tt_key_fixed = None
+
+    # 1b) Stato (T, S) già chiuso altrove
+    if tt is not None:
+        node.tt_key = state.key()
+        if tt.probe(node.tt_key, best_int - pool.strict):
+            stats.fathom_tt += 1
+            if _on_prune is not None:
+                _on_prune(node, "tt")
+            return None
 
     # 2a) Se S da solo è infeasible (nemmeno preemptive), taglia
-    S_jobs = [j for j in jobs if j.id in node.S]
-    if S_jobs and not is_on_time_schedulable(S_jobs):
+    if isinstance(is_on_time_schedulable, FeasibilityOracle):
+        # nogood: basta guardare quelli che contengono il job appena messo in S
+        added = node.branch_job if node.branch_job in node.S else None
+        S_infeasible = state.s_mask != 0 and not is_on_time_schedulable.check(state.s_mask, added)
+    else:
+        bit = state.bit
+        S_infeasible = state.s_mask != 0 and not is_on_time_schedulable(
+            [j for j in jobs if state.s_mask & bit[j.id]])
+    if S_infeasible:
+        if tt is not None:
+            tt.store(node.tt_key, float("inf"), complete=True)
         if hasattr(stats, "fathom_infeasible"):
             stats.fathom_infeasible += 1
         else:
             stats.fathom_leaf += 1
-        return
-
-    # 3) Calcolo lower bound (ALGORITMO DI MOORE sui job rimanenti)
+        if _on_prune is not None:
+            _on_prune(node, "infeasible")
+        return None
+
+    # 2b) Pochi job fuori da T: sottoalbero chiuso con la DP esatta
+    if state.n_free > 0 and len(jobs) - len(node.T) <= current_config.subset_dp:
+        _solve_tail(node, jobs)
+        if _on_prune is not None:
+            _on_prune(node, "dp")
+        return None
+
+    # 3) Calcolo lower bound (pipeline: dal più economico, stop alla potatura)
     start = time.time()
 
-    if not jobs_remain:
+    if state.n_free == 0:
         node.lb = 0
     else:
-        # LB = minimo numero di tardy nel problema rilassato
-        # (release "schiacciate" al min r_j, applicando Moore)
-        node.lb = compute_lb_moore(jobs_remain)
+        # LB = minimo numero di tardy tra i job non in T nel problema rilassato
+        node.lb, _ = pipeline.evaluate(node, jobs, best_int - pool.strict, stats, state)
+
+    # lb > 0: il candidato "tutti i rimanenti on-time" non può essere foglia
+    node.lb_best = node.lb
 
     stats.tempo_totale_lb += time.time() - start
     stats.chiamate_lb += 1
 
     # 4) Pruning: bound totale
     #    (# tardy già fissati in T) + (minimo # tardy dei rimanenti nel rilassamento)
+    #    > best_int per enumerare gli ottimi, >= best_int in modalità "proof"
     total_bound = len(node.T) + node.lb
-    if total_bound > best_int:
+    if stats.nodi_generati == 1:
+        stats.lb_radice = total_bound
+    if total_bound > best_int - pool.strict:
         stats.fathom_lb += 1
-        return
+        if tt is not None:
+            tt.store(node.tt_key, total_bound)
+        if _on_prune is not None:
+            _on_prune(node, "bound")
+        return None
+
+    # 4b) Fissaggio per costi ridotti: vale per tutto il sottoalbero
+    if current_config.lp_fixing:
+        stats.fissati_rc += node.fix_by_reduced_costs(best_int - pool.strict, assign=state.assign)
+
+        # lo stato fissato può essere già stato chiuso da un altro ramo
+        if tt is not None:
+            fixed_key = state.key()
+            if fixed_key != node.tt_key:
+                if tt.probe(fixed_key, best_int - pool.strict):
+                    stats.fathom_tt += 1
+                    if _on_prune is not None:
+                        _on_prune(node, "tt")
+                    return None
+                node.tt_key_fixed = fixed_key
 
     # 5) Foglia ammissibile (usa TUTTI i job, non solo i rimanenti)
-    if node.is_feasible_leaf(jobs, is_on_time_schedulable):
+    if _is_feasible_leaf(state, jobs, is_on_time_schedulable):
         stats.fathom_leaf += 1
-        tardy_count = len(node.T)
-
-        if tardy_count < best_int:
-            best_int = tardy_count
-            best_solutions = [node.T.copy()]
-        elif tardy_count == best_int:
-            Tcopy = node.T.copy()
-            if Tcopy not in best_solutions:
-                best_solutions.append(Tcopy)
+        previous = best_int
+        pool.offer(node.T, len(node.T))
+        best_int = pool.best
+        if _on_incumbent is not None and best_int < previous:
+            _on_incumbent(best_int, set(node.T))
+        if _on_prune is not None:
+            _on_prune(node, "leaf")
+        _close(node)
+        return None
+
+    # 6) Selezione job per branching (le select_* saltano i job già decisi)
+    return select_job(node, jobs)
+
+
+def _solve_tail(node: Node, jobs: List[Job]) -> None:
+    """
+    DP sui sottoinsiemi dei job non in T (S compreso, deve restare on-time):
+    dà l'ottimo del sottoalbero e tutti i suoi ottimi, quindi li offre al
+    pool (uno solo in "proof") oppure pota se non raggiungono l'incumbent.
+    """
+    global best_int
+    start = time.time()
+    rest = [j for j in jobs if j.id not in node.T]
+    required = 0
+    for i, job in enumerate(rest):
+        if job.id in node.S:
+            required |= 1 << i
+    need = len(jobs) - (best_int - pool.strict)
+    on_time, masks = solve_tail(rest, required, need, all_optima=pool.mode != "proof")
+    stats.chiamate_dp += 1
+    stats.tempo_dp += time.time() - start
+
+    if on_time is None:
+        stats.fathom_dp += 1
+        if tt is not None:
+            tt.store(node.tt_key, best_int - pool.strict + 1)
+        return
+    value = len(jobs) - on_time
+    all_ids = {job.id for job in rest}
+    previous = best_int
+    for mask in masks:
+        pool.offer(node.T | (all_ids - mask_to_ids(rest, mask)), value)
+    best_int = pool.best
+    if _on_incumbent is not None and best_int < previous:
+        _on_incumbent(best_int, set(pool.solutions()[0]))
+    stats.fathom_leaf += 1
+    _close(node)
+
+
+def _is_feasible_leaf(state: SearchState, jobs: List[Job], is_on_time_schedulable) -> bool:
+    """
+    Come Node.is_feasible_leaf, dalle maschere: con l'oracolo senza liste,
+    altrimenti una sola passata per la lista che il test richiede.
+    """
+    if state.node.lb_best != 0:
+        return False
+    if isinstance(is_on_time_schedulable, FeasibilityOracle):
+        return is_on_time_schedulable.check(state.candidate_mask())
+    t_mask, bit = state.t_mask, state.bit
+    return is_on_time_schedulable([j for j in jobs if not t_mask & bit[j.id]])
+
+
+def _children(node: Node, k: int) -> Tuple[Node, Node]:
+    """Figli 'on-time' e 'tardy' del job k (moltiplicatori ereditati dal padre)."""
+    child_ontime = Node(T=node.T.copy(), S=node.S.union({k}), depth=node.depth + 1,
+                        lagr_mult=node.lagr_mult, branch_job=k)
+    child_tardy = Node(T=node.T.union({k}), S=node.S.copy(), depth=node.depth + 1,
+                       lagr_mult=node.lagr_mult, branch_job=k)
+    return child_ontime, child_tardy
+
+
+def _close(node: Node) -> None:
+    """
+    Sottoalbero di node visitato tutto: le sue soluzioni valgono >= best_int
+    e quelle = best_int sono già nel pool -> stato chiuso.
+    """
+    if tt is None or stats.hit_node_limit or stats.hit_target:
         return
+    tt.store(node.tt_key, best_int, complete=True)
+    if node.tt_key_fixed is not None:
+        tt.store(node.tt_key_fixed, best_int, complete=True)
 
-    # 6) Selezione job per branching: passa solo i rimanenti (F)
-    k = select_job(node, jobs_remain)
+
+def _dfs(state: SearchState, jobs: List[Job], is_on_time_schedulable, select_job) -> None:
+    """
+    Visita in profondità: prima il ramo 'on-time', poi il ramo 'tardy'.
+    Nessun nodo nuovo: si decide k sul nodo condiviso e si torna indietro
+    con la trail; i campi per-nodo che i figli sovrascrivono si ripristinano.
+    """
+    node = state.node
+    if _checkpoint_due():
+        _write_checkpoint(_dfs_frontier())
+
+    k = _expand(state, jobs, is_on_time_schedulable, select_job)
     if k is None:
+        if not (stats.hit_node_limit or stats.hit_target):
+            stats.frazione_esplorata += 0.5 ** node.depth      # sottoalbero chiuso
+        elif stats.hit_node_limit and current_config.checkpoint_path is not None \
+                and not stats.checkpoint_al_limite:
+            # il nodo corrente e quelli in sospeso non sono stati visitati
+            stats.checkpoint_al_limite = True
+            _write_checkpoint(_dfs_frontier())
         return
 
+    mark = state.mark()
+    saved = (node.depth, node.branch_job, node.lagr_mult, node.tt_key, node.tt_key_fixed)
+    if _on_branch is not None:
+        _on_branch(node, k)
+    node.depth += 1
+    node.branch_job = k
+
     # 7) Branch 'on-time'
-    child_ontime = Node(T=node.T.copy(), S=node.S.union({k}), depth=node.depth + 1)
-    branch_and_bound(child_ontime, jobs, is_on_time_schedulable, select_job)
+    state.assign(k, True, branch=True)
+    _dfs(state, jobs, is_on_time_schedulable, select_job)
+    state.undo_to(mark)
+
+    # 8) Branch 'tardy' (moltiplicatori del padre, non del fratello)
+    node.lagr_mult = saved[2]
+    state.assign(k, False, branch=True)
+    _dfs(state, jobs, is_on_time_schedulable, select_job)
+    state.undo_to(mark)
 
-    # 8) Branch 'tardy'
-    child_tardy = Node(T=node.T.union({k}), S=node.S.copy(), depth=node.depth + 1)
-    branch_and_bound(child_tardy, jobs, is_on_time_schedulable, select_job)
+    node.depth, node.branch_job, node.lagr_mult, node.tt_key, node.tt_key_fixed = saved
+    _close(node)
+
+
+def _best_first(frontier, jobs: List[Job], is_on_time_schedulable, select_job, bits, edd) -> None:
+    """
+    Best-first: espande sempre il nodo aperto con bound (|T| + lb del padre)
+    minimo; a parità, il più profondo. I nodi con bound > best_int restano
+    in coda ma vengono potati da _expand quando escono. Qui i nodi aperti
+    devono esistere insieme: uno stato (senza trail condivisa) per nodo.
+    frontier: [(chiave, nodo)] iniziali (la radice, o quelli di un checkpoint).
+    """
+    global _open_nodes, _frontier_bound
+    counter = itertools.count()
+    _open_nodes = [(key, -node.depth, next(counter), node) for key, node in frontier]
+    heapq.heapify(_open_nodes)                   # (bound, -depth, ordine, nodo)
+
+    while _open_nodes:
+        key, _, _, node = heapq.heappop(_open_nodes)
+        _frontier_bound = key
+        if _checkpoint_due():
+            _write_checkpoint(_best_first_frontier(key, node))
+
+        k = _expand(SearchState(jobs, node, bits, edd), jobs, is_on_time_schedulable, select_job)
+        if k is None:
+            if stats.hit_node_limit:
+                if current_config.checkpoint_path is not None:
+                    _write_checkpoint(_best_first_frontier(key, node))
+                return
+            if stats.hit_target:
+                return
+            stats.frazione_esplorata += 0.5 ** node.depth
+            continue
+
+        if _on_branch is not None:
+            _on_branch(node, k)
+        key = len(node.T) + node.lb
+        for child in _children(node, k):
+            heapq.heappush(_open_nodes, (key, -child.depth, next(counter), child))
+
+
+# ==========================
+# APPROFONDIMENTO ITERATIVO SU k
+# ==========================
+
+def iterative_deepening(jobs: List[Job],
+                        is_on_time_schedulable,
+                        select_job=None,
+                        config: Optional[SolverConfig] = None) -> Tuple[Optional[int], Set[int]]:
+    """
+    Alternativa a branch_and_bound guidata dal lower bound invece che dall'UB.
+
+    Per k = LB radice (max Moore, knapsack), k+1, ... risolve la domanda
+    "esiste una schedula con <= k tardy?": incumbent fittizio k+1 in
+    modalità "proof" (potatura con bound >= k+1) e stop alla prima foglia
+    (stop_at = k). Dato che i k precedenti sono stati refutati, la prima
+    risposta positiva è l'ottimo. Se si refuta fino a UB-1, l'ottimo è la
+    soluzione dell'euristica. Le classi polinomiali (special_cases) si
+    riconoscono una volta sola, prima del ciclo.
+
+    config: bound, pipeline, tabella di trasposizione ecc.; non viene
+    modificata (solutions e stop_at si impostano su una copia). Default:
+    branching EDD con ramo on-time per primo (cerca subito schedule
+    fattibili) e tabella di trasposizione attiva. La tabella serve solo
+    dentro la stessa domanda k: gli stati chiusi a k valgono >= k+1 e a
+    k+1 si pota solo da k+2, quindi non si riusano tra un k e il successivo.
+
+    Restituisce (ottimo, set T) oppure (None, set()) se si è raggiunto
+    node_limit. Statistiche cumulate in stats (stats.deepening = [(k, nodi)]).
+    """
+    global best_int
+
+    if config is None:
+        config = SolverConfig(branching="edd", tt_size=200_000, name="deepening")
+    config = copy.copy(config)
+    config.solutions = "proof"
+    previous = current_config
+
+    reset(jobs)
+    ub, ub_set = best_int, set(pool.solutions()[0])
+
+    if config.fast_paths:
+        res = solve_special(jobs)
+        if res is not None:
+            stats.caso_speciale = res["class"]
+            if res["tardy"] < ub:
+                best_int = res["tardy"]
+                pool.reset(best_int, res["tardy_set"])
+            return best_int, set(pool.solutions()[0])
+        config.fast_paths = False           # già escluse: niente controllo a ogni k
+
+    root = Node()
+    root.compute_lb_moore(jobs)
+    root.compute_lb_KP(jobs)
+    k = max(root.lb_moore, root.lb_kp)
+
+    try:
+        while k < ub:
+            nodes_before = stats.nodi_generati
+            config.stop_at = k
+            best_int = k + 1
+            pool.reset(k + 1, set())             # incumbent fittizio: nessun set
+            stats.hit_target = False
+
+            branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job, config=config)
+            stats.deepening.append((k, stats.nodi_generati - nodes_before))
+
+            if stats.hit_node_limit:
+                return None, set()
+            if best_int <= k:
+                return best_int, set(pool.solutions()[0])
+            k += 1
+
+        # refutati tutti i k < UB: l'euristica è ottima
+        best_int = ub
+        pool.reset(ub, ub_set)
+        return ub, ub_set
+    finally:
+        # il modulo torna alla config precedente
+        _set_config(previous)
+
+
+def improve(jobs: List[Job],
+            on_time: Set[int],
+            incumbent_set: Set[int],
+            is_on_time_schedulable,
+            select_job=None,
+            config: Optional[SolverConfig] = None,
+            keep_caches: bool = False) -> Tuple[int, Set[int]]:
+    """
+    B&B come sotto-solver (es. lns.py): i job di on_time restano on-time
+    (radice con S = on_time) e l'incumbent è incumbent_set, una soluzione
+    ammissibile che rispetta on_time (l'euristica di reset() non lo fa).
+    Con config in modalità "proof" si cercano solo soluzioni migliori.
+    keep_caches: vedi reset().
+
+    Restituisce (tardy, set T): l'incumbent stesso se non si è migliorato
+    (anche per node_limit). La config del modulo torna quella precedente.
+    """
+    global best_int
+    previous = current_config
+    reset(jobs, keep_caches=keep_caches)
+    best_int = len(incumbent_set)
+    pool.reset(best_int, incumbent_set)
+    try:
+        branch_and_bound(Node(S=on_time), jobs, is_on_time_schedulable, select_job, config=config)
+        return best_int, set(pool.solutions()[0])
+    finally:
+        _set_config(previous)
 
 
 # ==========================
@@ -168,6 +805,12 @@ def get_best_solution():
     """
     Restituisce:
       - numero minimo di tardy (best_int)
-      - lista di tutti i set T ottimi
+      - lista dei set T ottimi (uno solo in modalità "proof"/"count",
+        al più pool_limit in "enumerate")
     """
-    return best_int, best_solutions
+    return best_int, pool.solutions()
+
+
+def get_solution_count() -> int:
+    """Numero di set T ottimi trovati (anche oltre pool_limit; 1 in "proof")."""
+    return pool.count
@@ -6,14 +6,66 @@ class BnBStats:
         self.tempo_totale_lb = 0.0
         self.fathom_lb = 0
         self.fathom_leaf = 0
+        self.fissati_rc = 0
+
+        # Per singolo bound della pipeline: nome -> valore
+        self.bound_calls = {}
+        self.bound_time = {}
+        self.bound_prunes = {}
+        self.bound_skips = {}
+
+        # Oracolo di fattibilità (cache LRU + nogood)
+        self.feas_chiamate = 0
+        self.feas_cache_hit = 0
+        self.nogood_hit = 0
+        self.nogood_appresi = 0
+
+        # Tabella di trasposizione
+        self.fathom_tt = 0
+        self.tt_lookup = 0
+        self.tt_hit = 0
+        self.tt_voci = 0
+        self.tt_eviction = 0
+        self.tt_memoria_kb = 0.0
         self.hit_node_limit = False
+        self.hit_target = False
+
+        # DP sui sottoinsiemi nelle code dell'albero (subset_dp)
+        self.chiamate_dp = 0
+        self.tempo_dp = 0.0
+        self.fathom_dp = 0
+
+        # Stima dell'albero (progress.py): bound della radice e frazione
+        # dell'albero chiusa, somma di 2^-profondità dei nodi chiusi
+        self.lb_radice = None
+        self.frazione_esplorata = 0.0
+
+        # Classe polinomiale riconosciuta alla radice (special_cases), se c'è
+        self.caso_speciale = None
+
+        # Approfondimento iterativo: (k, nodi della ricerca a k)
+        self.deepening = []
+
+        # Checkpoint
+        self.checkpoint_scritti = 0
+        self.checkpoint_al_limite = False
 
     def reset(self):
         self.__init__()
 
+    def record_bound(self, name, seconds, pruned):
+        self.bound_calls[name] = self.bound_calls.get(name, 0) + 1
+        self.bound_time[name] = self.bound_time.get(name, 0.0) + seconds
+        self.bound_prunes[name] = self.bound_prunes.get(name, 0) + int(pruned)
+
+    def tt_hit_rate(self):
+        return self.tt_hit / self.tt_lookup if self.tt_lookup else 0.0
+
     def print_summary(self, best_int, best_sol):
         print("=== STATISTICHE B&B ===")
         print(f"Soluzione migliore: tardy = {best_int}, T = {sorted(best_sol)}")
+        if self.caso_speciale:
+            print(f"Caso speciale: {self.caso_speciale} (ottimo calcolato prima del B&B)")
         print(f"Nodi generati: {self.nodi_generati}")
         if self.nodi_generati > 0:
             print(f"Profondità media: {self.profondità_totale / self.nodi_generati:.2f}")
@@ -21,3 +73,27 @@ class BnBStats:
         print(f"Tempo totale compute_lb: {self.tempo_totale_lb:.4f} sec")
         print(f"Fathoming per bound: {self.fathom_lb}")
         print(f"Fathoming per foglia: {self.fathom_leaf}")
+        if self.chiamate_dp:
+            print(f"DP sui sottoinsiemi: {self.chiamate_dp} chiamate, "
+                  f"{self.fathom_dp} potature, tempo: {self.tempo_dp:.4f} sec")
+        if self.fissati_rc:
+            print(f"Job fissati per costi ridotti: {self.fissati_rc}")
+        if self.feas_chiamate:
+            print(f"Test fattibilità S: {self.feas_chiamate} "
+                  f"(cache: {self.feas_cache_hit}, nogood: {self.nogood_hit}, "
+                  f"nogood appresi: {self.nogood_appresi})")
+        if self.tt_lookup:
+            print(f"Tabella di trasposizione: hit {self.tt_hit}/{self.tt_lookup} "
+                  f"({self.tt_hit_rate():.1%}), voci: {self.tt_voci}, "
+                  f"eviction: {self.tt_eviction}, memoria: {self.tt_memoria_kb:.1f} KB")
+        if self.hit_node_limit and self.frazione_esplorata > 0:
+            print(f"Albero stimato: {self.nodi_generati / self.frazione_esplorata:.0f} nodi "
+                  f"(esplorato {self.frazione_esplorata:.2%})")
+        if self.deepening:
+            print("Approfondimento iterativo: " +
+                  ", ".join(f"k={k}: {n} nodi" for k, n in self.deepening))
+        for name in self.bound_calls:
+            print(f"  [{name}] chiamate: {self.bound_calls[name]}, "
+                  f"tempo: {self.bound_time[name]:.4f} sec, "
+                  f"potature: {self.bound_prunes[name]}, "
+                  f"saltato: {self.bound_skips.get(name, 0)}")
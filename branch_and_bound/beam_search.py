@@ -0,0 +1,133 @@
+# beam_search.py
+#
+# Motore euristico per istanze grandi (migliaia di job), dove il B&B esatto
+# non arriva. Stessa costruzione in avanti di edd_astar: i job si decidono
+# in ordine EDD (on-time se entrano dopo l'istante t, altrimenti tardy) e
+# uno stato è (t, tardy finora). A ogni livello si tengono solo:
+#   - gli stati non dominati (a parità di tardy, t minimo)
+#   - i migliori `width` secondo tardy + lower bound sui prossimi
+#     `lookahead` job (a parità, meno tardy e poi t minimo)
+# Il bound rispetta le release: per ogni soglia rho tra le release della
+# finestra (e t), i job con r >= rho non possono iniziare prima di
+# max(t, rho), e Moore-Hodgson da lì conta i loro tardy; si prende il
+# massimo sulle soglie. Vale per ogni completamento dello stato e costa
+# O(L^2 log L). Le valutazioni sono al più eval_budget: finite quelle, si
+# ordina per (tardy, t).
+#
+# Il risultato è una schedula ammissibile (verificata con
+# is_on_time_schedulable); come certificato di qualità si restituisce il
+# lower bound di Moore alla radice.
+
+import heapq
+import math
+import time
+from typing import Dict, List, Optional
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+from edd_astar import edd_order
+from util import is_on_time_schedulable
+from lower_bound.lower_bound import compute_lb_moore
+
+
+def _moore_window(r: List[int], p: List[int], d: List[int], lo: int, hi: int, t: int) -> int:
+    """
+    Lower bound sui tardy di order[lo:hi] (in EDD) con macchina libera da t:
+    massimo, sulle soglie rho, di Moore-Hodgson sui job con r >= rho
+    iniziando da max(t, rho).
+    """
+    best = 0
+    for rho in sorted({t, *(rk for rk in r[lo:hi] if rk > t)}):
+        clock = rho
+        heap = []
+        tardy = 0
+        for k in range(lo, hi):
+            if r[k] < rho and rho > t:         # alla soglia t contano tutti
+                continue
+            clock += p[k]
+            heapq.heappush(heap, -p[k])
+            if clock > d[k]:
+                clock += heapq.heappop(heap)
+                tardy += 1
+        if tardy > best:
+            best = tardy
+    return best
+
+
+def beam_search(jobs: List[Job], width: int = 8, lookahead: int = 24,
+                eval_budget: Optional[int] = None) -> Dict:
+    """
+    width       : stati tenuti per livello
+    lookahead   : job considerati dal lower bound di ogni stato (0 = nessuno)
+    eval_budget : massimo numero di valutazioni del bound (None = illimitato)
+
+    Restituisce un dizionario (come solve_edd_astar):
+      - "tardy"       : numero di tardy della soluzione trovata
+      - "tardy_set"   : ID dei job tardy
+      - "lower_bound" : compute_lb_moore sull'istanza (certificato: ottimo >= lb)
+      - "gap"         : tardy - lower_bound
+      - "states"      : stati generati
+      - "evaluations" : valutazioni del bound usate
+      - "time"        : secondi
+    """
+    t0 = time.time()
+    order = edd_order(jobs)
+    n = len(order)
+    r = [job.r for job in order]
+    p = [job.p for job in order]
+    d = [job.d for job in order]
+
+    # stati: (t, tardy, id); per ricostruire, id -> (padre, on_time)
+    parent = [(-1, False)]
+    beam = [(0, 0, 0)]
+    evaluations = 0
+    budget = math.inf if eval_budget is None else eval_budget
+
+    for i in range(n):
+        children = []
+        for t, u, sid in beam:
+            end = (t if t > r[i] else r[i]) + p[i]
+            if end <= d[i]:
+                children.append((end, u, sid, True))
+            children.append((t, u + 1, sid, False))
+
+        # non dominati: per tardy crescente, t strettamente decrescente
+        children.sort(key=lambda c: (c[1], c[0]))
+        front = []
+        best_t = math.inf
+        for c in children:
+            if c[0] < best_t:
+                front.append(c)
+                best_t = c[0]
+
+        if len(front) > width:
+            if lookahead and evaluations + len(front) <= budget:
+                hi = min(n, i + 1 + lookahead)
+                evaluations += len(front)
+                front.sort(key=lambda c: (c[1] + _moore_window(r, p, d, i + 1, hi, c[0]),
+                                          c[1], c[0]))
+            front = front[:width]
+
+        beam = []
+        for t, u, sid, on_time in front:
+            parent.append((sid, on_time))
+            beam.append((t, u, len(parent) - 1))
+
+    _, tardy, sid = min(beam, key=lambda s: (s[1], s[0]))
+    on_time = []
+    tardy_set = set()
+    for i in range(n - 1, -1, -1):
+        sid, was_on_time = parent[sid]
+        if was_on_time:
+            on_time.append(order[i])
+        else:
+            tardy_set.add(order[i].id)
+    on_time.reverse()
+    if not is_on_time_schedulable(on_time):
+        raise RuntimeError("beam_search: la schedula on-time ricostruita non è ammissibile")
+
+    lb = compute_lb_moore(jobs)
+    return {"tardy": tardy, "tardy_set": tardy_set, "lower_bound": lb, "gap": tardy - lb,
+            "states": len(parent) - 1, "evaluations": evaluations, "time": time.time() - t0}
@@ -0,0 +1,198 @@
+# bound_pipeline.py
+#
+# Pipeline di lower bound per il B&B: i bound si provano dal più economico
+# al più costoso e ci si ferma appena il nodo è potato. Per ogni bound e
+# fascia di profondità si confronta quanto lavoro fa risparmiare (potature)
+# con quanto costa, e i bound che non si ripagano vengono saltati (con
+# qualche chiamata di esplorazione). Il costo è in unità di lavoro (WORK),
+# non in secondi: stessa istanza e config -> stesso albero.
+
+import math
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lower_bound.cuts import CutPool
+
+
+# ==========================
+# PROVIDER DI BOUND
+# ==========================
+# Ogni provider restituisce un LB sul numero di tardy tra i job NON in T
+# (il chiamante somma |T|). Ordine = costo crescente. state è lo
+# SearchState del nodo (None fuori dal B&B): i bound combinatori leggono
+# da lì i job fuori da T senza copiarli.
+
+def _lb_moore(pipeline, node, jobs, cutoff, state=None):
+    node.compute_lb_moore(jobs, state)
+    return node.lb_moore
+
+
+def _lb_kp(pipeline, node, jobs, cutoff, state=None):
+    node.compute_lb_KP(jobs, state)
+    return node.lb_kp
+
+
+def _lb_lagrangian(pipeline, node, jobs, cutoff, state=None):
+    node.compute_lb_lagrangian(jobs, cutoff=cutoff)
+    return node.lb_lagr
+
+
+def _lb_lp(pipeline, node, jobs, cutoff, state=None):
+    node.compute_lb_lp(jobs, backend="highs",
+                       cut_pool=pipeline.cut_pool if pipeline.lp_cuts else None)
+    return node.lb_lp - len(node.T)
+
+
+PROVIDERS = {
+    "moore": _lb_moore,
+    "kp": _lb_kp,
+    "lagrangian": _lb_lagrangian,
+    "lp": _lb_lp,
+}
+
+# Lavoro di una chiamata con m job fuori da T e orizzonte H, in unità di
+# una chiamata di Moore su m job. Tarato sui tempi misurati (n = 20..45):
+# knapsack ~H/4, Lagrangiano ~4H, LP ~40H volte Moore.
+WORK = {
+    "moore": lambda m, H: m,
+    "kp": lambda m, H: m * H / 4,
+    "lagrangian": lambda m, H: 4 * m * H,
+    "lp": lambda m, H: 40 * m * H,
+}
+
+
+# ==========================
+# PIPELINE
+# ==========================
+class BoundPipeline:
+    """
+    bounds        : nomi dei provider (si eseguono in ordine di costo, WORK)
+    adaptive      : se False li chiama sempre tutti (finché non pota)
+    warmup        : chiamate per (bound, fascia) prima di giudicarne l'efficacia
+    explore_share : quota dei nodi (arrivati al bound, per fascia) su cui si
+                    calcola comunque un bound non giudicato efficace
+    min_prune_rate: nodi risparmiati per chiamata, per unità di costo relativo
+                    al primo bound, perché un bound sia efficace
+    depth_bucket  : ampiezza delle fasce di profondità
+    lp_cuts       : rinforza il provider "lp" con il CutPool dell'istanza
+
+    Regola adattiva: un bound (escluso il primo, sempre eseguito) è efficace
+    in una fascia se, dopo warmup chiamate,
+        (potature / chiamate) * sottoalbero >= min_prune_rate * costo
+    dove costo = lavoro medio per chiamata (WORK) diviso quello del primo
+    bound nella stessa fascia, e sottoalbero = nodi visti dalla fascia in
+    giù per nodo della fascia (stima dei nodi che una potatura risparmia).
+    Un bound lento conviene quindi solo se pota abbastanza, e tanto più in
+    alto nell'albero. Gli altri vengono chiamati solo finché le loro
+    chiamate restano sotto explore_share dei nodi arrivati fino a loro:
+    così si continua a misurarli senza che dominino la ricerca. Il tempo
+    speso è registrato per le statistiche ma non entra nella regola (le
+    decisioni non dipendono dal carico della macchina).
+    """
+    def __init__(self,
+                 bounds: Sequence[str] = ("moore", "kp", "lagrangian"),
+                 adaptive: bool = True,
+                 warmup: int = 30,
+                 explore_share: float = 0.05,
+                 min_prune_rate: float = 0.01,
+                 depth_bucket: int = 5,
+                 lp_cuts: bool = False):
+        for name in bounds:
+            if name not in PROVIDERS:
+                raise ValueError(f"Bound sconosciuto: {name} (disponibili: {list(PROVIDERS)})")
+        order = list(PROVIDERS)
+        self.bounds = sorted(bounds, key=order.index)
+        self.adaptive = adaptive
+        self.warmup = warmup
+        self.explore_share = explore_share
+        self.min_prune_rate = min_prune_rate
+        self.depth_bucket = depth_bucket
+        self.lp_cuts = lp_cuts
+        self.on_bound = None            # callback (provider, valore, secondi), vedi callbacks.py
+        self.reset()
+
+    def reset(self):
+        """Da chiamare per ogni nuova istanza (statistiche e tagli dipendono dai dati)."""
+        # (bound, fascia) -> [chiamate, potature, tempo, nodi arrivati al bound, lavoro]
+        self.history: Dict[Tuple[str, int], List[float]] = {}
+        self.spent: Dict[str, float] = {name: 0.0 for name in self.bounds}
+        self.cut_pool = CutPool()
+        self.nodes = 0
+        self.bucket_nodes: Dict[int, int] = {}
+        self.horizon = None
+
+    # ---------- regola adattiva ----------
+    def _subtree(self, bucket: int) -> float:
+        """Nodi valutati dalla fascia in giù per nodo della fascia (>= 1)."""
+        below = sum(c for b, c in self.bucket_nodes.items() if b >= bucket)
+        return below / self.bucket_nodes[bucket]
+
+    def _should_run(self, name: str, bucket: int) -> bool:
+        if not self.adaptive:
+            return True
+        calls, prunes, _, reached, work = self.history.setdefault((name, bucket), [0, 0, 0.0, 0, 0.0])
+        if calls < self.warmup:
+            return True
+        first = self.history[(self.bounds[0], bucket)]
+        cost = (work / calls) / max(first[4] / first[0], 1e-9)
+        if prunes * self._subtree(bucket) >= self.min_prune_rate * cost * calls:
+            return True
+        # esplorazione a budget
+        return calls < self.explore_share * reached
+
+    # ---------- valutazione nodo ----------
+    def evaluate(self, node, jobs, best_int: int, stats=None, state=None) -> Tuple[float, Optional[str]]:
+        """
+        Calcola il LB del nodo (su job non in T) provando i bound in ordine.
+        state: SearchState del nodo, passato ai provider.
+        Restituisce (lb, nome del bound che ha potato oppure None).
+        """
+        self.nodes += 1
+        bucket = node.depth // self.depth_bucket
+        self.bucket_nodes[bucket] = self.bucket_nodes.get(bucket, 0) + 1
+        if self.horizon is None:
+            self.horizon = max(1, max((j.d for j in jobs), default=1) - min((j.r for j in jobs), default=0))
+        m = max(1, len(jobs) - len(node.T))
+        cutoff = best_int - len(node.T) + 1      # lb >= cutoff -> potatura
+        lb = 0
+
+        for i, name in enumerate(self.bounds):
+            h = self.history.setdefault((name, bucket), [0, 0, 0.0, 0, 0.0])
+            h[3] += 1
+            if i > 0 and not self._should_run(name, bucket):
+                if stats is not None:
+                    stats.bound_skips[name] = stats.bound_skips.get(name, 0) + 1
+                continue
+
+            start = time.time()
+            value = PROVIDERS[name](self, node, jobs, cutoff, state)
+            spent = time.time() - start
+
+            pruned = value >= cutoff
+            lb = max(lb, value)
+            h[0] += 1
+            h[1] += pruned
+            h[2] += spent
+            h[4] += WORK[name](m, self.horizon)
+            self.spent[name] += spent
+            if stats is not None:
+                stats.record_bound(name, spent, pruned)
+            if self.on_bound is not None:
+                self.on_bound(name, value, spent)
+
+            if pruned:
+                return lb, name
+
+        return lb, None
+
+    def prune_efficiency(self) -> Dict[str, Dict[int, float]]:
+        """Potature per secondo, per bound e fascia di profondità (per analisi)."""
+        out: Dict[str, Dict[int, float]] = {}
+        for (name, bucket), (calls, prunes, spent, _, _) in self.history.items():
+            if calls:
+                out.setdefault(name, {})[bucket] = prunes / spent if spent > 0 else math.inf
+        return out
@@ -0,0 +1,70 @@
+# callbacks.py
+#
+# Interfaccia per agganciarsi alla ricerca del B&B senza toccare bb.py
+# (monitoraggio, euristiche esterne, tracce). Si estende SearchCallbacks
+# ridefinendo solo gli eventi che interessano e la si installa con
+# bb.set_callbacks(cb); bb.set_callbacks(None) la toglie.
+#
+# Costo: bb tiene un riferimento per evento, None per quelli non ridefiniti
+# (il metodo della classe base non viene mai chiamato). Senza callback ogni
+# punto di aggancio costa un confronto con None.
+#
+# Eventi (nell'ordine in cui avvengono per un nodo):
+#   on_node(node)                       nodo estratto e contato
+#                                       (stats.nodi_generati già aggiornato)
+#   on_bound(provider, value, seconds)  ogni bound calcolato dalla pipeline
+#   on_prune(node, reason)              nodo chiuso, reason in PRUNE_REASONS
+#   on_incumbent(value, T)              incumbent migliorato; T è None se
+#                                       arriva da un altro processo (portfolio)
+#   on_branch(node, job)                branching su job (figli on-time e tardy)
+#
+# node è il nodo condiviso della DFS (vedi trail.py): T, S, depth valgono
+# solo durante la chiamata, vanno copiati se servono dopo. Un callback che
+# solleva un'eccezione interrompe la ricerca.
+
+from typing import Optional, Set
+
+PRUNE_REASONS = (
+    "tt",           # stato già chiuso (tabella di trasposizione)
+    "infeasible",   # S non schedulabile on-time
+    "dp",           # sottoalbero chiuso dalla DP sui sottoinsiemi (subset_dp)
+    "bound",        # |T| + lower bound oltre l'incumbent (node.lb)
+    "leaf",         # foglia ammissibile (offerta al pool)
+)
+
+EVENTS = ("on_node", "on_prune", "on_incumbent", "on_branch", "on_bound")
+
+
+class SearchCallbacks:
+    """Eventi della ricerca (tutti no-op): ridefinire quelli che servono."""
+
+    def on_node(self, node) -> None:
+        pass
+
+    def on_prune(self, node, reason: str) -> None:
+        pass
+
+    def on_incumbent(self, value: int, T: Optional[Set[int]]) -> None:
+        pass
+
+    def on_branch(self, node, job: int) -> None:
+        pass
+
+    def on_bound(self, provider: str, value: float, seconds: float) -> None:
+        pass
+
+
+def active_hooks(callbacks) -> dict:
+    """
+    {evento: funzione} con i soli eventi ridefiniti rispetto a SearchCallbacks
+    (o presenti, per oggetti che non ne derivano).
+    """
+    hooks = dict.fromkeys(EVENTS)
+    if callbacks is None:
+        return hooks
+    for name in EVENTS:
+        fn = getattr(callbacks, name, None)
+        if fn is None or getattr(type(callbacks), name, None) is getattr(SearchCallbacks, name):
+            continue
+        hooks[name] = fn
+    return hooks
@@ -0,0 +1,51 @@
+# checkpoint.py
+#
+# Salvataggio / ripresa di una ricerca B&B lunga (macchine che possono
+# essere interrotte). Il file contiene tutto ciò che serve per continuare
+# esattamente da dove ci si era fermati:
+#   - istanza e SolverConfig
+#   - frontiera: nodi ancora da visitare, nell'ordine di visita (DFS) o con
+#     la loro chiave di priorità (best-first), come (chiave, T, S, depth, job)
+#   - incumbent, pool delle soluzioni, BnBStats
+#   - test di fattibilità e regola di branching (per riferimento)
+# Cache dell'oracolo, tabella di trasposizione, statistiche della pipeline e
+# moltiplicatori Lagrangiani non sono salvati: si ricostruiscono da soli
+# (cambiano i tempi e i warm start, non l'esito della ricerca).
+
+import os
+import pickle
+from typing import Dict
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str, payload: Dict) -> None:
+    """Scrittura atomica: un'interruzione durante il salvataggio lascia il file precedente."""
+    payload = dict(payload, version=CHECKPOINT_VERSION)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def check_picklable(**objects) -> None:
+    """
+    Da chiamare all'avvio di una ricerca con checkpoint: un oggetto non
+    serializzabile (es. una lambda come test di fattibilità) fallirebbe solo
+    al primo salvataggio, a ricerca avviata. ValueError con il nome.
+    """
+    for name, obj in objects.items():
+        try:
+            pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError(f"Checkpoint: {name} non è serializzabile con pickle ({e}); "
+                             f"usare una funzione definita a livello di modulo") from e
+
+
+def load_checkpoint(path: str) -> Dict:
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint {path}: versione {payload.get('version')} non supportata "
+                         f"(attesa {CHECKPOINT_VERSION})")
+    return payload
@@ -0,0 +1,166 @@
+# config.py
+#
+# Configurazione del solver B&B: quali bound usare, soglie della pipeline,
+# regola di branching e selezione dei nodi. Si passa a branch_and_bound()
+# e si registra nelle righe dei risultati (as_dict) per gli esperimenti.
+
+from typing import Optional, Sequence
+
+from bound_pipeline import BoundPipeline, PROVIDERS
+from solution_pool import MODES as SOLUTION_MODES
+from subset_dp import MAX_JOBS as SUBSET_DP_MAX
+from util import select_job, select_job_edd, select_job_min_slack, select_job_max_p
+
+
+BRANCHING_RULES = {
+    "input": select_job,            # primo job non deciso (ordine di input)
+    "edd": select_job_edd,          # due date minima
+    "min_slack": select_job_min_slack,
+    "max_p": select_job_max_p,
+}
+
+NODE_SELECTION = ("dfs", "best_first")
+
+
+class SolverConfig:
+    """
+    bounds         : provider di lower bound, dal più economico (vedi bound_pipeline)
+                     () = nessun lower bound (baseline "no_LB")
+    adaptive_bounds: salta i bound che non si ripagano (BoundPipeline.adaptive)
+    bound_warmup   : chiamate prima di giudicare un bound
+    explore_share  : quota di nodi su cui si provano i bound non giudicati efficaci
+    bound_min_prune: nodi risparmiati per chiamata, per unità di costo relativo,
+                     perché un bound sia efficace (BoundPipeline.min_prune_rate)
+    lp_cuts        : Big-M stretto + tagli nel bound "lp"
+    lp_fixing      : fissaggio per costi ridotti nei nodi in cui si risolve l'LP
+    branching      : regola di scelta del job (chiavi di BRANCHING_RULES);
+                     None = usa la select_job passata a branch_and_bound
+    node_selection : "dfs" (ricorsione) oppure "best_first" (nodo con bound minimo)
+    node_limit     : massimo numero di nodi (None = nessun limite)
+    feas_cache_size: capienza della LRU dei set S fattibili (0 = niente oracolo
+                     con memoria, si chiama direttamente is_on_time_schedulable)
+    nogoods        : impara i sottoinsiemi infeasible di S (FeasibilityOracle)
+    tt_size        : voci della tabella di trasposizione (0 = disattivata).
+                     Chiave = (job non decisi, frontiera di completamento di
+                     S): stati diversi con la stessa coda la condividono già
+                     nella stessa visita (vedi transposition.py)
+    solutions      : "enumerate" (tutti gli ottimi), "proof" (uno solo, pota
+                     con >=), "count" (solo quanti sono), vedi solution_pool
+    pool_limit     : massimo numero di ottimi memorizzati in "enumerate"
+    solutions_file : file su cui scrivere gli ottimi man mano ("enumerate")
+    checkpoint_path: file di checkpoint (None = niente checkpoint); si riprende
+                     con bb.resume(path). Scritto anche quando si raggiunge
+                     node_limit, così la ricerca si può continuare
+    checkpoint_every: secondi tra due checkpoint
+    stop_at        : ferma la ricerca appena l'incumbent è <= stop_at
+                     (domande decisionali, vedi bb.iterative_deepening)
+    fast_paths     : riconosce le classi polinomiali (release uguali, p = 1,
+                     r/d agreeable) e ne calcola l'ottimo prima del B&B
+    subset_dp      : quando i job non in T sono al più subset_dp, il
+                     sottoalbero si chiude con la DP esatta sui sottoinsiemi
+                     (vedi subset_dp.py; 0 = mai, massimo subset_dp.MAX_JOBS)
+    progress_every : secondi tra due righe di avanzamento (nodi/s, incumbent,
+                     bound, gap, albero stimato, ETA; vedi progress.py);
+                     None = nessun report. Le righe vanno a bb.progress_out
+    """
+    def __init__(self,
+                 bounds: Sequence[str] = ("moore", "kp", "lagrangian"),
+                 adaptive_bounds: bool = True,
+                 bound_warmup: int = 30,
+                 explore_share: float = 0.05,
+                 bound_min_prune: float = 0.01,
+                 lp_cuts: bool = False,
+                 lp_fixing: bool = False,
+                 branching: Optional[str] = None,
+                 node_selection: str = "dfs",
+                 node_limit: Optional[int] = None,
+                 feas_cache_size: int = 100_000,
+                 nogoods: bool = True,
+                 tt_size: int = 100_000,
+                 solutions: str = "enumerate",
+                 pool_limit: Optional[int] = None,
+                 solutions_file: Optional[str] = None,
+                 checkpoint_path: Optional[str] = None,
+                 checkpoint_every: float = 300.0,
+                 stop_at: Optional[int] = None,
+                 fast_paths: bool = True,
+                 subset_dp: int = 20,
+                 progress_every: Optional[float] = None,
+                 name: str = ""):
+        for b in bounds:
+            if b not in PROVIDERS:
+                raise ValueError(f"Bound sconosciuto: {b} (disponibili: {list(PROVIDERS)})")
+        if branching is not None and branching not in BRANCHING_RULES:
+            raise ValueError(f"Branching sconosciuto: {branching} (disponibili: {list(BRANCHING_RULES)})")
+        if node_selection not in NODE_SELECTION:
+            raise ValueError(f"Selezione nodi sconosciuta: {node_selection} (disponibili: {NODE_SELECTION})")
+        if solutions not in SOLUTION_MODES:
+            raise ValueError(f"Modalità soluzioni sconosciuta: {solutions} (disponibili: {SOLUTION_MODES})")
+        if not 0 <= subset_dp <= SUBSET_DP_MAX:
+            raise ValueError(f"subset_dp deve essere tra 0 e {SUBSET_DP_MAX}")
+        if lp_fixing and "lp" not in bounds:
+            raise ValueError("lp_fixing richiede il bound 'lp'")
+
+        self.bounds = tuple(bounds)
+        self.adaptive_bounds = adaptive_bounds
+        self.bound_warmup = bound_warmup
+        self.explore_share = explore_share
+        self.bound_min_prune = bound_min_prune
+        self.lp_cuts = lp_cuts
+        self.lp_fixing = lp_fixing
+        self.branching = branching
+        self.node_selection = node_selection
+        self.node_limit = node_limit
+        self.feas_cache_size = feas_cache_size
+        self.nogoods = nogoods
+        self.tt_size = tt_size
+        self.solutions = solutions
+        self.pool_limit = pool_limit
+        self.solutions_file = solutions_file
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.stop_at = stop_at
+        self.fast_paths = fast_paths
+        self.subset_dp = subset_dp
+        self.progress_every = progress_every
+        self.name = name
+
+    def make_pipeline(self) -> BoundPipeline:
+        return BoundPipeline(bounds=self.bounds,
+                             adaptive=self.adaptive_bounds,
+                             warmup=self.bound_warmup,
+                             explore_share=self.explore_share,
+                             min_prune_rate=self.bound_min_prune,
+                             lp_cuts=self.lp_cuts)
+
+    def select_job(self, default=None):
+        """Regola di branching effettiva (default = quella passata dal chiamante)."""
+        if self.branching is None:
+            return default if default is not None else select_job
+        return BRANCHING_RULES[self.branching]
+
+    def as_dict(self) -> dict:
+        """Impostazioni in forma piatta, da aggiungere a ogni riga di risultati."""
+        return {
+            "config": self.name,
+            "bounds": "+".join(self.bounds) if self.bounds else "none",
+            "adaptive_bounds": self.adaptive_bounds,
+            "bound_warmup": self.bound_warmup,
+            "explore_share": self.explore_share,
+            "bound_min_prune": self.bound_min_prune,
+            "lp_cuts": self.lp_cuts,
+            "lp_fixing": self.lp_fixing,
+            "branching": self.branching or "caller",
+            "node_selection": self.node_selection,
+            "node_limit": self.node_limit,
+            "feas_cache_size": self.feas_cache_size,
+            "nogoods": self.nogoods,
+            "tt_size": self.tt_size,
+            "solutions": self.solutions,
+            "pool_limit": self.pool_limit,
+            "fast_paths": self.fast_paths,
+            "subset_dp": self.subset_dp,
+        }
+
+    def __repr__(self):
+        return f"SolverConfig({self.as_dict()})"
@@ -0,0 +1,178 @@
+# edd_astar.py
+#
+# Secondo motore esatto: invece di decidere job per job "on-time o tardy"
+# su insiemi, costruisce in avanti la sequenza dei job on-time scorrendo
+# l'ordine EDD. Stato = (posizione i nell'ordine EDD, insieme D dei job
+# rimandati, istante t in cui la macchina si libera, tardy finora u); i
+# tardy si accodano in fondo. Dal job i si può:
+#   - metterlo in sequenza ora (se finisce entro la sua due date)
+#   - dichiararlo tardy
+#   - rimandarlo in D: resta on-time, ma andrà in sequenza dopo qualche
+#     job successivo (con le release un job con due date lontana ma
+#     disponibile subito può dover passare prima di uno con due date vicina)
+# e in ogni momento si può mettere in sequenza un job di D. Ogni sequenza
+# on-time si ottiene così, quindi la ricerca è esatta con qualsiasi release.
+#
+# Dominanza: a parità di (i, D), (t, u) domina (t', u') se t <= t' e
+# u <= u'. Ricerca A* con euristica = Moore-Hodgson sui job di D e dei
+# rimanenti a partire da t (ammissibile: ignora le release oltre t e
+# l'obbligo di tenere on-time i job di D). Uno stato con un job di D che
+# non può più finire in tempo si scarta.
+#
+# Se l'ordine EDD è dominante (release tutte uguali, o release e due date
+# "agreeable": r_i <= r_j quando d_i < d_j) rimandare non serve e non si
+# fa: D resta vuoto e gli stati non dominati sono al più n * (n + 1),
+# indipendenti da H. Altrimenti la migliore sequenza EDD fa da upper bound
+# per una seconda ricerca con i rinvii, che tiene solo gli stati con
+# f < upper bound; un job si rimanda solo se qualche job successivo può
+# passargli davanti lasciandolo on-time, e uno stato si scarta se i job di
+# D non entrano tutti in tempo nemmeno con preemption (EDD preemptive).
+# Nel caso peggiore gli stati sono esponenziali nel numero di rinvii.
+
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+from lower_bound.lower_bound import simulate_pedd_tardy_count
+
+
+def edd_order(jobs: List[Job]) -> List[Job]:
+    return sorted(jobs, key=lambda j: (j.d, j.r, j.id))
+
+
+def is_edd_dominant(jobs: List[Job]) -> bool:
+    """True se in ordine EDD le release sono non decrescenti (agreeable, o tutte uguali)."""
+    order = edd_order(jobs)
+    return all(a.r <= b.r for a, b in zip(order, order[1:]))
+
+
+def _moore_from(pending: List[Job], t: int) -> int:
+    """Moore-Hodgson su pending (già in EDD) con macchina libera da max(t, min r)."""
+    if not pending:
+        return 0
+    clock = max(t, min(job.r for job in pending))
+    heap = []
+    tardy = 0
+    for job in pending:
+        clock += job.p
+        heapq.heappush(heap, -job.p)
+        if clock > job.d:
+            clock += heapq.heappop(heap)
+            tardy += 1
+    return tardy
+
+
+def solve_edd_astar(jobs: List[Job], heuristic: bool = True) -> Dict:
+    """
+    heuristic: False -> ricerca a costo uniforme (f = u), stessi stati non
+               dominati ma nessuna chiamata a Moore (O(n) per stato)
+
+    Prima una ricerca senza rinvii (la migliore sequenza EDD: ottima se
+    is_edd_dominant); altrimenti una seconda con i rinvii, che scarta gli
+    stati con f >= quel valore (se non ne trova di migliori, era l'ottimo).
+
+    Restituisce un dizionario (come solve_time_indexed):
+      - "tardy"       : numero ottimo di tardy
+      - "tardy_set"   : ID dei job tardy
+      - "sequence"    : ID dei job on-time nell'ordine di esecuzione
+      - "exact"       : sempre True (chiave tenuta per compatibilità)
+      - "edd_dominant": True se l'ordine EDD è dominante (nessun rinvio)
+      - "states"      : stati espansi
+      - "time"        : secondi
+    """
+    t0 = time.time()
+    order = edd_order(jobs)
+    dominant = is_edd_dominant(jobs)
+
+    res, expanded = _search(order, False, math.inf, heuristic)
+    if not dominant:
+        better, more = _search(order, True, res["tardy"], heuristic)
+        expanded += more
+        if better is not None:
+            res = better
+    res.update(exact=True, edd_dominant=dominant, states=expanded, time=time.time() - t0)
+    return res
+
+
+def _search(order: List[Job], defer: bool, ub: float, heuristic: bool) -> Tuple[Optional[Dict], int]:
+    """
+    A* sugli stati (i, D, t, u); defer abilita i rinvii, ub scarta gli stati
+    con f >= ub. Restituisce (soluzione o None se nessuna ha meno di ub
+    tardy, stati espansi).
+    """
+    n = len(order)
+    # best[(i, D)][u] = minimo t raggiunto con u tardy
+    best: Dict[Tuple[int, int], List[float]] = {}
+    # stati: (i, D, t, u, padre, azione); azione = ("on" | "tardy" | "defer", posizione)
+    states = []
+    heap = []
+    counter = 0
+
+    def push(i, D, t, u, parent, action):
+        nonlocal counter
+        row = best.setdefault((i, D), [math.inf] * (n + 1))
+        if min(row[:u + 1]) <= t:        # dominato (stesso t o meno, meno tardy)
+            return
+        pending = [order[k] for k in range(i) if D >> k & 1]
+        if pending and simulate_pedd_tardy_count(pending, start=t) > 0:
+            return                       # i job rimandati non entrano più tutti in tempo
+        f = u + _moore_from(pending + order[i:], t) if heuristic else u
+        if f >= ub:
+            return
+        row[u] = t
+        states.append((i, D, t, u, parent, action))
+        heapq.heappush(heap, (f, -i, counter, len(states) - 1))
+        counter += 1
+
+    def can_overtake(i, t):
+        """Qualche job dopo i può passare prima di i lasciandolo on-time."""
+        job = order[i]
+        return any(max(max(t, o.r) + o.p, job.r) + job.p <= job.d for o in order[i + 1:])
+
+    push(0, 0, 0, 0, -1, None)
+    expanded = 0
+
+    while heap:
+        _, _, _, idx = heapq.heappop(heap)
+        i, D, t, u, _, _ = states[idx]
+        row = best[(i, D)]
+        if row[u] < t or min(row[:u], default=math.inf) <= t:
+            continue                     # dominato da uno stato arrivato dopo il push
+
+        if i == n and D == 0:
+            tardy_set = set()
+            sequence = []
+            while idx > 0:
+                _, _, _, _, parent, (kind, pos) = states[idx]
+                if kind == "tardy":
+                    tardy_set.add(order[pos].id)
+                elif kind == "on":
+                    sequence.append(order[pos].id)
+                idx = parent
+            sequence.reverse()
+            return {"tardy": u, "tardy_set": tardy_set, "sequence": sequence}, expanded
+
+        expanded += 1
+        for k in range(i):               # un job rimandato va in sequenza ora
+            if D >> k & 1:
+                job = order[k]
+                push(i, D & ~(1 << k), max(t, job.r) + job.p, u, idx, ("on", k))
+        if i == n:
+            continue
+        job = order[i]
+        end = max(t, job.r) + job.p
+        if end <= job.d:
+            push(i + 1, D, end, u, idx, ("on", i))
+            if defer and can_overtake(i, t):
+                push(i + 1, D | (1 << i), t, u, idx, ("defer", i))
+        push(i + 1, D, t, u + 1, idx, ("tardy", i))
+
+    if ub < math.inf:
+        return None, expanded
+    # non si arriva qui: "tutti tardy" è sempre possibile
+    raise RuntimeError("edd_astar: frontiera esaurita senza soluzione")
@@ -0,0 +1,215 @@
+# feasibility.py
+#
+# Oracolo di fattibilità "con memoria" per il B&B.
+# Avvolge un test is_on_time_schedulable (monotono: se S non è schedulabile
+# on-time, nessun sovrainsieme lo è) e aggiunge:
+#   - cache LRU dei set S fattibili, indicizzata dalla bitmask dei job
+#   - nogood: quando S fallisce, un sottoinsieme piccolo ancora infeasible
+#     viene memorizzato; ogni S futuro che lo contiene è scartato senza
+#     chiamare il test
+#
+# Costo della ricerca dei nogood: un S uguale a un nogood si riconosce in
+# O(1) (insieme delle maschere); per un S che ne contiene uno si scorrono
+# i nogood del job appena aggiunto (vedi FeasibilityOracle), non tutti.
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+
+
+class FeasibilityOracle:
+    """
+    jobs                   : tutti i job dell'istanza (fissano i bit delle maschere)
+    is_on_time_schedulable : test di base, deve essere monotono
+    cache_size             : capienza della LRU dei set fattibili
+    learn_nogoods          : se False, solo cache dei positivi
+
+    I nogood stanno in un insieme di maschere (doppioni e S identici in
+    O(1)) e sono indicizzati per job: nel B&B S cresce di un job alla volta
+    e il padre era fattibile, quindi un nogood contenuto nel nuovo S contiene
+    per forza il job appena aggiunto -> basta scorrere i nogood di quel job.
+    """
+    def __init__(self,
+                 jobs: List[Job],
+                 is_on_time_schedulable,
+                 cache_size: int = 100_000,
+                 learn_nogoods: bool = True):
+        self.jobs = jobs
+        self.test = is_on_time_schedulable
+        self.cache_size = cache_size
+        self.learn_nogoods = learn_nogoods
+
+        self.bit: Dict[int, int] = {job.id: 1 << i for i, job in enumerate(jobs)}
+        self.job_of_bit: Dict[int, Job] = {1 << i: job for i, job in enumerate(jobs)}
+
+        self.feasible: "OrderedDict[int, bool]" = OrderedDict()
+        self.nogoods: Set[int] = set()
+        self.nogoods_by_job: Dict[int, Dict[int, None]] = {}   # job -> maschere (in ordine)
+
+        # contatori (copiati in BnBStats dal B&B)
+        self.calls = 0
+        self.cache_hits = 0
+        self.nogood_hits = 0
+        self.oracle_calls = 0
+
+    @property
+    def n_nogoods(self) -> int:
+        return len(self.nogoods)
+
+    # ---------- maschere ----------
+    def mask(self, ids: Iterable[int]) -> int:
+        m = 0
+        for jid in ids:
+            m |= self.bit[jid]
+        return m
+
+    def _jobs_of(self, mask: int) -> List[Job]:
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(self.job_of_bit[low])
+            mask ^= low
+        return out
+
+    # ---------- test ----------
+    def check(self, mask: int, added: Optional[int] = None) -> bool:
+        """
+        True se il set di job in mask è schedulabile on-time.
+        added: ID dell'ultimo job aggiunto (se il resto è già noto fattibile),
+               limita la ricerca dei nogood alla sua lista.
+        """
+        self.calls += 1
+        if mask in self.feasible:
+            self.feasible.move_to_end(mask)
+            self.cache_hits += 1
+            return True
+
+        if self._contains_nogood(mask, added):
+            self.nogood_hits += 1
+            return False
+
+        self.oracle_calls += 1
+        if self.test(self._jobs_of(mask)):
+            self.feasible[mask] = True
+            if len(self.feasible) > self.cache_size:
+                self.feasible.popitem(last=False)
+            return True
+
+        if self.learn_nogoods:
+            self._learn(mask)
+        return False
+
+    def check_ids(self, ids: Iterable[int], added: Optional[int] = None) -> bool:
+        return self.check(self.mask(ids), added)
+
+    def __call__(self, job_list: List[Job]) -> bool:
+        """Stessa firma di is_on_time_schedulable (es. per Node.is_feasible_leaf)."""
+        return self.check(self.mask(j.id for j in job_list))
+
+    # ---------- nogood ----------
+    def _contains_nogood(self, mask: int, added: Optional[int]) -> bool:
+        if mask in self.nogoods:
+            return True
+        if added is not None:
+            lists = [self.nogoods_by_job.get(added, ())]
+        else:
+            lists = [ngs for jid, ngs in self.nogoods_by_job.items() if mask & self.bit[jid]]
+        for ngs in lists:
+            for ng in ngs:
+                if ng & mask == ng:
+                    return True
+        return False
+
+    def _infeasible(self, mask: int) -> bool:
+        self.oracle_calls += 1
+        return not self.test(self._jobs_of(mask))
+
+    def _learn(self, mask: int) -> None:
+        """
+        Riduce un S infeasible a un nogood piccolo:
+          1) prefisso minimo in ordine di due date ancora infeasible
+             (ricerca binaria: i prefissi sono annidati)
+          2) filtro per cancellazione sul prefisso
+        """
+        by_due = sorted(self._jobs_of(mask), key=lambda j: (j.d, j.id))
+        prefix_masks = []
+        m = 0
+        for job in by_due:
+            m |= self.bit[job.id]
+            prefix_masks.append(m)
+
+        lo, hi = 0, len(prefix_masks) - 1       # prefix_masks[hi] = mask, infeasible
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._infeasible(prefix_masks[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        nogood = prefix_masks[hi]
+
+        for job in by_due[:hi]:                 # l'ultimo del prefisso serve di sicuro
+            candidate = nogood & ~self.bit[job.id]
+            if candidate and self._infeasible(candidate):
+                nogood = candidate
+
+        if nogood in self.nogoods:
+            return
+        self.nogoods.add(nogood)
+        for job in self._jobs_of(nogood):
+            self.nogoods_by_job.setdefault(job.id, {})[nogood] = None
+
+    # ---------- istanza modificata (incremental.py) ----------
+    def update_job(self, jobs: List[Job], job_id: int, change: str) -> None:
+        """
+        jobs: istanza nuova, con job_id modificato nella stessa posizione o
+        aggiunto in fondo. change:
+          - "relax"  : r o p scendono, d sale -> i set fattibili restano
+                       fattibili, i nogood con job_id no
+          - "tighten": il contrario -> restano solo i nogood
+          - "mixed"  : cadono entrambi per job_id
+          - "add"    : job nuovo, tutto resta valido
+        """
+        self.jobs = jobs
+        self.bit = {job.id: 1 << i for i, job in enumerate(jobs)}
+        self.job_of_bit = {1 << i: job for i, job in enumerate(jobs)}
+        if change in ("tighten", "mixed"):
+            self._drop_feasible(self.bit[job_id])
+        if change in ("relax", "mixed"):
+            self._drop_nogoods(job_id)
+
+    def remove_job(self, jobs: List[Job], job_id: int) -> None:
+        """jobs: istanza senza job_id (gli altri nello stesso ordine); i bit successivi scalano."""
+        bit = self.bit[job_id]
+        self._drop_feasible(bit)
+        self._drop_nogoods(job_id)
+
+        def squeeze(mask: int) -> int:
+            return (mask & (bit - 1)) | ((mask >> 1) & ~(bit - 1))
+
+        self.feasible = OrderedDict((squeeze(m), True) for m in self.feasible)
+        self.nogoods = {squeeze(ng) for ng in self.nogoods}
+        self.nogoods_by_job = {jid: {squeeze(ng): None for ng in ngs}
+                               for jid, ngs in self.nogoods_by_job.items()}
+        self.jobs = jobs
+        self.bit = {job.id: 1 << i for i, job in enumerate(jobs)}
+        self.job_of_bit = {1 << i: job for i, job in enumerate(jobs)}
+
+    def _drop_feasible(self, bit: int) -> None:
+        for mask in [m for m in self.feasible if m & bit]:
+            del self.feasible[mask]
+
+    def _drop_nogoods(self, job_id: int) -> None:
+        """Solo i job dei nogood caduti: niente scansione di tutto l'indice."""
+        for ng in self.nogoods_by_job.pop(job_id, ()):
+            self.nogoods.discard(ng)
+            for job in self._jobs_of(ng):
+                ngs = self.nogoods_by_job.get(job.id)
+                if ngs is None:
+                    continue
+                ngs.pop(ng, None)
+                if not ngs:
+                    del self.nogoods_by_job[job.id]
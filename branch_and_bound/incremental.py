@@ -0,0 +1,161 @@
+# incremental.py
+#
+# Re-solve incrementale per le domande "what-if" dei pianificatori: si
+# modifica un job (release, durata, due date), se ne aggiunge o se ne
+# cancella uno e si richiede l'ottimo, senza ripartire da zero.
+#
+# Tra una modifica di UN job e l'altra l'ottimo cambia al più di 1 (si
+# confrontano le soluzioni delle due istanze togliendo quel job dagli
+# on-time). Quindi dopo ogni modifica:
+#   - incumbent: la soluzione precedente, riparata (il job modificato va in
+#     T se non è più schedulabile, si prova a rimetterlo on-time se è in T)
+#   - lower bound: l'ottimo precedente (-1 se la modifica rilassa o toglie)
+#   - se incumbent = lower bound l'ottimo è già dimostrato, niente B&B;
+#     altrimenti B&B in modalità "proof" con stop_at = lower bound
+#   - cache dell'oracolo (set fattibili, nogood) e bound della tabella di
+#     trasposizione restano per la parte ancora valida (update_job)
+#
+# Usa lo stato globale di bb (come lns.py); oracolo e tabella di
+# trasposizione dell'istanza sono tenuti qui tra una chiamata e l'altra.
+
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+import bb
+from config import SolverConfig
+from util import is_on_time_schedulable as default_feasibility
+
+
+def _change_kind(old: Job, new: Job) -> str:
+    relax = new.r <= old.r and new.p <= old.p and new.d >= old.d
+    tighten = new.r >= old.r and new.p >= old.p and new.d <= old.d
+    if relax and tighten:
+        return "same"
+    return "relax" if relax else "tighten" if tighten else "mixed"
+
+
+class IncrementalSolver:
+    """
+    jobs                   : istanza iniziale (copiata)
+    is_on_time_schedulable : test di fattibilità (come branch_and_bound)
+    select_job             : regola di branching (None = quella di config)
+    config                 : SolverConfig del B&B; solutions e stop_at sono
+                             impostati qui (default: tabella di trasposizione
+                             attiva, serve per i bound tra un solve e l'altro)
+
+    Dopo solve(): tardy, tardy_set, lower (== tardy se dimostrato) e
+    last = {"nodes", "time", "warm", "proven"} dell'ultima chiamata.
+    """
+    def __init__(self, jobs: List[Job],
+                 is_on_time_schedulable=default_feasibility,
+                 select_job=None,
+                 config: Optional[SolverConfig] = None):
+        self.jobs = list(jobs)
+        self.test = is_on_time_schedulable
+        self.select_job = select_job
+        self.config = config or SolverConfig(tt_size=200_000, name="incremental")
+
+        self.tardy: Optional[int] = None
+        self.tardy_set: Set[int] = set()
+        self.lower = 0
+        self.last: Dict = {}
+        self._oracle = None
+        self._tt = None
+
+    # ---------- modifiche ----------
+    def update_job(self, job_id: int, r: Optional[int] = None, p: Optional[int] = None,
+                   d: Optional[int] = None) -> None:
+        i = self._index(job_id)
+        old = self.jobs[i]
+        new = Job(job_id, old.r if r is None else r, old.p if p is None else p, old.d if d is None else d)
+        change = _change_kind(old, new)
+        if change == "same":
+            return
+        self.jobs[i] = new
+        self._edited(job_id, change)
+        if self.tardy is None:
+            return
+        if change in ("relax", "mixed"):
+            self.lower = max(0, self.lower - 1)
+        if job_id in self.tardy_set:
+            self._try_insert(job_id)
+        elif not self._on_time_ok():
+            self.tardy_set.add(job_id)
+            self.tardy = len(self.tardy_set)
+
+    def add_job(self, job: Job) -> None:
+        if any(j.id == job.id for j in self.jobs):
+            raise ValueError(f"Job {job.id} già presente")
+        self.jobs.append(job)
+        self._edited(job.id, "add")
+        if self.tardy is None:
+            return
+        self.tardy_set.add(job.id)              # T + {job} resta ammissibile
+        self._try_insert(job.id)
+
+    def remove_job(self, job_id: int) -> None:
+        del self.jobs[self._index(job_id)]
+        if self._oracle is not None:
+            self._oracle.remove_job(self.jobs, job_id)
+        if self._tt is not None:
+            self._tt.update_job(self.jobs, job_id, "remove")
+        if self.tardy is None:
+            return
+        self.lower = max(0, self.lower - 1)
+        self.tardy_set.discard(job_id)          # togliere un on-time non rompe nulla
+        self.tardy = len(self.tardy_set)
+
+    # ---------- solve ----------
+    def solve(self) -> Tuple[int, Set[int]]:
+        """Ottimo dell'istanza corrente: a freddo la prima volta, poi dalla soluzione riparata."""
+        t0 = time.time()
+        warm = self.tardy is not None
+        if warm and self.tardy <= self.lower:
+            self.last = {"nodes": 0, "time": time.time() - t0, "warm": True, "proven": True}
+            return self.tardy, set(self.tardy_set)
+
+        incumbent = self.tardy_set if warm else bb.heuristic_upper_bound(self.jobs)[1]
+        config = self.config
+        solutions, stop_at = config.solutions, config.stop_at
+        config.solutions = "proof"
+        config.stop_at = self.lower if warm else None
+        bb.oracle, bb.tt = self._oracle, self._tt
+        try:
+            value, T = bb.improve(self.jobs, set(), incumbent, self.test, self.select_job,
+                                  config=config, keep_caches=warm)
+        finally:
+            config.solutions, config.stop_at = solutions, stop_at
+        self._oracle, self._tt = bb.oracle, bb.tt
+
+        proven = not bb.stats.hit_node_limit
+        self.tardy, self.tardy_set = value, set(T)
+        self.lower = value if proven else self.lower
+        self.last = {"nodes": bb.stats.nodi_generati, "time": time.time() - t0,
+                     "warm": warm, "proven": proven}
+        return value, set(T)
+
+    # ---------- interni ----------
+    def _index(self, job_id: int) -> int:
+        for i, job in enumerate(self.jobs):
+            if job.id == job_id:
+                return i
+        raise KeyError(f"Job {job_id} non presente")
+
+    def _edited(self, job_id: int, change: str) -> None:
+        if self._oracle is not None:
+            self._oracle.update_job(self.jobs, job_id, change)
+        if self._tt is not None:
+            self._tt.update_job(self.jobs, job_id, change)
+
+    def _on_time_ok(self, extra: Optional[int] = None) -> bool:
+        return self.test([j for j in self.jobs if j.id not in self.tardy_set or j.id == extra])
+
+    def _try_insert(self, job_id: int) -> None:
+        """Rimette job_id on-time se la schedula lo consente (incumbent -1)."""
+        if job_id in self.tardy_set and self._on_time_ok(extra=job_id):
+            self.tardy_set.discard(job_id)
+        self.tardy = len(self.tardy_set)
@@ -0,0 +1,152 @@
+# lns.py
+#
+# Large Neighbourhood Search con il B&B come sotto-solver, per istanze da
+# centinaia/migliaia di job. La soluzione corrente è la sequenza dei job
+# on-time (schedulati il prima possibile) più l'insieme dei tardy.
+#
+# A ogni iterazione si libera un blocco di job on-time consecutivi: tra la
+# fine del job prima del blocco (lo) e l'inizio di quello dopo (hi) la
+# macchina è a disposizione. Il sottoproblema contiene il blocco più i
+# tardy che entrerebbero in [lo, hi], con r' = max(r, lo) e d' = min(d, hi):
+# qualunque schedula on-time del sottoproblema si reinserisce al posto del
+# blocco senza toccare il resto. Lo risolve bb.improve (modalità "proof",
+# node_limit) con incumbent = blocco on-time e candidati tardy; si accetta
+# solo se migliora.
+#
+# Vicinati:
+#   - "interval": istante casuale, si liberano tutti i job del blocco
+#   - "random"  : blocco casuale, una parte casuale dei suoi job resta
+#                 on-time (S alla radice) e i candidati tardy sono estratti
+#   - "mixed"   : uno dei due a caso a ogni iterazione
+#
+# Usa lo stato globale di bb (come iterative_deepening): alla fine contiene
+# l'ultimo sottoproblema risolto.
+
+import bisect
+import math
+import random
+import time
+from typing import Dict, List, Optional, Set
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+from bb import heuristic_upper_bound, improve
+from config import SolverConfig
+from util import is_on_time_schedulable, on_time_sequence
+
+NEIGHBOURHOODS = ("interval", "random", "mixed")
+
+
+def _timeline(seq: List[Job]):
+    """Inizi e fini della sequenza schedulata il prima possibile; None se qualcuno è in ritardo."""
+    starts, ends = [], []
+    t = 0
+    for job in seq:
+        start = max(t, job.r)
+        t = start + job.p
+        if t > job.d:
+            return None
+        starts.append(start)
+        ends.append(t)
+    return starts, ends
+
+
+def _initial_sequence(jobs: List[Job], tardy: Set[int]) -> List[Job]:
+    on_time = [job for job in jobs if job.id not in tardy]
+    # l'euristica schedula in ordine (d, p): di solito la sequenza è già quella
+    seq = sorted(on_time, key=lambda j: (j.d, j.p))
+    if _timeline(seq) is None:
+        seq = on_time_sequence(on_time)
+        if seq is None:
+            raise ValueError("lns: i job on-time della soluzione iniziale non sono schedulabili")
+    return seq
+
+
+def lns(jobs: List[Job],
+        time_limit: float = 10.0,
+        max_iter: Optional[int] = None,
+        window: int = 30,
+        neighbourhood: str = "mixed",
+        node_limit: int = 2_000,
+        seed: int = 0,
+        initial: Optional[Set[int]] = None,
+        config: Optional[SolverConfig] = None) -> Dict:
+    """
+    time_limit    : secondi (la soluzione migliore è disponibile in ogni momento)
+    max_iter      : iterazioni massime (None = solo time_limit)
+    window        : job per sottoproblema (metà blocco on-time, metà candidati)
+    neighbourhood : una di NEIGHBOURHOODS
+    node_limit    : nodi per sottoproblema (se config non è data)
+    initial       : set T iniziale (default: heuristic_upper_bound)
+    config        : SolverConfig dei sottoproblemi, in modalità "proof"
+
+    Restituisce un dizionario:
+      - "tardy", "tardy_set" : migliore soluzione trovata
+      - "history"            : [(secondi, tardy)] a ogni miglioramento
+      - "iterations", "accepted", "time"
+    """
+    if neighbourhood not in NEIGHBOURHOODS:
+        raise ValueError(f"Vicinato sconosciuto: {neighbourhood} (disponibili: {NEIGHBOURHOODS})")
+    if config is None:
+        config = SolverConfig(solutions="proof", node_limit=node_limit, name="lns")
+    elif config.solutions != "proof":
+        raise ValueError("lns: i sottoproblemi vanno risolti in modalità 'proof'")
+
+    t0 = time.time()
+    rnd = random.Random(seed)
+    by_id = {job.id: job for job in jobs}
+    tardy = set(heuristic_upper_bound(jobs)[1] if initial is None else initial)
+    seq = _initial_sequence(jobs, tardy)
+    history = [(0.0, len(tardy))]
+    iterations = accepted = 0
+    half = max(1, window // 2)
+
+    while time.time() - t0 < time_limit and (max_iter is None or iterations < max_iter):
+        if not tardy:
+            break                                   # nessun tardy: ottimo
+        iterations += 1
+        starts, ends = _timeline(seq)
+        mode = neighbourhood if neighbourhood != "mixed" else rnd.choice(("interval", "random"))
+
+        # blocco seq[a:b] e intervallo [lo, hi] in cui si può rischedulare
+        k = min(len(seq), half)
+        if mode == "interval" and seq:
+            instant = rnd.uniform(0, ends[-1])
+            a = min(bisect.bisect_left(ends, instant), len(seq) - k)
+        else:
+            a = rnd.randrange(len(seq) - k + 1)
+        b = a + k
+        lo = ends[a - 1] if a > 0 else 0
+        hi = starts[b] if b < len(seq) else math.inf
+
+        cands = [by_id[jid] for jid in tardy
+                 if max(by_id[jid].r, lo) + by_id[jid].p <= min(by_id[jid].d, hi)]
+        room = window - k
+        if len(cands) > room:
+            if mode == "interval":
+                cands = sorted(cands, key=lambda j: (j.p, j.id))[:room]   # i più corti entrano meglio
+            else:
+                cands = rnd.sample(cands, room)
+        if not cands:
+            continue
+
+        block = seq[a:b]
+        fixed = set() if mode == "interval" else {job.id for job in block if rnd.random() < 0.5}
+        sub = [Job(job.id, max(job.r, lo), job.p, min(job.d, hi)) for job in block + cands]
+        cand_ids = {job.id for job in cands}
+        value, sub_tardy = improve(sub, fixed, cand_ids, is_on_time_schedulable, config=config)
+        if value >= len(cand_ids):
+            continue
+
+        order = on_time_sequence([job for job in sub if job.id not in sub_tardy])
+        seq[a:b] = [by_id[job.id] for job in order]
+        tardy = (tardy - cand_ids) | sub_tardy
+        accepted += 1
+        history.append((time.time() - t0, len(tardy)))
+
+    if _timeline(seq) is None or len(seq) + len(tardy) != len(jobs):
+        raise RuntimeError("lns: la sequenza on-time finale non è ammissibile")
+    return {"tardy": len(tardy), "tardy_set": tardy, "history": history,
+            "iterations": iterations, "accepted": accepted, "time": time.time() - t0}
@@ -1,34 +1,67 @@
 import sys
 import os
+import math
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import lower_bound.lower_bound as LB
 
 class Node:
-    def __init__(self, T=None, S=None, depth=0):
+    def __init__(self, T=None, S=None, depth=0, lagr_mult=None, branch_job=None):
         self.T = set(T) if T is not None else set()
         self.S = set(S) if S is not None else set()
         self.depth = depth
 
+        # Job su cui il padre ha fatto branching per generare questo nodo
+        self.branch_job = branch_job
+
+        # Chiavi nella tabella di trasposizione (stato iniziale / dopo i fissaggi)
+        self.tt_key = None
+        self.tt_key_fixed = None
+
         # Lower bound separati
         self.lb_moore = 0
         self.lb_kp = 0
         self.lb_lp = 0
+        self.lb_lagr = 0
+
+        # Soluzione LP del nodo (solo backend HiGHS): valore e costi ridotti di U[j]
+        self.lp_value = None
+        self.lp_reduced_costs = {}
+
+        # Moltiplicatori Lagrangiani (warm start: quelli del padre)
+        self.lagr_mult = lagr_mult
 
         # Lower bound effettivo per il pruning
         self.lb_best = 0
 
     # ===== BOUND ESISTENTI =====
-    def compute_lb_moore(self, jobs):
+    # state (SearchState): se dato, i job fuori da T si leggono dalla sua
+    # lista EDD con la maschera di T, senza filtrare jobs a ogni nodo
+    def compute_lb_moore(self, jobs, state=None):
+        if state is not None:
+            self.lb_moore = LB.compute_lb_moore_masked(state.edd, state.t_mask)
+            return
         jobs_minus_T = [j for j in jobs if j.id not in self.T]
         self.lb_moore = LB.compute_lb_moore(jobs_minus_T)
 
-    def compute_lb_KP(self, jobs):
+    def compute_lb_KP(self, jobs, state=None):
+        if state is not None:
+            self.lb_kp = LB.compute_lb_knapsack_masked(state.edd, state.t_mask)
+            return
         jobs_minus_T = [j for j in jobs if j.id not in self.T]
         self.lb_kp = LB.compute_lb_knapsack(jobs_minus_T)
 
     # ===== NUOVO BOUND LP =====
-    def compute_lb_lp(self, jobs, relax_model_file, data_file="instance.dat"):
+    def compute_lb_lp(self, jobs, relax_model_file=None, data_file="instance.dat",
+                      backend="ampl", cut_pool=None):
+        if backend == "highs":
+            self.lb_lp, self.lp_value, self.lp_reduced_costs = LB.compute_lb_lp_highs(
+                T=self.T,
+                S=self.S,
+                jobs=jobs,
+                cut_pool=cut_pool
+            )
+            return
         self.lb_lp = LB.compute_lb_lp(
             T=self.T,
             S=self.S,
@@ -37,13 +70,59 @@ class Node:
             data_file=data_file
         )
 
+    def fix_by_reduced_costs(self, best_int, assign=None):
+        """
+        Fissaggio per costi ridotti dopo compute_lb_lp(backend="highs").
+
+        Se forzare U[j] al valore opposto a quello LP porta il bound
+        oltre best_int, quella scelta non contiene soluzioni ottime:
+          - rc > 0 (U[j] = 0 nell'LP): j diventa on-time (S)
+          - rc < 0 (U[j] = 1 nell'LP): j diventa tardy (T)
+        Il fissaggio vale per tutto il sottoalbero. Restituisce il numero
+        di job fissati.
+
+        assign(job, on_time): se dato, i fissaggi passano da lì (es.
+        SearchState.assign, così il backtrack li annulla).
+        """
+        if self.lp_value is None or best_int is None:
+            return 0
+
+        fixed = 0
+        for jid, rc in self.lp_reduced_costs.items():
+            if jid in self.T or jid in self.S:
+                continue
+            if math.ceil(self.lp_value + abs(rc) - 1e-6) > best_int:
+                if assign is not None:
+                    assign(jid, rc > 0)
+                elif rc > 0:
+                    self.S.add(jid)
+                else:
+                    self.T.add(jid)
+                fixed += 1
+        return fixed
+
+    # ===== BOUND LAGRANGIANO =====
+    def compute_lb_lagrangian(self, jobs, cutoff=None):
+        """
+        Rilassa MachineCapacity del modello time-indexed; parte dai
+        moltiplicatori del padre e salva i nuovi per i figli.
+        """
+        self.lb_lagr, self.lagr_mult = LB.compute_lb_lagrangian(
+            jobs,
+            T=self.T,
+            S=self.S,
+            multipliers=self.lagr_mult,
+            cutoff=cutoff
+        )
+
     # ===== COMBINAZIONE =====
     def compute_all_bounds(self, jobs, relax_model_file, data_file="instance.dat"):
         """Calcola TUTTI i lower bound e salva il migliore."""
         self.compute_lb_moore(jobs)
         self.compute_lb_KP(jobs)
+        self.compute_lb_lagrangian(jobs)
         self.compute_lb_lp(jobs, relax_model_file, data_file)
-        self.lb_best = max(self.lb_moore, self.lb_kp, self.lb_lp)
+        self.lb_best = max(self.lb_moore, self.lb_kp, self.lb_lagr, self.lb_lp)
 
     def is_feasible_leaf(self, jobs, is_on_time_schedulable):
         if self.lb_best != 0:
@@ -57,6 +136,7 @@ class Node:
             f"Node(T={self.T}, S={self.S}, depth={self.depth}, "
             f"LB_moore={self.lb_moore}, "
             f"LB_KP={self.lb_kp}, "
+            f"LB_LAGR={self.lb_lagr}, "
             f"LB_LP={self.lb_lp}, "
             f"LB_best={self.lb_best})"
         )
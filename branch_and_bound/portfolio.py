@@ -0,0 +1,186 @@
+# portfolio.py
+#
+# Portfolio: più strategie sulla stessa istanza, ognuna in un processo,
+# con incumbent condiviso; vince la prima che dimostra l'ottimo. Il tempo
+# diventa (circa) quello della strategia migliore per quell'istanza.
+#
+# Strategie (nome, tipo, parametri):
+#   - "special": classi polinomiali (special_cases), dimostra subito o si ritira
+#   - "bb"     : branch_and_bound in modalità "proof" con una SolverConfig
+#                (branching, DFS / best-first, bound, ...)
+#   - "mip"    : modello time-indexed su HiGHS
+#
+# Condivisione: il valore migliore e il suo set T stanno in memoria
+# condivisa (letti dal B&B ogni bb.SHARE_EVERY nodi, vedi
+# bb.incumbent_channel); i set T viaggiano anche su una coda verso il
+# processo principale. Un B&B che finisce senza
+# limiti ha dimostrato che nessuna soluzione batte l'incumbent condiviso,
+# anche se l'ha trovato un altro processo.
+
+import multiprocessing as mp
+import os
+import queue as queue_mod
+import time
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+import bb
+from config import SolverConfig
+from node import Node
+from special_cases import solve_special
+from util import is_on_time_schedulable
+
+DEFAULT_STRATEGIES: List[Tuple[str, str, Dict]] = [
+    ("special", "special", {}),
+    ("bb_input", "bb", {"branching": "input"}),
+    ("bb_edd", "bb", {"branching": "edd"}),
+    ("bb_min_slack", "bb", {"branching": "min_slack"}),
+    ("bb_best_first", "bb", {"branching": "edd", "node_selection": "best_first"}),
+    ("mip", "mip", {}),
+]
+POLL = 0.5                                      # secondi tra due controlli dei processi
+
+
+class IncumbentChannel:
+    """
+    Incumbent condiviso tra i processi (interfaccia di bb.incumbent_channel):
+    valore in shared, il suo set T nei primi shared.value posti di ids
+    (|T| = valore), scritti insieme sotto lo stesso lock.
+    """
+    def __init__(self, ctx, value: int, T: Set[int], n: int, results):
+        self.shared = ctx.Value("i", value)
+        self.ids = ctx.Array("i", max(n, 1), lock=False)
+        self.ids[:len(T)] = sorted(T)
+        self.results = results
+        self.name = None                            # strategia del processo corrente
+
+    def read(self) -> Tuple[int, Set[int]]:
+        with self.shared.get_lock():
+            value = self.shared.value
+            return value, set(self.ids[:value])
+
+    def publish(self, value: int, T: Set[int]) -> None:
+        # prima il set sulla coda, poi il valore: chi legge il valore nuovo
+        # sa che il set è in arrivo
+        self.results.put(("incumbent", self.name, value, set(T)))
+        with self.shared.get_lock():
+            if value < self.shared.value:
+                self.ids[:value] = sorted(T)
+                self.shared.value = value
+
+
+def _worker(name: str, kind: str, params: Dict, jobs: List[Job], channel: IncumbentChannel) -> None:
+    """Esegue la strategia; qualunque errore diventa un "done" non dimostrato."""
+    t0 = time.time()
+    channel.name = name
+    try:
+        _run_strategy(name, kind, params, jobs, channel, t0)
+    except Exception as e:
+        print(f"[portfolio] strategia {name} fallita: {e!r}", file=sys.stderr)
+        channel.results.put(("done", name, None, False, 0, time.time() - t0))
+
+
+def _run_strategy(name: str, kind: str, params: Dict, jobs: List[Job],
+                  channel: IncumbentChannel, t0: float) -> None:
+    results = channel.results
+    if kind == "special":
+        res = solve_special(jobs)
+        if res is None:
+            results.put(("done", name, None, False, 0, time.time() - t0))
+            return
+        channel.publish(res["tardy"], res["tardy_set"])
+        results.put(("done", name, res["tardy"], True, 0, time.time() - t0))
+    elif kind == "mip":
+        from lower_bound.mip_interface import solve_time_indexed
+        res = solve_time_indexed(jobs, **params)
+        proven = res["status"] == "optimal"
+        if res["tardy"] is not None:
+            channel.publish(int(round(res["tardy"])), res["tardy_set"])
+        results.put(("done", name, res["tardy"], proven, 0, time.time() - t0))
+    else:
+        config = SolverConfig(solutions="proof", fast_paths=False, name=name, **params)
+        bb.incumbent_channel = channel
+        bb.reset(jobs)
+        bb.branch_and_bound(Node(), jobs, is_on_time_schedulable, None, config=config)
+        proven = not bb.stats.hit_node_limit
+        results.put(("done", name, bb.best_int, proven, bb.stats.nodi_generati, time.time() - t0))
+
+
+def solve_portfolio(jobs: List[Job],
+                    strategies: Optional[Sequence[Tuple[str, str, Dict]]] = None,
+                    time_limit: Optional[float] = None) -> Dict:
+    """
+    strategies : lista di (nome, tipo, parametri), default DEFAULT_STRATEGIES
+                 (parametri: kwargs di SolverConfig per "bb", di
+                 solve_time_indexed per "mip")
+    time_limit : secondi (None = fino alla prima dimostrazione)
+
+    Restituisce un dizionario:
+      - "tardy", "tardy_set" : migliore soluzione (ottima se "proven")
+      - "proven", "winner"   : dimostrata e da chi (None se time_limit)
+      - "found_by"           : strategia che ha trovato la soluzione
+      - "finished"           : {nome: (valore, dimostrata, nodi, secondi)}
+      - "time"
+    """
+    strategies = list(strategies or DEFAULT_STRATEGIES)
+    t0 = time.time()
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    results = ctx.Queue()
+    ub, ub_set = bb.heuristic_upper_bound(jobs)
+    channel = IncumbentChannel(ctx, ub, ub_set, len(jobs), results)
+    best = (ub, set(ub_set), "heuristic")
+    finished: Dict[str, Tuple] = {}
+    winner = None
+    proven_value = None
+
+    procs = [ctx.Process(target=_worker, args=(name, kind, params, jobs, channel), daemon=True)
+             for name, kind, params in strategies]
+    for proc in procs:
+        proc.start()
+
+    def reap() -> None:
+        # processi morti senza "done" (es. uccisi): contano come finiti
+        for (name, _, _), proc in zip(strategies, procs):
+            if name not in finished and proc.exitcode is not None and proc.exitcode != 0:
+                finished[name] = (None, False, 0, time.time() - t0)
+
+    def take(msg) -> None:
+        nonlocal best, winner, proven_value
+        if msg[0] == "incumbent":
+            _, name, value, T = msg
+            if value < best[0]:
+                best = (value, T, name)
+        else:
+            _, name, value, proven, nodes, seconds = msg
+            finished[name] = (value, proven, nodes, seconds)
+            if proven and winner is None:
+                winner, proven_value = name, value
+
+    try:
+        while winner is None and len(finished) < len(procs):
+            remaining = None if time_limit is None else time_limit - (time.time() - t0)
+            if remaining is not None and remaining <= 0:
+                break
+            wait = POLL if remaining is None else min(POLL, remaining)
+            try:
+                take(results.get(timeout=wait))
+            except queue_mod.Empty:
+                reap()
+        # il set dell'ottimo dimostrato può essere ancora in coda
+        while winner is not None and proven_value is not None and best[0] > proven_value:
+            try:
+                take(results.get(timeout=5))
+            except queue_mod.Empty:
+                break
+    finally:
+        for proc in procs:
+            if proc.is_alive():
+                proc.terminate()
+        for proc in procs:
+            proc.join()
+
+    return {"tardy": best[0], "tardy_set": best[1], "proven": winner is not None,
+            "winner": winner, "found_by": best[2], "finished": finished,
+            "time": time.time() - t0}
@@ -0,0 +1,109 @@
+# progress.py
+#
+# Avanzamento di una ricerca lunga, per decidere se aspettare o fermarla:
+# ogni `every` secondi una riga con nodi, nodi/s, incumbent, bound globale,
+# gap, dimensione stimata dell'albero e tempo rimanente stimato.
+#
+# Stima dell'albero (somma delle probabilità delle foglie, Kilby et al.):
+# l'albero è binario, quindi un nodo chiuso a profondità d copre la
+# frazione 2^-d dell'albero completo. bb somma queste frazioni in
+# stats.frazione_esplorata (che vale 1 a ricerca finita, e si salva nei
+# checkpoint con il resto di stats):
+#   nodi stimati = nodi / frazione,  ETA = tempo * (1 / frazione - 1)
+# In DFS la stima tende a essere ottimista all'inizio (i primi rami chiusi
+# sono quelli più corti) e converge man mano che la ricerca procede.
+
+import time
+from typing import Callable, Optional
+
+
+def estimate_tree_size(nodes: int, fraction: float) -> Optional[float]:
+    """Nodi stimati dell'albero completo (None finché non si è chiuso nulla)."""
+    if fraction <= 0:
+        return None
+    return nodes / min(fraction, 1.0)
+
+
+def estimate_remaining(elapsed: float, fraction: float) -> Optional[float]:
+    """Secondi rimanenti stimati (None finché non si è chiuso nulla)."""
+    if fraction <= 0:
+        return None
+    return elapsed * max(0.0, 1.0 / min(fraction, 1.0) - 1.0)
+
+
+def _fmt_count(x: float) -> str:
+    for div, unit in ((1e9, "G"), (1e6, "M"), (1e3, "k")):
+        if x >= div:
+            return f"{x / div:.1f}{unit}"
+    return f"{x:.0f}"
+
+
+def _fmt_seconds(s: float) -> str:
+    if s >= 86400 * 365:
+        return "> 1 anno"
+    s = int(round(s))
+    h, rest = divmod(s, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}h{m:02d}m{s:02d}s" if h else f"{m}m{s:02d}s" if m else f"{s}s"
+
+
+class ProgressReporter:
+    """
+    every : secondi tra due righe
+    out   : funzione che riceve la riga (default print)
+
+    tick() va chiamata spesso (bb la chiama ogni PROGRESS_EVERY nodi): legge
+    l'orologio e scrive solo se è passato `every` dall'ultima riga.
+    Le righe scritte restano in lines (ultima in last).
+    """
+    def __init__(self, every: float, out: Optional[Callable[[str], None]] = None):
+        self.every = every
+        self.out = out or print
+        self.start = time.time()
+        self._last_time = self.start
+        self._last_nodes = 0
+        self.lines = []
+        self.last = None
+
+    def restart(self, elapsed: float, nodes: int) -> None:
+        """Nuova ricerca (o ripresa da checkpoint dopo elapsed secondi e nodes nodi)."""
+        now = time.time()
+        self.start = now - elapsed
+        self._last_time = now
+        self._last_nodes = nodes
+
+    def tick(self, stats, incumbent: Optional[int], bound: Optional[int]) -> None:
+        if time.time() - self._last_time >= self.every:
+            self.report(stats, incumbent, bound)
+
+    def report(self, stats, incumbent: Optional[int], bound: Optional[int], final: bool = False) -> dict:
+        now = time.time()
+        elapsed = now - self.start
+        nodes = stats.nodi_generati
+        window = now - self._last_time
+        rate = (nodes - self._last_nodes) / window if window > 0 else 0.0
+        fraction = 1.0 if final else stats.frazione_esplorata
+        if bound is not None and incumbent is not None:
+            bound = min(bound, incumbent)
+        gap = (incumbent - bound) / incumbent if incumbent and bound is not None else 0.0
+        tree = estimate_tree_size(nodes, fraction)
+        eta = estimate_remaining(elapsed, fraction)
+
+        row = {"elapsed": elapsed, "nodes": nodes, "nodes_per_sec": rate,
+               "incumbent": incumbent, "bound": bound, "gap": gap,
+               "fraction": fraction, "tree_estimate": tree, "eta": eta}
+        line = (f"[progress] {elapsed:8.1f}s  nodi={_fmt_count(nodes)} ({_fmt_count(rate)}/s)  "
+                f"incumbent={incumbent}  bound={bound if bound is not None else '-'}  "
+                f"gap={gap:.1%}  ")
+        if final:
+            line += "ricerca conclusa"
+        elif tree is None:
+            line += "albero≈?  ETA ?"
+        else:
+            line += f"albero≈{_fmt_count(tree)} ({fraction:.2%})  ETA {_fmt_seconds(eta)}"
+        self.out(line)
+        self.lines.append(row)
+        self.last = row
+        self._last_time = now
+        self._last_nodes = nodes
+        return row
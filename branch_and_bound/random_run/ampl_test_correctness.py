@@ -17,13 +17,19 @@ from branch_and_bound.random_run.main_random import (
     export_to_ampl_dat,
     run_ampl,
     run_ampl_relax_node,
+    run_mip,
 )
+# ceil del rilassamento, come il confronto con run_ampl_relax_node si aspetta
+from lower_bound.mip_interface import run_mip_relax_node
 
 
 class AMPLCorrectnessTest:
     """
     Test automatico di correttezza del modello AMPL
     confrontando OPT_AMPL con OPT_BB.
+
+    backend="ampl"  -> binario AMPL + solver (serve model_file/relax_model_file)
+    backend="highs" -> stesso modello risolto in-process con HiGHS
     """
 
     def __init__(
@@ -32,11 +38,13 @@ class AMPLCorrectnessTest:
         relax_model_file,
         solver="gurobi",
         workdir=".",
+        backend="ampl",
     ):
         self.model_file = model_file
         self.relax_model_file = relax_model_file
         self.solver = solver
         self.workdir = workdir
+        self.backend = backend
 
     # ---------------------------
     # Core solver per 1 istanza
@@ -50,27 +58,37 @@ class AMPLCorrectnessTest:
         t1 = time.time()
         opt_bb, _ = get_best_solution()
 
-        # --- AMPL ---
-        export_to_ampl_dat(jobs, filename=os.path.join(self.workdir, "instance.dat"))
-        t2 = time.time()
-        opt_ampl = run_ampl(
-            model_file=self.model_file,
-            data_file=os.path.join(self.workdir, "instance.dat"),
-            solver=self.solver,
-        )
-        t3 = time.time()
-
-        # --- AMPL rilassato (root) ---
-        t4 = time.time()
-        opt_relax = run_ampl_relax_node(
-            relax_model_file=self.relax_model_file,
-            T=set(),
-            S=set(),
-            jobs=jobs,
-            data_file=os.path.join(self.workdir, "instance.dat"),
-            solver=self.solver,
-        )
-        t5 = time.time()
+        if self.backend == "highs":
+            # --- MIP in-process ---
+            t2 = time.time()
+            opt_ampl = run_mip(jobs)
+            t3 = time.time()
+
+            t4 = time.time()
+            opt_relax = run_mip_relax_node(T=set(), S=set(), jobs=jobs)
+            t5 = time.time()
+        else:
+            # --- AMPL ---
+            export_to_ampl_dat(jobs, filename=os.path.join(self.workdir, "instance.dat"))
+            t2 = time.time()
+            opt_ampl = run_ampl(
+                model_file=self.model_file,
+                data_file=os.path.join(self.workdir, "instance.dat"),
+                solver=self.solver,
+            )
+            t3 = time.time()
+
+            # --- AMPL rilassato (root) ---
+            t4 = time.time()
+            opt_relax = run_ampl_relax_node(
+                relax_model_file=self.relax_model_file,
+                T=set(),
+                S=set(),
+                jobs=jobs,
+                data_file=os.path.join(self.workdir, "instance.dat"),
+                solver=self.solver,
+            )
+            t5 = time.time()
 
         return {
             "opt_bb": opt_bb,
@@ -143,6 +161,7 @@ if __name__ == "__main__":
         model_file="/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/model.mod",
         relax_model_file="/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/relax_model.mod",
         solver="gurobi",
+        backend="highs",  # "ampl" per usare il binario AMPL
     )
 
     tester.run_random_tests(
@@ -10,6 +10,7 @@ from job_generator import JobGenerator
 from node import Node
 from bb import branch_and_bound, get_best_solution, stats, reset
 from util import is_on_time_schedulable, select_job
+from lower_bound.mip_interface import solve_time_indexed
 
 # ----------------- utility I/O sicure -----------------
 def read_int(prompt: str, default: int = None, min_val: int = None) -> int:
@@ -173,6 +174,25 @@ display sum{{j in JOBS}} U[j];
     match = re.search(r"sum\{j in JOBS\} U\[j\]\s*=\s*([0-9\.]+)", result.stdout)
     return float(match.group(1)) if match else float("inf")
 
+# ---------- MIP IN-PROCESS (HiGHS) ----------
+def run_mip(jobs, time_limit=None):
+    """Come run_ampl, ma risolve model.mod in-process con HiGHS (niente .dat né AMPL)."""
+    res = solve_time_indexed(jobs, relax=False, time_limit=time_limit)
+    if res["status"] != "optimal":
+        print(f"HiGHS non ha chiuso il MIP: {res['status']}")
+        return None
+    print(f"Risultato MIP (highs): {res['tardy']}, T = {sorted(res['tardy_set'])}")
+    return res["tardy"]
+
+def run_mip_relax_value(T, S, jobs):
+    """
+    Come run_ampl_relax_node: valore (float, senza arrotondare) del
+    rilassamento LP del nodo. Diverso da mip_interface.run_mip_relax_node,
+    che restituisce il ceil (il lower bound intero usato dal B&B).
+    """
+    res = solve_time_indexed(jobs, relax=True, T=T, S=S)
+    return res["tardy"] if res["tardy"] is not None else float("inf")
+
 def append_results_to_csv(
     filename,
     n_jobs,
@@ -225,6 +245,10 @@ def main():
     p_min = read_int("Intervallo p: min (default 1): ", default=1, min_val=1)
     p_max = read_int("Intervallo p: max (default 5): ", default=5, min_val=p_min)
     tightness = read_float("Tightness ∈ [0..1+] (default 0.2): ", default=0.2, min_val=0.0)
+    backend = input("Backend MIP [highs/ampl] (default highs): ").strip().lower() or "highs"
+    if backend not in ("highs", "ampl"):
+        print("Backend non riconosciuto, uso highs.")
+        backend = "highs"
 
     generator = JobGenerator(seed=42)
     jobs = generator.generate(n_jobs=n, r_range=(r_min, r_max), p_range=(p_min, p_max), tightness=tightness)
@@ -257,30 +281,38 @@ def main():
     first_set = all_T_sets[0] if all_T_sets else set()
     stats.print_summary(best_int, first_set)
 
-    # ---------------- Risoluzione AMPL ----------------
-    export_to_ampl_dat(jobs)
-    model_file = "/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/model.mod"
-    relax_model_file = "/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/relax_model.mod"
+    # ---------------- Risoluzione MIP (AMPL o HiGHS) ----------------
+    if backend == "ampl":
+        export_to_ampl_dat(jobs)
+        model_file = "/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/model.mod"
+        relax_model_file = "/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/relax_model.mod"
 
-    start_ampl = time.time()
-    ampl_tardy = run_ampl(model_file=model_file, data_file="instance.dat", solver="gurobi")
-    end_ampl = time.time()
+        start_ampl = time.time()
+        ampl_tardy = run_ampl(model_file=model_file, data_file="instance.dat", solver="gurobi")
+        end_ampl = time.time()
+    else:
+        start_ampl = time.time()
+        ampl_tardy = run_mip(jobs)
+        end_ampl = time.time()
     processing_time_ampl = end_ampl - start_ampl
-    print(f"Elapsed time for AMPL model: {processing_time_ampl:.6f}s")
+    print(f"Elapsed time for MIP model ({backend}): {processing_time_ampl:.6f}s")
 
     start_ampl_relax = time.time()
-    ampl_tardy_relax = run_ampl_relax_node(relax_model_file=relax_model_file, T=set(), S=set(), jobs=jobs)
+    if backend == "ampl":
+        ampl_tardy_relax = run_ampl_relax_node(relax_model_file=relax_model_file, T=set(), S=set(), jobs=jobs)
+    else:
+        ampl_tardy_relax = run_mip_relax_value(T=set(), S=set(), jobs=jobs)
     end_ampl_relax = time.time()
     processing_time_ampl_relax = end_ampl_relax - start_ampl_relax
-    print(f"Elapsed time for AMPL relaxed model: {processing_time_ampl_relax:.6f}s")
+    print(f"Elapsed time for relaxed model ({backend}): {processing_time_ampl_relax:.6f}s")
 
     # ---------------- Confronto risultati ----------------
     print("\n=== CONFRONTO RISULTATI ===")
     print(f"{'Metodo':<20} {'#Tardy':<10} {'Tempo (s)':<10}")
     print("-" * 45)
     print(f"{'Branch & Bound':<20} {best_int:<10} {processing_time_appr:<10.4f}")
-    print(f"{'AMPL Completo':<20} {ampl_tardy:<10} {processing_time_ampl:<10.4f}")
-    print(f"{'AMPL Rilassato':<20} {ampl_tardy_relax:<10} {processing_time_ampl_relax:<10.4f}")
+    print(f"{'MIP Completo (' + backend + ')':<20} {ampl_tardy:<10} {processing_time_ampl:<10.4f}")
+    print(f"{'MIP Rilassato':<20} {ampl_tardy_relax:<10} {processing_time_ampl_relax:<10.4f}")
 
 
     csv_file = os.path.join(
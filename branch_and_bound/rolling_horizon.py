@@ -0,0 +1,145 @@
+# rolling_horizon.py
+#
+# Driver a orizzonte mobile per flussi di job (o istanze enormi): i job
+# arrivano da un iteratore ordinato per release e in memoria c'è solo una
+# finestra di al più `window` job ancora da decidere.
+#
+# A ogni passo:
+#   1) si riempie la finestra dal flusso
+#   2) si risolve la finestra con release r' = max(r, t_free), dove t_free
+#      è l'istante in cui la macchina si libera dopo i job già schedulati
+#      ("beam": beam_search; "bb": B&B con node_limit che parte dalla
+#       soluzione del beam come incumbent)
+#   3) si fissano le decisioni che non cambiano più: i primi `step` job
+#      della sequenza on-time (t_free avanza) e i job che, da t_free, non
+#      possono più finire in tempo (tardy)
+# I job non fissati restano nella finestra e si rivedono col flusso nuovo.
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+import bb
+from beam_search import beam_search
+from config import SolverConfig
+from edd_astar import edd_order
+from util import is_on_time_schedulable, on_time_sequence
+
+ENGINES = ("bb", "beam")
+
+
+def _solve_window(jobs: List[Job], engine: str, config: SolverConfig) -> List[Job]:
+    """Sequenza on-time scelta per la finestra (i job assenti sono tardy)."""
+    tardy = beam_search(jobs)["tardy_set"]
+    if engine == "beam":
+        return [job for job in edd_order(jobs) if job.id not in tardy]
+    # B&B con la soluzione del beam come incumbent (cerca solo di batterla)
+    _, tardy = bb.improve(jobs, set(), tardy, is_on_time_schedulable, config=config)
+    return on_time_sequence([job for job in jobs if job.id not in tardy])
+
+
+def rolling_horizon(stream: Iterable[Job],
+                    window: int = 40,
+                    step: Optional[int] = None,
+                    engine: str = "beam",
+                    node_limit: int = 2_000,
+                    config: Optional[SolverConfig] = None,
+                    on_commit: Optional[Callable[[Job, Optional[int]], None]] = None,
+                    keep_tardy_set: bool = True) -> Dict:
+    """
+    stream        : job ordinati per release (anche un generatore infinito)
+    window        : job al più nella finestra
+    step          : job on-time fissati per passo (default window // 2)
+    engine        : una di ENGINES
+    node_limit    : nodi per finestra con "bb" (se config non è data)
+    on_commit     : chiamata (job, inizio) per ogni job fissato, inizio None
+                    se tardy
+    keep_tardy_set: False -> solo i conteggi (memoria limitata alla finestra)
+
+    Restituisce un dizionario:
+      - "tardy", "on_time", "tardy_set" (None se keep_tardy_set=False)
+      - "jobs", "windows", "time", "jobs_per_sec"
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Motore sconosciuto: {engine} (disponibili: {ENGINES})")
+    if config is None:
+        config = SolverConfig(solutions="proof", node_limit=node_limit, name="rolling")
+    step = step or max(1, window // 2)
+
+    t0 = time.time()
+    it = iter(stream)
+    buffer: List[Job] = []
+    exhausted = False
+    last_r = None
+    t_free = 0
+    n_jobs = n_tardy = n_on_time = windows = 0
+    tardy_set = set() if keep_tardy_set else None
+
+    def commit(job: Job, start: Optional[int]) -> None:
+        nonlocal n_tardy, n_on_time
+        if start is None:
+            n_tardy += 1
+            if tardy_set is not None:
+                tardy_set.add(job.id)
+        else:
+            n_on_time += 1
+        if on_commit is not None:
+            on_commit(job, start)
+
+    while True:
+        # 1) riempi la finestra
+        while not exhausted and len(buffer) < window:
+            job = next(it, None)
+            if job is None:
+                exhausted = True
+                break
+            if last_r is not None and job.r < last_r:
+                raise ValueError(f"rolling_horizon: flusso non ordinato per release ({job})")
+            last_r = job.r
+            buffer.append(job)
+            n_jobs += 1
+
+        # job che non entrano più: tardy subito
+        fits = []
+        for job in buffer:
+            if max(job.r, t_free) + job.p <= job.d:
+                fits.append(job)
+            else:
+                commit(job, None)
+        buffer = fits
+        if not buffer:
+            if exhausted:
+                break
+            continue
+
+        # 2) risolvi la finestra a partire da t_free
+        windows += 1
+        shifted = [Job(job.id, max(job.r, t_free), job.p, job.d) for job in buffer]
+        seq = _solve_window(shifted, engine, config)
+        if not seq:
+            # nessun job on-time nella finestra: sono tutti tardy
+            for job in buffer:
+                commit(job, None)
+            buffer = []
+            continue
+
+        # 3) fissa l'inizio della sequenza (tutta, a flusso finito)
+        by_id = {job.id: job for job in buffer}
+        n_fix = len(seq) if exhausted else min(step, len(seq))
+        for job in seq[:n_fix]:
+            start = max(t_free, job.r)
+            t_free = start + job.p
+            commit(by_id.pop(job.id), start)
+        if exhausted:
+            for job in by_id.values():
+                commit(job, None)
+            break
+        buffer = [job for job in buffer if job.id in by_id]
+
+    elapsed = time.time() - t0
+    return {"tardy": n_tardy, "on_time": n_on_time, "tardy_set": tardy_set,
+            "jobs": n_jobs, "windows": windows, "time": elapsed,
+            "jobs_per_sec": n_jobs / elapsed if elapsed > 0 else float("inf")}
@@ -0,0 +1,304 @@
+# search_trace.py
+#
+# Traccia binaria della ricerca, nodo per nodo, per capire DOVE l'albero
+# esplode (BnBStats dà solo i totali). Il registratore è un SearchCallbacks
+# (callbacks.py):
+#
+#   rec = TraceRecorder("run.trace")
+#   bb.set_callbacks(rec)
+#   ... branch_and_bound(...) ...
+#   bb.set_callbacks(None); rec.close()
+#
+# (oppure `with record_trace("run.trace"): ...`).
+#
+# Formato: MAGIC, lunghezza dell'header (uint32 little endian), header JSON
+# (dtype dei record, provider, motivi di chiusura), poi i record a
+# lunghezza fissa (RECORD_DTYPE + una colonna float32 per provider, NaN se
+# il bound non è stato calcolato nel nodo). I record si accumulano in un
+# array numpy di `chunk` righe e si scrivono a blocchi: nessuna scrittura
+# per nodo. Il numero di record si ricava dalla dimensione del file, quindi
+# una traccia interrotta resta leggibile fino all'ultimo blocco scritto.
+#
+# Analisi (load_trace apre il file con np.memmap, niente copia in memoria):
+#   - prune_histogram : chiusure per motivo e profondità
+#   - bound_strength  : per provider e profondità, (|T| + bound) / incumbent
+#   - subtree_sizes / hot_subtrees / heavy_path : dove sta la ricerca
+#
+#   python branch_and_bound/search_trace.py run.trace [--depth D] [--top K]
+
+import argparse
+import json
+import struct
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import bb
+from bound_pipeline import PROVIDERS
+from callbacks import SearchCallbacks, PRUNE_REASONS
+
+MAGIC = b"BBTRACE\x01"
+REASONS = PRUNE_REASONS + ("branch",)       # -1 = nodo non chiuso (node_limit, stop_at)
+DECISIONS = {-1: "radice", 0: "tardy", 1: "on-time"}
+
+RECORD_DTYPE = [
+    ("id", "<i4"),
+    ("parent", "<i4"),          # -1 per le radici (anche quelle riprese da checkpoint)
+    ("depth", "<u2"),
+    ("job", "<i4"),             # job deciso per arrivare al nodo (-1 alla radice)
+    ("decision", "i1"),         # 1 on-time, 0 tardy, -1 radice
+    ("reason", "i1"),           # indice in REASONS
+    ("n_tardy", "<u2"),         # |T| all'ingresso nel nodo
+    ("incumbent", "<i4"),
+    ("time", "<f8"),            # secondi dall'inizio della registrazione
+]
+
+
+def _dtype(providers: Sequence[str]) -> np.dtype:
+    return np.dtype(RECORD_DTYPE + [(f"lb_{name}", "<f4") for name in providers])
+
+
+# ==========================
+# REGISTRAZIONE
+# ==========================
+
+class TraceRecorder(SearchCallbacks):
+    """
+    path      : file di traccia (sovrascritto)
+    providers : bound con una colonna (default tutti i PROVIDERS)
+    chunk     : record per blocco scritto
+    """
+    def __init__(self, path: str, providers: Sequence[str] = tuple(PROVIDERS), chunk: int = 8192):
+        self.path = path
+        self.providers = tuple(providers)
+        self.dtype = _dtype(self.providers)
+        self.chunk = chunk
+        self._buf = np.zeros(chunk, dtype=self.dtype)
+        self._clear()
+        self._n = 0                          # righe usate nel blocco
+        self.written = 0                     # record totali
+        self._parents: Dict[Tuple[frozenset, frozenset], List[int]] = {}
+        self._start = time.perf_counter()
+
+        header = json.dumps({"dtype": self.dtype.descr, "providers": self.providers,
+                             "reasons": REASONS, "created": time.time()}).encode()
+        self._file = open(path, "wb", buffering=1 << 20)
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def _clear(self) -> None:
+        self._buf["reason"] = -1
+        for name in self.providers:
+            self._buf[f"lb_{name}"] = np.nan
+
+    def _flush(self) -> None:
+        if self._n:
+            self._file.write(self._buf[:self._n].tobytes())
+            self._n = 0
+            self._clear()
+
+    # ---------- eventi ----------
+    def on_node(self, node) -> None:
+        if self._n == self.chunk:
+            self._flush()
+        k = node.branch_job
+        parent = -1
+        decision = -1
+        if k is not None:
+            decision = int(k in node.S)
+            key = (frozenset(node.T.difference((k,))), frozenset(node.S.difference((k,))))
+            entry = self._parents.get(key)
+            if entry is not None:
+                parent = entry[0]
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._parents[key]
+        row = self._buf[self._n]
+        row["id"] = self.written
+        row["parent"] = parent
+        row["depth"] = node.depth
+        row["job"] = -1 if k is None else k
+        row["decision"] = decision
+        row["n_tardy"] = len(node.T)
+        row["incumbent"] = bb.best_int
+        row["time"] = time.perf_counter() - self._start
+        self._n += 1
+        self.written += 1
+
+    def on_bound(self, provider: str, value: float, seconds: float) -> None:
+        if provider in self.providers:
+            self._buf[f"lb_{provider}"][self._n - 1] = value
+
+    def on_prune(self, node, reason: str) -> None:
+        self._buf["reason"][self._n - 1] = REASONS.index(reason)
+
+    def on_branch(self, node, job: int) -> None:
+        self._buf["reason"][self._n - 1] = len(PRUNE_REASONS)
+        # i due figli cercano il padre dal loro stato meno il job di branching
+        self._parents[(frozenset(node.T), frozenset(node.S))] = [self.written - 1, 2]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def record_trace(path: str, **kwargs):
+    """Registra le ricerche eseguite nel blocco with (installa e toglie i callback)."""
+    rec = TraceRecorder(path, **kwargs)
+    bb.set_callbacks(rec)
+    try:
+        yield rec
+    finally:
+        bb.set_callbacks(None)
+        rec.close()
+
+
+# ==========================
+# ANALISI
+# ==========================
+
+def load_trace(path: str) -> Tuple[Dict, np.memmap]:
+    """(header, record) con i record mappati in memoria (sola lettura)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: non è una traccia del B&B")
+        (size,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(size))
+    offset = len(MAGIC) + 4 + size
+    dtype = np.dtype([tuple(field) for field in header["dtype"]])
+    n = (os.path.getsize(path) - offset) // dtype.itemsize
+    if n == 0:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n,))
+
+
+def prune_histogram(records) -> Dict[str, np.ndarray]:
+    """{motivo: nodi chiusi per profondità} (anche "branch" e "open")."""
+    depth = records["depth"].astype(np.int64)
+    size = int(depth.max()) + 1 if len(depth) else 0
+    out = {}
+    for code, name in list(enumerate(REASONS)) + [(-1, "open")]:
+        mask = records["reason"] == code
+        out[name] = np.bincount(depth[mask], minlength=size)
+    return out
+
+
+def bound_strength(records, providers: Sequence[str]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Per provider: "calls" (nodi in cui è stato calcolato) e "strength"
+    (media di (|T| + bound) / incumbent) per profondità. Strength >= 1
+    vuol dire che il bound arriva all'incumbent e pota.
+    """
+    depth = records["depth"].astype(np.int64)
+    size = int(depth.max()) + 1 if len(depth) else 0
+    inc = records["incumbent"].astype(np.float64)
+    out = {}
+    for name in providers:
+        value = records[f"lb_{name}"].astype(np.float64)
+        mask = ~np.isnan(value) & (inc > 0)
+        calls = np.bincount(depth[mask], minlength=size)
+        ratio = (records["n_tardy"][mask] + value[mask]) / inc[mask]
+        total = np.bincount(depth[mask], weights=ratio, minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[name] = {"calls": calls, "strength": total / calls}
+    return out
+
+
+def subtree_sizes(records) -> np.ndarray:
+    """Nodi nel sottoalbero di ogni nodo (lui compreso), una passata per livello."""
+    size = np.ones(len(records), dtype=np.int64)
+    parent = records["parent"].astype(np.int64)
+    depth = records["depth"].astype(np.int64)
+    for d in range(int(depth.max()) if len(depth) else 0, 0, -1):
+        mask = (depth == d) & (parent >= 0)
+        np.add.at(size, parent[mask], size[mask])
+    return size
+
+
+def hot_subtrees(records, depth: int, top: int = 10, sizes: Optional[np.ndarray] = None) -> List[Dict]:
+    """I `top` sottoalberi più grandi con radice a profondità depth."""
+    sizes = subtree_sizes(records) if sizes is None else sizes
+    idx = np.flatnonzero(records["depth"] == depth)
+    idx = idx[np.argsort(-sizes[idx], kind="stable")[:top]]
+    return [_describe(records, sizes, int(i)) for i in idx]
+
+
+def heavy_path(records, sizes: Optional[np.ndarray] = None) -> List[Dict]:
+    """Dalla radice più grande, sempre nel figlio con il sottoalbero più grande."""
+    sizes = subtree_sizes(records) if sizes is None else sizes
+    if not len(records):
+        return []
+    parent = records["parent"]
+    roots = np.flatnonzero(parent < 0)
+    current = int(roots[np.argmax(sizes[roots])])
+    path = [_describe(records, sizes, current)]
+    while True:
+        children = np.flatnonzero(parent == current)
+        if not len(children):
+            return path
+        current = int(children[np.argmax(sizes[children])])
+        path.append(_describe(records, sizes, current))
+
+
+def _describe(records, sizes, i: int) -> Dict:
+    r = records[i]
+    return {"id": int(r["id"]), "depth": int(r["depth"]), "job": int(r["job"]),
+            "decision": DECISIONS[int(r["decision"])], "size": int(sizes[i]),
+            "share": float(sizes[i]) / len(records), "time": float(r["time"])}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Analisi di una traccia del B&B")
+    parser.add_argument("trace")
+    parser.add_argument("--depth", type=int, default=5, help="profondità per i sottoalberi caldi")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    header, rec = load_trace(args.trace)
+    print(f"{len(rec)} nodi, {rec['time'][-1] if len(rec) else 0:.2f}s, "
+          f"profondità max {int(rec['depth'].max()) if len(rec) else 0}")
+
+    print("\n-- Chiusure per profondità --")
+    hist = prune_histogram(rec)
+    names = [name for name in hist if hist[name].any()]
+    print("depth " + " ".join(f"{name:>10s}" for name in names))
+    for d in range(len(hist["branch"])):
+        print(f"{d:5d} " + " ".join(f"{int(hist[name][d]):10d}" for name in names))
+
+    print("\n-- Forza dei bound ((|T| + lb) / incumbent, media per profondità) --")
+    strength = bound_strength(rec, header["providers"])
+    used = [name for name in strength if strength[name]["calls"].any()]
+    print("depth " + " ".join(f"{name:>16s}" for name in used))
+    for d in range(len(hist["branch"])):
+        cells = []
+        for name in used:
+            s = strength[name]
+            cells.append(f"{s['strength'][d]:7.3f} ({int(s['calls'][d]):6d})" if s["calls"][d] else " " * 16)
+        print(f"{d:5d} " + " ".join(cells))
+
+    sizes = subtree_sizes(rec)
+    print("\n-- Cammino pesante (figlio con il sottoalbero più grande) --")
+    for item in heavy_path(rec, sizes):
+        print(f"depth={item['depth']:3d} job={item['job']:5d} {item['decision']:8s} "
+              f"nodi={item['size']:9d} ({item['share']:.1%})")
+    print(f"\n-- Sottoalberi più grandi a profondità {args.depth} --")
+    for item in hot_subtrees(rec, args.depth, args.top, sizes):
+        print(f"id={item['id']:9d} job={item['job']:5d} {item['decision']:8s} "
+              f"nodi={item['size']:9d} ({item['share']:.1%}) t={item['time']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# solution_pool.py
+#
+# Raccolta delle soluzioni ottime del B&B (insiemi T di job tardy).
+# Tre modalità:
+#   - "enumerate": tutti gli ottimi, in un dizionario di frozenset (niente
+#                  scansione lineare), con tetto opzionale e scrittura su file
+#   - "proof"    : un solo ottimo; il B&B pota con >= invece di >
+#   - "count"    : solo il numero di ottimi (se ne tiene uno come esempio)
+#
+# Due foglie diverse dell'albero hanno sempre T diversi (i cammini divergono
+# su un job che da una parte è in S e dall'altra in T): l'unico duplicato
+# possibile è la soluzione iniziale (dell'euristica, o adottata da un
+# altro processo), e finché è ottima è proprio l'insieme tenuto anche in
+# "count".
+
+from typing import Dict, Iterable, List, Optional, Set
+
+MODES = ("enumerate", "proof", "count")
+
+
+class SolutionPool:
+    """
+    mode        : una di MODES
+    limit       : massimo numero di ottimi memorizzati ("enumerate");
+                  il conteggio continua anche oltre
+    stream_path : se dato ("enumerate"), ogni ottimo è scritto su file come
+                  riga "tardy<TAB>id id ...": quando l'incumbent migliora le
+                  righe precedenti restano, valgono quelle col tardy minimo
+
+    configure() si può chiamare dopo reset() (il B&B lo fa all'avvio con
+    la modalità della SolverConfig): la soluzione iniziale resta.
+    """
+    def __init__(self, mode: str = "enumerate", limit: Optional[int] = None,
+                 stream_path: Optional[str] = None):
+        self.configure(mode, limit, stream_path)
+        self.reset(None, set())
+
+    def configure(self, mode: str = "enumerate", limit: Optional[int] = None,
+                  stream_path: Optional[str] = None, append: bool = False) -> None:
+        """append: continua un file già scritto (ripresa da checkpoint)."""
+        if mode not in MODES:
+            raise ValueError(f"Modalità soluzioni sconosciuta: {mode} (disponibili: {MODES})")
+        if getattr(self, "_stream", None) is not None:
+            self.close()
+        self.mode = mode
+        self.limit = limit
+        self.stream_path = stream_path if mode == "enumerate" else None
+        self._stream = None
+        if self.stream_path is not None:
+            self._stream = open(self.stream_path, "a" if append else "w")
+            if not append:
+                for T in getattr(self, "sols", {}):
+                    self._write(T, self.best)
+
+    def reset(self, value: Optional[int], first_set: Iterable[int]) -> None:
+        """Nuova istanza: incumbent iniziale (es. euristica) e il suo insieme T."""
+        self.best = value
+        self.sols: Dict[frozenset, None] = {frozenset(first_set): None}
+        self.count = 1
+
+    def adopt(self, value: int, T: Iterable[int]) -> None:
+        """Incumbent trovato altrove (es. altro processo del portfolio): valore e suo set T."""
+        self.best = value
+        self.sols = {frozenset(T): None}
+        self.count = 1
+
+    @property
+    def strict(self) -> int:
+        """Quanto sottrarre a best_int per la soglia di potatura (bound > soglia)."""
+        return 1 if self.mode == "proof" else 0
+
+    # ---------- inserimento ----------
+    def offer(self, T: Set[int], value: int) -> None:
+        """Foglia ammissibile con |T| = value (già <= best, vedi potatura nel B&B)."""
+        if self.best is None or value < self.best:
+            self.best = value
+            self.sols = {}
+            self.count = 0
+            self._add(frozenset(T), value)
+        elif value == self.best:
+            self._add(frozenset(T), value)
+
+    def _add(self, T: frozenset, value: int) -> None:
+        if T in self.sols:
+            return
+        self.count += 1
+
+        if self.mode == "proof":
+            self.sols = {T: None}
+        elif self.mode == "count":
+            if not self.sols:
+                self.sols[T] = None
+        elif self.limit is None or len(self.sols) < self.limit:
+            self.sols[T] = None
+
+        if self._stream is not None:
+            self._write(T, value)
+
+    def _write(self, T: frozenset, value: int) -> None:
+        self._stream.write(f"{value}\t{' '.join(map(str, sorted(T)))}\n")
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def __getstate__(self):
+        # per i checkpoint: il file aperto non si serializza
+        state = dict(self.__dict__)
+        state["_stream"] = None
+        return state
+
+    # ---------- lettura ----------
+    def solutions(self) -> List[Set[int]]:
+        return [set(T) for T in self.sols]
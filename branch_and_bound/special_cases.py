@@ -0,0 +1,141 @@
+# special_cases.py
+#
+# Classi di istanze di 1 | r_j | sum U_j risolvibili in tempo polinomiale,
+# riconosciute prima del B&B:
+#   - release tutte uguali  -> Moore-Hodgson, O(n log n)
+#   - p_j = 1 per tutti     -> matching greedy sugli slot unitari, O(n log n)
+#   - r e d "agreeable"     -> DP sull'ordine EDD (Kise, Ibaraki, Mine), O(n^2)
+# Tutti restituiscono un ottimo (un solo set T).
+
+import heapq
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+from edd_astar import edd_order, is_edd_dominant
+
+
+# ==========================
+# CLASSIFICATORE
+# ==========================
+
+def classify(jobs: List[Job]) -> str:
+    """'equal_release', 'unit_p', 'agreeable' oppure 'general' (nell'ordine di costo)."""
+    if not jobs:
+        return "equal_release"
+    if len({job.r for job in jobs}) == 1:
+        return "equal_release"
+    if all(job.p == 1 for job in jobs):
+        return "unit_p"
+    if is_edd_dominant(jobs):
+        return "agreeable"
+    return "general"
+
+
+# ==========================
+# ALGORITMI ESATTI
+# ==========================
+
+def moore_hodgson(jobs: List[Job]) -> Tuple[int, Set[int]]:
+    """Release tutte uguali (= r): EDD e, a ogni ritardo, scarta il job più lungo."""
+    if not jobs:
+        return 0, set()
+    t = jobs[0].r
+    heap = []                               # (-p, id) degli on-time
+    tardy = set()
+    for job in edd_order(jobs):
+        t += job.p
+        heapq.heappush(heap, (-job.p, job.id))
+        if t > job.d:
+            neg_p, jid = heapq.heappop(heap)
+            t += neg_p
+            tardy.add(jid)
+    return len(tardy), tardy
+
+
+def unit_times(jobs: List[Job]) -> Tuple[int, Set[int]]:
+    """
+    p_j = 1: un job on-time occupa uno slot [t, t+1) con r_j <= t <= d_j - 1.
+    Gli intervalli di slot ammessi sono contigui (grafo bipartito convesso):
+    assegnare ogni slot, in ordine, al job disponibile con d minima dà un
+    matching massimo (Glover). I job rimasti senza slot sono tardy.
+    """
+    by_release = sorted(jobs, key=lambda j: (j.r, j.d))
+    heap = []                               # (d, id) dei job rilasciati
+    on_time = set()
+    idx = 0
+    t = 0
+    while idx < len(by_release) or heap:
+        if not heap:
+            t = max(t, by_release[idx].r)
+        while idx < len(by_release) and by_release[idx].r <= t:
+            job = by_release[idx]
+            heapq.heappush(heap, (job.d, job.id))
+            idx += 1
+        # i job che non possono più finire entro d sono tardy
+        while heap and heap[0][0] < t + 1:
+            heapq.heappop(heap)
+        if heap:
+            _, jid = heapq.heappop(heap)
+            on_time.add(jid)
+            t += 1
+    tardy = {job.id for job in jobs} - on_time
+    return len(tardy), tardy
+
+
+def agreeable_dp(jobs: List[Job]) -> Tuple[int, Set[int]]:
+    """
+    r e d nello stesso ordine: gli on-time si possono sequenziare in EDD.
+    f[u] = minimo istante di fine degli on-time tra i primi i job (in EDD)
+    con u tardy; per ogni job: tardy (u+1, stesso t) oppure on-time se
+    max(t, r) + p <= d.
+    """
+    order = edd_order(jobs)
+    n = len(order)
+    f = [0] + [math.inf] * n
+    on_time_choice = []                     # per job: u -> True se on-time
+    for job in order:
+        g = [math.inf] * (n + 1)
+        choice = [False] * (n + 1)
+        for u in range(n + 1):
+            if f[u] < math.inf:
+                end = max(f[u], job.r) + job.p
+                if end <= job.d and end < g[u]:
+                    g[u] = end
+                    choice[u] = True
+            if u > 0 and f[u - 1] < g[u]:
+                g[u] = f[u - 1]
+                choice[u] = False
+        f = g
+        on_time_choice.append(choice)
+
+    best = min(u for u in range(n + 1) if f[u] < math.inf)
+    tardy = set()
+    u = best
+    for i in range(n - 1, -1, -1):
+        if not on_time_choice[i][u]:
+            tardy.add(order[i].id)
+            u -= 1
+    return best, tardy
+
+
+SOLVERS = {
+    "equal_release": moore_hodgson,
+    "unit_p": unit_times,
+    "agreeable": agreeable_dp,
+}
+
+
+def solve_special(jobs: List[Job]) -> Optional[Dict]:
+    """
+    Se l'istanza appartiene a una classe polinomiale restituisce
+    {"class", "tardy", "tardy_set"} (ottimo esatto), altrimenti None.
+    """
+    kind = classify(jobs)
+    if kind not in SOLVERS:
+        return None
+    tardy, tardy_set = SOLVERS[kind](jobs)
+    return {"class": kind, "tardy": tardy, "tardy_set": tardy_set}
@@ -0,0 +1,166 @@
+# subset_dp.py
+#
+# Solver esatto per istanze (o sottoproblemi) piccoli: programmazione
+# dinamica sui sottoinsiemi di job, codificati come maschere di bit.
+#
+#   C[mask] = minimo istante di fine di una schedula in cui TUTTI i job di
+#             mask sono on-time (INF se non esiste)
+#   C[0]    = 0
+#   C[mask] = min su j in mask con C[mask ^ j] < INF di max(C[mask ^ j], r_j) + p_j,
+#             purché <= d_j (j è l'ultimo job della schedula)
+#
+# Con le release l'ordine EDD degli on-time non è sempre quello giusto,
+# per questo si minimizza sull'ultimo job invece di fissare l'ordine.
+# Se mask è infeasible lo è ogni suo sovrainsieme: la DP procede per numero
+# di job (popcount) e si ferma al primo livello tutto infeasible.
+#
+# Tabelle NumPy: 2^n interi a 64 bit per C più le maschere per livello
+# (uint32), circa 48 MB con n = 22. Oltre MAX_JOBS si rifiuta l'istanza.
+#
+# Dentro il B&B (solve_tail) la stessa ricorrenza gira in avanti su un
+# dizionario con i soli stati utili: con S fissato e un incumbent da
+# battere quasi tutti i sottoinsiemi si scartano subito, e costa molto
+# meno della tabella completa (e dei nodi del sottoalbero che chiude).
+
+import functools
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+
+MAX_JOBS = 22
+INF = np.iinfo(np.int64).max // 4
+
+_POPCOUNT_8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.int8)
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    masks = masks.astype(np.uint32, copy=False)
+    return (_POPCOUNT_8[masks & 0xFF] + _POPCOUNT_8[(masks >> 8) & 0xFF]
+            + _POPCOUNT_8[(masks >> 16) & 0xFF] + _POPCOUNT_8[masks >> 24])
+
+
+@functools.lru_cache(maxsize=4)
+def _layers(n: int) -> List[np.ndarray]:
+    """Maschere su n bit raggruppate per popcount (riusate tra le chiamate)."""
+    masks = np.arange(1 << n, dtype=np.uint32)
+    counts = _popcount(masks)
+    order = np.argsort(counts, kind="stable")
+    bounds = np.searchsorted(counts[order], np.arange(n + 2))
+    return [order[bounds[k]:bounds[k + 1]].astype(np.uint32) for k in range(n + 1)]
+
+
+def earliest_completion(jobs: List[Job]) -> np.ndarray:
+    """Tabella C (vedi sopra); il bit i della maschera è jobs[i]."""
+    n = len(jobs)
+    if n > MAX_JOBS:
+        raise ValueError(f"subset_dp: {n} job, massimo {MAX_JOBS}")
+    C = np.full(1 << n, INF, dtype=np.int64)
+    C[0] = 0
+    layers = _layers(n)
+    for k in range(1, n + 1):
+        masks = layers[k]
+        best = np.full(len(masks), INF, dtype=np.int64)
+        for i, job in enumerate(jobs):
+            bit = np.uint32(1 << i)
+            sel = np.flatnonzero(masks & bit)
+            prev = C[masks[sel] ^ bit]
+            end = np.maximum(prev, job.r) + job.p
+            end[(prev == INF) | (end > job.d)] = INF
+            best[sel] = np.minimum(best[sel], end)
+        C[masks] = best
+        if not (best < INF).any():
+            break                       # nessun set di k job: nemmeno più grandi
+    return C
+
+
+def optimal_masks(C: np.ndarray, required: int = 0, all_optima: bool = True) -> np.ndarray:
+    """
+    Maschere on-time di cardinalità massima tra quelle fattibili che
+    contengono required. all_optima=False -> solo la prima.
+    """
+    feasible = np.flatnonzero(C < INF).astype(np.uint32)
+    feasible = feasible[(feasible & np.uint32(required)) == required]
+    counts = _popcount(feasible)
+    best = feasible[counts == counts.max()]
+    return best if all_optima else best[:1]
+
+
+def solve_tail(jobs: List[Job], required: int, need: int,
+               all_optima: bool = True) -> Tuple[Optional[int], List[int]]:
+    """
+    Sottoproblema di un nodo: jobs = job non in T, required = maschera di S.
+    Cerca le maschere on-time di cardinalità massima che contengono S, purché
+    almeno need (meno on-time non migliorano l'incumbent).
+    Restituisce (cardinalità, maschere) oppure (None, []) se non ce ne sono.
+
+    Stato = maschera -> minimo istante di fine; si scarta se un job di S non
+    ancora schedulato non entra più, o se anche mettendo on-time tutti i job
+    che entrano ancora non si arriva a need.
+    """
+    m = len(jobs)
+    r = [job.r for job in jobs]
+    p = [job.p for job in jobs]
+    d = [job.d for job in jobs]
+    layer = {0: 0}
+    best_k, best = None, []
+    k = 0
+    while layer:
+        if k >= need:
+            hit = [mask for mask in layer if mask & required == required]
+            if hit:
+                best_k, best = k, (hit if all_optima else hit[:1])
+        nxt = {}
+        for mask, t in layer.items():
+            ext = []
+            dead = False
+            for i in range(m):
+                bit = 1 << i
+                if mask & bit:
+                    continue
+                end = (t if t > r[i] else r[i]) + p[i]
+                if end <= d[i]:
+                    ext.append((mask | bit, end))
+                elif required & bit:
+                    dead = True
+                    break
+            if dead or k + len(ext) < need:
+                continue
+            for new_mask, end in ext:
+                if end < nxt.get(new_mask, INF):
+                    nxt[new_mask] = end
+        layer = nxt
+        k += 1
+    return best_k, best
+
+
+def mask_to_ids(jobs: List[Job], mask: int) -> set:
+    return {job.id for i, job in enumerate(jobs) if mask >> i & 1}
+
+
+def solve_subset_dp(jobs: List[Job], on_time: Iterable[int] = ()) -> Dict:
+    """
+    Ottimo esatto (n <= MAX_JOBS). on_time: ID che devono restare on-time.
+
+    Restituisce un dizionario (come solve_time_indexed / solve_edd_astar):
+      - "tardy"     : minimo numero di tardy (None se on_time è infeasible)
+      - "tardy_set" : ID dei job tardy di un ottimo
+      - "states"    : sottoinsiemi fattibili trovati
+      - "time"      : secondi
+    """
+    t0 = time.time()
+    C = earliest_completion(jobs)
+    on_time = set(on_time)
+    required = sum(1 << i for i, job in enumerate(jobs) if job.id in on_time)
+    states = int((C < INF).sum())
+    if C[required] == INF:
+        return {"tardy": None, "tardy_set": None, "states": states, "time": time.time() - t0}
+    mask = int(optimal_masks(C, required, all_optima=False)[0])
+    tardy_set = {job.id for job in jobs} - mask_to_ids(jobs, mask)
+    return {"tardy": len(tardy_set), "tardy_set": tardy_set, "states": states,
+            "time": time.time() - t0}
@@ -0,0 +1,129 @@
+# trail.py
+#
+# Stato di ricerca mutabile per la DFS (stile solver CP): un solo Node i
+# cui T e S vengono modificati sul posto quando si fa branching, più una
+# "trail" con le decisioni prese, annullate in ordine inverso al backtrack.
+# Le maschere di bit di T e S sono tenute aggiornate: test di fattibilità,
+# tabella di trasposizione e foglie le leggono senza costruire liste.
+
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+from node import Node
+
+
+def job_bits(jobs: List[Job]) -> Dict[int, int]:
+    """Bit di ciascun job (stesso ordine di FeasibilityOracle e TranspositionTable)."""
+    return {job.id: 1 << i for i, job in enumerate(jobs)}
+
+
+def edd_entries(jobs: List[Job], bit: Dict[int, int]) -> List[Tuple[int, int, int, int]]:
+    """(d, p, r, bit) di ogni job in ordine EDD: i bound la scorrono saltando T con la maschera."""
+    return [(job.d, job.p, job.r, bit[job.id]) for job in sorted(jobs, key=lambda j: (j.d, j.id))]
+
+
+class SearchState:
+    """
+    node   : il nodo condiviso (node.T, node.S cambiano sul posto)
+    bit    : job_bits(jobs), condiviso tra tutti gli stati della ricerca
+    edd    : edd_entries(jobs, bit), condivisa (calcolata qui se non data)
+    t_mask, s_mask : maschere di node.T e node.S
+    n_free : job non ancora decisi
+    trail  : lista di (job, on_time, branching) nell'ordine delle decisioni
+             (branching = False per i fissaggi)
+    """
+    def __init__(self, jobs: List[Job], node: Node, bit: Dict[int, int],
+                 edd: Optional[List[Tuple[int, int, int, int]]] = None):
+        self.node = node
+        self.bit = bit
+        self.edd = edd if edd is not None else edd_entries(jobs, bit)
+        self.full_mask = (1 << len(jobs)) - 1
+        self.t_mask = 0
+        for jid in node.T:
+            self.t_mask |= bit[jid]
+        self.s_mask = 0
+        for jid in node.S:
+            self.s_mask |= bit[jid]
+        self.n_free = len(jobs) - len(node.T) - len(node.S)
+        self.trail: List[Tuple[int, bool, bool]] = []
+
+    # ---------- decisioni ----------
+    def assign(self, jid: int, on_time: bool, branch: bool = False) -> None:
+        if on_time:
+            self.node.S.add(jid)
+            self.s_mask |= self.bit[jid]
+        else:
+            self.node.T.add(jid)
+            self.t_mask |= self.bit[jid]
+        self.n_free -= 1
+        self.trail.append((jid, on_time, branch))
+
+    def mark(self) -> int:
+        return len(self.trail)
+
+    def undo_to(self, mark: int) -> None:
+        """Annulla tutte le decisioni prese dopo mark (branching e fissaggi)."""
+        trail = self.trail
+        while len(trail) > mark:
+            jid, on_time, _ = trail.pop()
+            if on_time:
+                self.node.S.discard(jid)
+                self.s_mask &= ~self.bit[jid]
+            else:
+                self.node.T.discard(jid)
+                self.t_mask &= ~self.bit[jid]
+            self.n_free += 1
+
+    # ---------- letture ----------
+    def key(self) -> Tuple[Tuple[int, int], int, int]:
+        """
+        Chiave per la tabella di trasposizione: ((F, S'), |T|, maschera di T)
+        con F = job non decisi. Il resto del problema (quanti job di F
+        finiscono tardy) dipende da S solo finché qualche job di F può
+        iniziare prima che S sia finito: se la schedula EDD di S è on-time e
+        finisce entro la minima release di F, S' = 0 e lo stato condivide la
+        voce con ogni altra storia (S, T) che lascia gli stessi job F.
+        Altrimenti S' = S.
+        """
+        free = self.full_mask & ~(self.t_mask | self.s_mask)
+        s_mask = self.s_mask
+        start = math.inf                 # minima release di F
+        t = 0                            # fine della schedula EDD di S
+        on_time = True
+        for d, p, r, b in self.edd:
+            if free & b:
+                if r < start:
+                    start = r
+            elif s_mask & b:
+                t = (t if t > r else r) + p
+                on_time = on_time and t <= d
+        shared = on_time and t <= start
+        return (free, 0 if shared else s_mask), len(self.node.T), self.t_mask
+
+    def candidate_mask(self) -> int:
+        """Job on-time se tutti i rimanenti lo fossero (complemento di T)."""
+        return self.full_mask & ~self.t_mask
+
+    def frontier(self) -> List[Tuple[Set[int], Set[int], int, Optional[int]]]:
+        """
+        Nodi che la DFS deve ancora visitare, nell'ordine di visita, come
+        (T, S, depth, job di branching): il nodo corrente, poi i fratelli
+        'tardy' ancora in sospeso dal più profondo. Si ricavano dalla sola
+        trail: un branching 'on-time' lascia in sospeso il ramo 'tardy' con
+        lo stesso stato del padre (fissaggi del padre compresi).
+        """
+        node = self.node
+        T, S = set(node.T), set(node.S)
+        depth = node.depth
+        out = [(set(T), set(S), depth, node.branch_job)]
+        for jid, on_time, branch in reversed(self.trail):
+            (S if on_time else T).discard(jid)
+            if branch:
+                if on_time:
+                    out.append((T | {jid}, set(S), depth, jid))
+                depth -= 1
+        return out
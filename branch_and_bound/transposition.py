@@ -0,0 +1,125 @@
+# transposition.py
+#
+# Tabella di trasposizione per il B&B. Un nodo lascia da decidere i job F
+# (non in T né in S); il suo sottoalbero vale |T| + (minimo numero di tardy
+# in F con S on-time). La seconda parte, la "coda", non dipende da T, e da
+# S solo attraverso la macchina: se S si può finire (EDD, on-time) prima
+# che qualunque job di F sia rilasciato, la coda dipende solo da F. Così
+# storie diverse che arrivano agli stessi job F (un job on-time e un altro
+# tardy, o viceversa) condividono la voce; la chiave la costruisce
+# SearchState.key(), con S nella chiave solo quando non si può ignorare.
+#
+# Si salvano bound sulla coda (bound sul sottoalbero - |T|): una voce
+# scritta da un nodo con |T| = a pota un nodo con |T| = b se
+# coda + b supera la soglia. Le voci valgono anche tra ricerche successive
+# sulla stessa istanza (re-solve, incumbent diverso, approfondimento
+# iterativo) finché non cambia l'istanza.
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+
+
+class TranspositionTable:
+    """
+    Mappa chiave di SearchState.key() -> (coda, ricerca, T), LRU con al più
+    max_entries voci.
+
+      coda    : minimo dimostrato del numero di tardy tra i job non decisi
+                (bound del sottoalbero - |T|)
+      ricerca : id della ricerca che ha visitato TUTTO il sottoalbero
+                (None se lo stato è stato solo potato per bound)
+      T       : maschera di T del nodo visitato tutto
+
+    Rivisitare uno stato è inutile se |T| + coda supera best_int (vale per
+    sempre, best_int può solo scendere) oppure se la ricerca corrente ha
+    già visitato tutto lo stesso stato (stesso T: le sue soluzioni con
+    valore = best_int sono già nel pool). best_int qui è la soglia di
+    potatura del B&B.
+    """
+    def __init__(self, jobs: List[Job], max_entries: int = 200_000):
+        self.max_entries = max_entries
+        self.signature = self.instance_signature(jobs)
+        self.bit: Dict[int, int] = {job.id: 1 << i for i, job in enumerate(jobs)}
+        self.table: "OrderedDict[Tuple[int, int], Tuple[float, Optional[int], int]]" = OrderedDict()
+        self.search_id = 0
+
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def instance_signature(jobs: List[Job]) -> Tuple:
+        return tuple((job.id, job.r, job.p, job.d) for job in jobs)
+
+    def new_search(self) -> None:
+        """Da chiamare a ogni nuova visita: le chiusure complete precedenti restano solo bound."""
+        self.search_id += 1
+
+    def probe(self, state_key, best_int: int) -> bool:
+        """True se lo stato è già chiuso rispetto all'incumbent corrente."""
+        key, n_tardy, t_mask = state_key
+        self.lookups += 1
+        entry = self.table.get(key)
+        if entry is None:
+            return False
+        self.table.move_to_end(key)
+        tail, search, done_t = entry
+        if n_tardy + tail > best_int or (search == self.search_id and done_t == t_mask):
+            self.hits += 1
+            return True
+        return False
+
+    def store(self, state_key, bound: float, complete: bool = False) -> None:
+        """bound: lower bound sul sottoalbero (|T| compreso)."""
+        key, n_tardy, t_mask = state_key
+        tail = bound - n_tardy
+        search, done_t = (self.search_id, t_mask) if complete else (None, 0)
+        old = self.table.get(key)
+        if old is not None:
+            tail = max(tail, old[0])
+            if search is None:
+                search, done_t = old[1], old[2]
+        self.table[key] = (tail, search, done_t)
+        self.table.move_to_end(key)
+        self.stores += 1
+        if len(self.table) > self.max_entries:
+            self.table.popitem(last=False)
+            self.evictions += 1
+
+    def update_job(self, jobs: List[Job], job_id: int, change: str) -> None:
+        """
+        Istanza modificata su job_id (vedi FeasibilityOracle.update_job):
+        le code sono minimi del numero di tardy, quindi
+          - "tighten", "add": restano valide (l'ottimo non può scendere)
+          - "relax", "mixed": restano solo le voci in cui job_id non è tra i
+            non decisi né nella S della chiave (la coda non lo riguarda)
+          - "remove": i bit scalano e le code possono scendere, si svuota
+        """
+        if change == "remove":
+            self.table.clear()
+        elif change in ("relax", "mixed"):
+            bit = self.bit[job_id]
+            for key in [k for k in self.table if (k[0] | k[1]) & bit]:
+                del self.table[key]
+        self.signature = self.instance_signature(jobs)
+        self.bit = {job.id: 1 << i for i, job in enumerate(jobs)}
+
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def memory_bytes(self) -> int:
+        """Stima della memoria occupata (dizionario + chiavi + valori)."""
+        total = sys.getsizeof(self.table)
+        for key, entry in self.table.items():
+            total += sys.getsizeof(key) + sum(map(sys.getsizeof, key))
+            total += sys.getsizeof(entry) + sum(map(sys.getsizeof, entry))
+        return total
+
+    def __len__(self):
+        return len(self.table)
@@ -1,16 +1,116 @@
-def is_on_time_schedulable(job_list):
-    # Earliest Deadline First semplificato
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lower_bound.lower_bound import simulate_pedd_tardy_count
+
+
+def edd_schedulable(job_list, t=0):
+    # Earliest Deadline First semplificato (non preemptive, da t in poi):
+    # se riesce la schedula esiste davvero, se fallisce non si può concludere
     sorted_jobs = sorted(job_list, key=lambda j: j.d)
-    t = 0
     for job in sorted_jobs:
         t = max(t, job.r) + job.p
         if t > job.d:
             return False
     return True
 
+
+def is_on_time_schedulable(job_list):
+    """
+    True se i job si possono eseguire tutti on-time (non preemptive, con r_j).
+    Test esatto a livelli:
+      1) EDD preemptive con qualche ritardo -> infeasible (rilassamento)
+      2) EDD non preemptive senza ritardi   -> feasible (è una schedula)
+      3) altrimenti ricerca esatta (_exact_schedulable)
+    """
+    if not job_list:
+        return True
+    if simulate_pedd_tardy_count(job_list) > 0:
+        return False
+    if edd_schedulable(job_list):
+        return True
+    return _exact_schedulable(job_list)
+
+
+def _exact_schedulable(job_list):
+    return _exact_sequence(job_list) is not None
+
+
+def _exact_sequence(job_list):
+    """
+    DFS sulle sequenze (in ordine EDD) con:
+      - schedule attive: un job non parte dopo che un altro job non schedulato
+        avrebbe già potuto finire (metterlo prima non ritarda nessuno)
+      - memo: stesso insieme schedulato raggiunto a un tempo >= di uno già
+        fallito -> fallisce anche ora
+      - in ogni stato i filtri 1) e 2) sui job rimasti, a partire da t
+    Restituisce la sequenza trovata, None se non esiste.
+    """
+    jobs = sorted(job_list, key=lambda j: (j.d, j.r, j.id))
+    full = (1 << len(jobs)) - 1
+    failed_at = {}      # mask -> minimo t a cui è fallito
+
+    def dfs(mask, t):
+        if mask == full:
+            return []
+        if failed_at.get(mask, float('inf')) <= t:
+            return None
+        failed_at[mask] = t
+
+        remaining = [(i, job) for i, job in enumerate(jobs) if not mask >> i & 1]
+        rem_jobs = [job for _, job in remaining]
+        if simulate_pedd_tardy_count(rem_jobs, start=t) > 0:
+            return None
+        if edd_schedulable(rem_jobs, t):
+            return sorted(rem_jobs, key=lambda j: j.d)
+
+        earliest_end = min(max(t, job.r) + job.p for job in rem_jobs)
+        for i, job in remaining:
+            start = max(t, job.r)
+            if start >= earliest_end or start + job.p > job.d:
+                continue
+            rest = dfs(mask | (1 << i), start + job.p)
+            if rest is not None:
+                return [job] + rest
+        return None
+
+    return dfs(0, 0)
+
+
+def on_time_sequence(job_list):
+    """Come is_on_time_schedulable, ma restituisce la sequenza (None se non esiste)."""
+    if not job_list:
+        return []
+    if simulate_pedd_tardy_count(job_list) > 0:
+        return None
+    if edd_schedulable(job_list):
+        return sorted(job_list, key=lambda j: j.d)
+    return _exact_sequence(job_list)
+
 def select_job(node, jobs):
-    decided = node.T.union(node.S)
+    T, S = node.T, node.S
     for job in jobs:
-        if job.id not in decided:
+        if job.id not in T and job.id not in S:
             return job.id
     return None
+
+
+def _undecided(node, jobs):
+    T, S = node.T, node.S
+    return [job for job in jobs if job.id not in T and job.id not in S]
+
+def select_job_edd(node, jobs):
+    # job non deciso con due date minima
+    remain = _undecided(node, jobs)
+    return min(remain, key=lambda j: (j.d, j.id)).id if remain else None
+
+def select_job_min_slack(node, jobs):
+    # job non deciso con slack d - r - p minimo (il più "a rischio")
+    remain = _undecided(node, jobs)
+    return min(remain, key=lambda j: (j.d - j.r - j.p, j.id)).id if remain else None
+
+def select_job_max_p(node, jobs):
+    # job non deciso più lungo (candidato naturale a essere tardy)
+    remain = _undecided(node, jobs)
+    return max(remain, key=lambda j: (j.p, -j.id)).id if remain else None
@@ -0,0 +1,166 @@
+# lower_bound/cuts.py
+#
+# Piani di taglio per il rilassamento LP del modello time-indexed.
+# Tutti i tagli sono espressi solo sulle variabili U[j] e dipendono
+# solo dai dati dell'istanza: valgono in ogni nodo e si possono
+# riusare lungo tutto l'albero (CutPool).
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+
+
+# ===========================
+# 1) POOL DEI TAGLI
+# ===========================
+class CutPool:
+    """
+    Insieme di tagli  sum_j coef_j * U[j] >= rhs  validi per tutta l'istanza.
+
+    In un nodo:
+      - i job in T hanno U[j] = 1 -> il loro coefficiente scala il rhs
+      - i job in S hanno U[j] = 0 -> spariscono
+    Un taglio che nel nodo diventa rhs <= 0 è ridondante e non viene passato.
+    """
+    def __init__(self):
+        self.cuts: Dict[Tuple, Tuple[Dict[int, float], float]] = {}
+        self.n_separated = 0
+
+    def add(self, coefs: Dict[int, float], rhs: float) -> bool:
+        key = (tuple(sorted(coefs.items())), rhs)
+        if key in self.cuts:
+            return False
+        self.cuts[key] = (coefs, rhs)
+        self.n_separated += 1
+        return True
+
+    def for_node(self, T: Iterable[int], S: Iterable[int]) -> List[Tuple[Dict[int, float], float]]:
+        T = set(T)
+        S = set(S)
+        out = []
+        for coefs, rhs in self.cuts.values():
+            rhs_node = rhs - sum(c for j, c in coefs.items() if j in T)
+            if rhs_node <= 1e-9:
+                continue
+            node_coefs = {j: c for j, c in coefs.items() if j not in T and j not in S}
+            out.append((node_coefs, rhs_node))
+        return out
+
+    def __len__(self):
+        return len(self.cuts)
+
+
+# ===========================
+# 2) SEPARAZIONE
+# ===========================
+def _max_fitting(p_sorted: List[int], capacity: int) -> int:
+    """Massimo numero di job (p crescenti) che entrano in capacity."""
+    total = 0
+    for k, p in enumerate(p_sorted):
+        total += p
+        if total > capacity:
+            return k
+    return len(p_sorted)
+
+
+def separate_interval_cuts(jobs: List[Job],
+                           U: Dict[int, float],
+                           max_cuts: int = 30,
+                           eps: float = 1e-4) -> List[Tuple[Dict[int, float], float, float]]:
+    """
+    Per ogni intervallo [a, b] con a = r_i e b = d_k, i job con r_j >= a e
+    d_j <= b che sono on-time devono stare interamente in [a, b]:
+
+      capacità : sum_j p_j * (1 - U[j]) <= b - a
+                 ->  sum_j p_j * U[j] >= sum_j p_j - (b - a)
+      cover    : al più k di essi entrano (k = quanti p più piccoli stanno in b - a)
+                 ->  sum_j U[j] >= |J(a,b)| - k
+
+    U: valori LP di U[j] (i job in T valgono 1).
+    Restituisce i tagli più violati: lista di (coef, rhs, violazione).
+    """
+    found = []
+    releases = sorted({job.r for job in jobs})
+    by_due = sorted(jobs, key=lambda j: j.d)
+
+    for a in releases:
+        inside = []         # job con r >= a, in ordine di d
+        for idx, job in enumerate(by_due):
+            if job.r < a:
+                continue
+            inside.append(job)
+            if job.d <= a:
+                continue
+            # chiude un intervallo solo sull'ultimo job con questa due date
+            if idx + 1 < len(by_due) and by_due[idx + 1].d == job.d:
+                continue
+
+            b = job.d
+            cap = b - a
+            sum_p = sum(j.p for j in inside)
+            if sum_p <= cap:
+                continue
+
+            # capacità (pesata con p)
+            lhs_p = sum(j.p * U.get(j.id, 0.0) for j in inside)
+            rhs_p = sum_p - cap
+            if lhs_p < rhs_p - eps:
+                found.append(({j.id: float(j.p) for j in inside}, float(rhs_p), (rhs_p - lhs_p) / rhs_p))
+
+            # cover / cardinalità
+            k = _max_fitting(sorted(j.p for j in inside), cap)
+            rhs_c = len(inside) - k
+            lhs_c = sum(U.get(j.id, 0.0) for j in inside)
+            if rhs_c > 0 and lhs_c < rhs_c - eps:
+                found.append(({j.id: 1.0 for j in inside}, float(rhs_c), (rhs_c - lhs_c) / rhs_c))
+
+    found.sort(key=lambda c: -c[2])
+    return found[:max_cuts]
+
+
+# ===========================
+# 3) LOOP DI SEPARAZIONE
+# ===========================
+def solve_lp_with_cuts(jobs: List[Job],
+                       T: Iterable[int] = (),
+                       S: Iterable[int] = (),
+                       pool: Optional[CutPool] = None,
+                       max_rounds: int = 5,
+                       max_cuts: int = 30) -> Dict:
+    """
+    Rilassamento LP rinforzato:
+      - Big-M stretto: sum_{t > d_j} x[j,t] <= U[j]
+      - tagli del pool (già trovati in altri nodi)
+      - fino a max_rounds giri di separazione degli interval/cover cut
+
+    Restituisce lo stesso dizionario di solve_time_indexed(relax=True),
+    con in più "cuts" = numero di tagli usati nell'ultimo LP.
+    """
+    from lower_bound.mip_interface import solve_time_indexed
+
+    T = set(T)
+    S = set(S)
+    if pool is None:
+        pool = CutPool()
+
+    res = None
+    node_cuts = []
+    for _ in range(max_rounds + 1):
+        node_cuts = pool.for_node(T, S)
+        res = solve_time_indexed(jobs, relax=True, T=T, S=S, cuts=node_cuts, tighten=True)
+        if res["tardy"] is None:
+            break
+
+        U = dict(res["U"])
+        U.update({j: 1.0 for j in T})
+        added = 0
+        for coefs, rhs, _ in separate_interval_cuts(jobs, U, max_cuts=max_cuts):
+            added += pool.add(coefs, rhs)
+        if added == 0:
+            break
+
+    res["cuts"] = len(node_cuts)
+    return res
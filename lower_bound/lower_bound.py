@@ -1,7 +1,9 @@
 import heapq
-from typing import List
+import math
+from typing import List, Optional, Tuple
 import sys
 import os
+import numpy as np
 from lower_bound.ampl_interface import run_ampl_relax_node
 
 # Aggiusta il path se usi un package diverso
@@ -40,6 +42,27 @@ def compute_lb_knapsack(jobs: List[Job]) -> int:
     K_star = max(dp)
     return n - K_star
 
+def compute_lb_knapsack_masked(edd, skip: int) -> int:
+    """
+    Come compute_lb_knapsack sui job di edd (d, p, r, bit) in ordine EDD il
+    cui bit non è in skip (es. la maschera di T): nessuna lista filtrata.
+    """
+    H = None
+    n = 0
+    for d, p, r, b in edd:
+        if not skip & b:
+            H = d                       # ordine EDD: l'ultimo ha d massima
+            n += 1
+    if H is None:
+        return 0
+    dp = [0] * (H + 1)
+    for d, w, r, b in edd:
+        if skip & b:
+            continue
+        for c in range(H, w - 1, -1):
+            dp[c] = max(dp[c], dp[c - w] + 1)
+    return n - max(dp)
+
 # ===========================
 # 2) LOWER BOUND MOORE
 # ===========================
@@ -83,40 +106,76 @@ def compute_lb_moore(jobs: List[Job]) -> int:
 
     return len(tardy_ids)
 
+
+def compute_lb_moore_masked(edd, skip: int) -> int:
+    """
+    Come compute_lb_moore sui job di edd (d, p, r, bit), già in ordine EDD,
+    il cui bit non è in skip: niente copia né ordinamento per nodo.
+    (Moore-Hodgson è ottimo per 1 || sum U_j: l'ordine tra due date uguali
+    non cambia il conteggio.)
+    """
+    r_min = None
+    for d, p, r, b in edd:
+        if not skip & b and (r_min is None or r < r_min):
+            r_min = r
+    if r_min is None:
+        return 0
+    t = 0
+    max_heap = []
+    tardy = 0
+    for d, p, r, b in edd:
+        if skip & b:
+            continue
+        t += p
+        heapq.heappush(max_heap, -p)
+        if t > d - r_min:
+            t += heapq.heappop(max_heap)
+            tardy += 1
+    return tardy
+
 # ===========================
 # 3) EDF PREEMPTIVE - SOLO PER ESPERIMENTI
 # ===========================
-def simulate_pedd_tardy_count(jobs: List[Job]) -> int:
+def simulate_pedd_tardy_count(jobs: List[Job], start: Optional[int] = None) -> int:
     """
     Simula una schedula preemptive EDD (Earliest Due Date) e restituisce
     il numero di job tardy in quella schedula.
 
+    start: se dato, la macchina è libera solo da start in poi
+           (release effettive max(r_j, start)).
+
     IMPORTANTE:
     - Non garantisce l'ottimo del problema preemptive 1 | pmtn, r_j | sum U_j
     - Non deve essere usato come lower bound nel B&B
+    - Però 0 tardy <=> esiste una schedula preemptive senza ritardi
+      (EDD preemptive è ottimo per Lmax): se il conteggio è > 0, l'insieme
+      non è schedulabile on-time nemmeno senza preemption (test in util.py)
     """
     if not jobs:
         return 0
 
-    jobs_by_release = sorted(jobs, key=lambda job: job.r)
+    def release(job):
+        return job.r if start is None else max(job.r, start)
+
+    jobs_by_release = sorted(jobs, key=release)
     active_heap = []  # [due_date, remaining_time, job_id]
-    t = jobs_by_release[0].r
+    t = release(jobs_by_release[0])
     idx = 0
     tardy_count = 0
 
     while idx < len(jobs_by_release) or active_heap:
         # Rilascio job
-        while idx < len(jobs_by_release) and jobs_by_release[idx].r <= t:
+        while idx < len(jobs_by_release) and release(jobs_by_release[idx]) <= t:
             job = jobs_by_release[idx]
             heapq.heappush(active_heap, [job.d, job.p, job.id])
             idx += 1
 
         if not active_heap:
-            t = jobs_by_release[idx].r
+            t = release(jobs_by_release[idx])
             continue
 
         due_date, rem_time, job_id = heapq.heappop(active_heap)
-        next_release = jobs_by_release[idx].r if idx < len(jobs_by_release) else float('inf')
+        next_release = release(jobs_by_release[idx]) if idx < len(jobs_by_release) else float('inf')
         run_time = min(rem_time, next_release - t)
         t += run_time
         rem_time -= run_time
@@ -143,3 +202,132 @@ def compute_lb_lp(T, S, jobs, relax_model_file, data_file="instance.dat"):
         jobs=jobs,
         data_file=data_file
     )
+
+def compute_lb_lp_highs(T, S, jobs, cut_pool=None):
+    """
+    Stesso rilassamento LP di compute_lb_lp, ma risolto in-process con HiGHS.
+
+    Con cut_pool (lower_bound.cuts.CutPool) l'LP è rinforzato: Big-M stretto,
+    tagli già nel pool e nuovi giri di separazione, che restano nel pool
+    per i nodi successivi.
+
+    Restituisce (lb intero, valore LP, costi ridotti di U[j]); come per AMPL
+    il valore comprende i job già fissati in T. Nodo infeasible -> (inf, inf, {});
+    LP non risolto all'ottimo (es. time_limit) -> nessun bound oltre |T|.
+    """
+    from lower_bound.mip_interface import solve_time_indexed
+    from lower_bound.cuts import solve_lp_with_cuts
+
+    if cut_pool is not None:
+        res = solve_lp_with_cuts(jobs, T=T, S=S, pool=cut_pool)
+    else:
+        res = solve_time_indexed(jobs, relax=True, T=T, S=S)
+    if res["status"] == "infeasible":
+        return math.inf, math.inf, {}
+    if res["tardy"] is None:
+        return len(T), len(T), {}
+    return math.ceil(res["tardy"] - 1e-6), res["tardy"], res["reduced_costs"]
+
+# ===========================
+# 5) LOWER BOUND LAGRANGIANO
+# ===========================
+def compute_lb_lagrangian(jobs: List[Job],
+                          T=(),
+                          S=(),
+                          H: Optional[int] = None,
+                          multipliers: Optional[np.ndarray] = None,
+                          cutoff: Optional[int] = None,
+                          max_iter: int = 200) -> Tuple[int, np.ndarray]:
+    """
+    Lower bound Lagrangiano del modello time-indexed (model.mod),
+    rilassando i vincoli MachineCapacity con moltiplicatori lambda_t >= 0.
+
+    Idea:
+    - senza capacità ogni job è indipendente: sceglie l'istante di fine tau
+      che minimizza  W_j(tau) + [tau > d_j],  con W_j(tau) = somma di
+      lambda sugli slot tau-p_j+1 .. tau occupati dal job
+    - L(lambda) = sum_j min_tau(...) - sum_t lambda_t  è un lower bound
+      (i job di S sono forzati a tau <= d_j, quelli di T sono esclusi
+      e contati a parte dal chiamante)
+    - i moltiplicatori si migliorano con subgradiente (passo di Polyak),
+      tutto vettorizzato in NumPy su una matrice job x tempo
+
+    multipliers: lambda di partenza (es. quelli del nodo padre)
+    cutoff     : se il bound raggiunge questo valore ci si ferma (basta per potare)
+
+    Restituisce (lb intero sui job non in T, migliori moltiplicatori).
+    """
+    T = set(T)
+    S = set(S)
+    free = [job for job in jobs if job.id not in T]
+    if H is None:
+        H = max(job.r for job in jobs) + sum(job.p for job in jobs) if jobs else 0
+
+    lam = np.zeros(H + 1)
+    if multipliers is not None:
+        k = min(len(multipliers), H + 1)
+        lam[:k] = multipliers[:k]
+    if not free:
+        return 0, lam
+
+    r = np.array([job.r for job in free])
+    p = np.array([job.p for job in free])
+    d = np.array([job.d for job in free])
+    on_time = np.array([job.id in S for job in free])
+
+    # penalità statica: +inf fuori dominio, +1 se tau > d_j (job tardy)
+    tau = np.arange(H + 1)
+    base = (tau[None, :] > d[:, None]).astype(float)
+    base[tau[None, :] < (r + p)[:, None]] = np.inf
+    base[on_time[:, None] & (tau[None, :] > d[:, None])] = np.inf
+    if np.isinf(base.min(axis=1)).any():
+        # un job di S non può finire entro d_j: nodo infeasible
+        return math.inf, lam
+
+    start_idx = np.clip(tau[None, :] - p[:, None], -1, H)  # ultimo slot NON occupato
+    rows = np.arange(len(free))
+
+    def evaluate(lam):
+        cs = np.concatenate([np.cumsum(lam), [0.0]])  # cs[-1] = 0
+        cost = base + (cs[tau][None, :] - cs[start_idx])
+        choice = cost.argmin(axis=1)
+        value = cost[rows, choice].sum() - lam[1:].sum()
+        return value, choice
+
+    best_val, choice = evaluate(lam)
+    best_lam = lam.copy()
+    target = len(free) if cutoff is None else cutoff
+    theta = 2.0
+    stall = 0
+
+    for _ in range(max_iter):
+        if cutoff is not None and math.ceil(best_val - 1e-6) >= cutoff:
+            break
+
+        # subgradiente: occupazione di ogni slot - 1 (slot 0 non esiste)
+        occ = np.zeros(H + 2)
+        np.add.at(occ, choice - p[rows] + 1, 1.0)
+        np.add.at(occ, choice + 1, -1.0)
+        g = np.cumsum(occ)[:H + 1] - 1.0
+        g[0] = 0.0
+        g[(lam <= 0) & (g < 0)] = 0.0  # proiezione su lambda >= 0
+        norm = float(g @ g)
+        if norm == 0:
+            break
+
+        step = theta * max(target - best_val, 1e-3) / norm
+        lam = np.maximum(lam + step * g, 0.0)
+        val, choice = evaluate(lam)
+
+        if val > best_val + 1e-9:
+            best_val, best_lam = val, lam.copy()
+            stall = 0
+        else:
+            stall += 1
+            if stall >= 10:
+                theta /= 2
+                stall = 0
+                if theta < 1e-3:
+                    break
+
+    return max(0, math.ceil(best_val - 1e-6)), best_lam
@@ -0,0 +1,264 @@
+# lower_bound/mip_interface.py
+#
+# Backend MIP "in-process" per 1 | r_j | sum U_j.
+# Stesso modello time-indexed di ampl_model/model.mod, risolto con HiGHS
+# (incluso in scipy) senza binario AMPL, file .dat o subprocess.
+
+import math
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy.optimize import LinearConstraint, linprog, milp
+from scipy.sparse import coo_matrix, vstack
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from branch_and_bound.job import Job
+
+
+# ===========================
+# 1) COSTRUZIONE MODELLO
+# ===========================
+def horizon(jobs: List[Job]) -> int:
+    """H = max r_j + sum p_j (stesso valore scritto da export_to_ampl_dat)."""
+    if not jobs:
+        return 0
+    return max(job.r for job in jobs) + sum(job.p for job in jobs)
+
+
+def build_time_indexed(jobs: List[Job],
+                       T: Iterable[int] = (),
+                       S: Iterable[int] = (),
+                       H: Optional[int] = None,
+                       cuts: Optional[List] = None,
+                       tighten: bool = False) -> Dict:
+    """
+    Costruisce in forma matriciale il modello di model.mod:
+
+      variabili : x[j,t] (solo t in [r_j + p_j, H]) seguite da U[j]
+      OneCompletion   : sum_t x[j,t] = 1
+      MachineCapacity : sum_{j, tau in [t, t+p_j-1]} x[j,tau] <= 1
+      Tardiness       : sum_t t * x[j,t] - H * U[j] <= d_j
+
+    C[j] è sostituita dalla sua definizione, ReleaseDate è imposto
+    restringendo il dominio di t. Un job che termina in tau lavora negli
+    slot tau-p_j+1 .. tau (slot t = intervallo [t-1, t)).
+
+    Fissaggi di nodo:
+      - job in T: esclusi dal modello (un tardy si accoda in fondo
+        all'orizzonte, quindi toglierlo dà ancora un rilassamento valido)
+      - job in S: U[j] = 0 e t <= d_j
+
+    Rinforzi (vedi lower_bound/cuts.py):
+      - tighten: Big-M per job M_j = H - d_j e  sum_{t > d_j} x[j,t] <= U[j]
+      - cuts   : lista di (coef, rhs) con  sum_j coef_j * U[j] >= rhs
+    """
+    T = set(T)
+    S = set(S)
+    if H is None:
+        H = horizon(jobs)
+
+    free = [job for job in jobs if job.id not in T]
+    m = len(free)
+
+    # --- domini delle x ---
+    first = np.array([job.r + job.p for job in free], dtype=np.int64)
+    last = np.array([min(job.d, H) if job.id in S else H for job in free], dtype=np.int64)
+    width = np.maximum(last - first + 1, 0)
+    nx = int(width.sum())
+
+    x_job = np.repeat(np.arange(m), width)
+    offset = np.arange(nx) - np.repeat(np.cumsum(width) - width, width)
+    x_t = np.repeat(first, width) + offset
+    p_arr = np.array([job.p for job in free], dtype=np.int64)
+    d_arr = np.array([job.d for job in free], dtype=np.int64)
+
+    n_var = nx + m
+    u_idx = nx + np.arange(m)
+
+    # --- OneCompletion ---
+    A_eq = coo_matrix((np.ones(nx), (x_job, np.arange(nx))), shape=(m, n_var)).tocsr()
+    b_eq = np.ones(m)
+
+    # --- MachineCapacity: x[j,tau] occupa gli slot t = tau - p_j + 1 .. tau ---
+    reps = p_arr[x_job]
+    cap_col = np.repeat(np.arange(nx), reps)
+    cap_row = np.repeat(x_t - reps + 1, reps) + (np.arange(int(reps.sum())) - np.repeat(np.cumsum(reps) - reps, reps))
+    A_cap = coo_matrix((np.ones(len(cap_row)), (cap_row, cap_col)), shape=(H + 1, n_var)).tocsr()
+    b_cap = np.ones(H + 1)
+
+    # --- Tardiness (Big-M = H, oppure H - d_j se tighten) ---
+    big_m = np.maximum(H - d_arr, 0).astype(float) if tighten else np.full(m, float(H))
+    tard_row = np.concatenate([x_job, np.arange(m)])
+    tard_col = np.concatenate([np.arange(nx), u_idx])
+    tard_val = np.concatenate([x_t.astype(float), -big_m])
+    A_tard = coo_matrix((tard_val, (tard_row, tard_col)), shape=(m, n_var)).tocsr()
+    b_tard = d_arr.astype(float)
+
+    extra_A = []
+    extra_b = []
+
+    # --- Tardiness disaggregata: finire dopo d_j implica U[j] = 1 ---
+    if tighten:
+        late = x_t > d_arr[x_job]
+        rows = np.concatenate([x_job[late], np.arange(m)])
+        cols = np.concatenate([np.nonzero(late)[0], u_idx])
+        vals = np.concatenate([np.ones(int(late.sum())), -np.ones(m)])
+        extra_A.append(coo_matrix((vals, (rows, cols)), shape=(m, n_var)))
+        extra_b.append(np.zeros(m))
+
+    # --- Tagli su U:  -sum coef_j U[j] <= -rhs ---
+    if cuts:
+        pos = {job.id: i for i, job in enumerate(free)}
+        rows, cols, vals = [], [], []
+        for k, (coefs, rhs) in enumerate(cuts):
+            for jid, c in coefs.items():
+                if jid in pos:
+                    rows.append(k)
+                    cols.append(nx + pos[jid])
+                    vals.append(-c)
+        extra_A.append(coo_matrix((vals, (rows, cols)), shape=(len(cuts), n_var)))
+        extra_b.append(np.array([-rhs for _, rhs in cuts], dtype=float))
+
+    c = np.zeros(n_var)
+    c[u_idx] = 1.0
+
+    lb = np.zeros(n_var)
+    ub = np.ones(n_var)
+    for i, job in enumerate(free):
+        if job.id in S:
+            ub[nx + i] = 0.0
+
+    return {
+        "H": H,
+        "jobs": free,
+        "n_fixed_tardy": len(jobs) - m,
+        "c": c,
+        "A_eq": A_eq, "b_eq": b_eq,
+        "A_ub": vstack([A_cap, A_tard] + extra_A).tocsr(),
+        "b_ub": np.concatenate([b_cap, b_tard] + extra_b),
+        "lb": lb, "ub": ub,
+        "nx": nx,
+        "x_job": x_job, "x_t": x_t,
+        "empty_domain": bool((width == 0).any()),
+    }
+
+
+# ===========================
+# 2) RISOLUZIONE
+# ===========================
+def solve_time_indexed(jobs: List[Job],
+                       relax: bool = False,
+                       T: Iterable[int] = (),
+                       S: Iterable[int] = (),
+                       time_limit: Optional[float] = None,
+                       cuts: Optional[List] = None,
+                       tighten: bool = False) -> Dict:
+    """
+    Risolve il modello time-indexed con HiGHS.
+
+    Restituisce un dizionario:
+      - "tardy"     : valore obiettivo (int per il MIP, float per il rilassato),
+                      già comprensivo dei job fissati in T; None se non risolto
+                      (il rilassato fermato da time_limit: l'iterato non è
+                      un lower bound valido)
+      - "tardy_set" : set di ID tardy (solo MIP; per il rilassato: U[j] > 0.5)
+      - "time"      : secondi di solve (costruzione modello inclusa)
+      - "status"    : "optimal", "infeasible", "time_limit" o messaggio HiGHS
+      - "reduced_costs" (solo rilassato): {id: costo ridotto di U[j]} per i
+        job non fissati; > 0 se U[j] è a 0 (forzarlo a 1 alza l'LP di almeno
+        tanto), < 0 se U[j] è a 1 (forzarlo a 0 alza l'LP di |rc|)
+      - "U" (solo rilassato): {id: valore LP di U[j]} per i job non in T
+    """
+    t0 = time.time()
+    model = build_time_indexed(jobs, T=T, S=S, cuts=cuts, tighten=tighten)
+    fixed = model["n_fixed_tardy"]
+    T_ids = {job.id for job in jobs} - {job.id for job in model["jobs"]}
+
+    if not model["jobs"]:
+        return {"tardy": fixed, "tardy_set": T_ids, "time": time.time() - t0, "status": "optimal"}
+    if model["empty_domain"]:
+        # un job di S non può comunque finire entro la sua due date
+        return {"tardy": None, "tardy_set": set(), "time": time.time() - t0, "status": "infeasible"}
+
+    nx = model["nx"]
+    options = {} if time_limit is None else {"time_limit": time_limit}
+
+    if relax:
+        res = linprog(model["c"],
+                      A_ub=model["A_ub"], b_ub=model["b_ub"],
+                      A_eq=model["A_eq"], b_eq=model["b_eq"],
+                      bounds=np.column_stack([model["lb"], model["ub"]]),
+                      method="highs-ipm", options=options)
+    else:
+        res = milp(model["c"],
+                   constraints=[LinearConstraint(model["A_eq"], model["b_eq"], model["b_eq"]),
+                                LinearConstraint(model["A_ub"], -np.inf, model["b_ub"])],
+                   integrality=np.ones(len(model["c"])),
+                   bounds=(model["lb"], model["ub"]),
+                   options=options)
+
+    elapsed = time.time() - t0
+    if res.x is None:
+        status = "infeasible" if res.status == 2 else str(res.message)
+        return {"tardy": None, "tardy_set": set(), "time": elapsed, "status": status}
+
+    U = res.x[nx:]
+    tardy_set = T_ids | {job.id for job, u in zip(model["jobs"], U) if u > 0.5}
+    status = "optimal" if res.status == 0 else ("time_limit" if res.status == 1 else str(res.message))
+    if relax and status != "optimal":
+        return {"tardy": None, "tardy_set": set(), "time": elapsed, "status": status}
+    if not relax:
+        tardy = fixed + int(round(res.fun))
+        return {"tardy": tardy, "tardy_set": tardy_set, "time": elapsed, "status": status}
+
+    S = set(S)
+    rc = res.lower.marginals[nx:] + res.upper.marginals[nx:]
+    reduced_costs = {job.id: float(v) for job, v in zip(model["jobs"], rc) if job.id not in S}
+    return {"tardy": fixed + float(res.fun), "tardy_set": tardy_set, "time": elapsed,
+            "status": status, "reduced_costs": reduced_costs,
+            "U": {job.id: float(u) for job, u in zip(model["jobs"], U)}}
+
+
+def run_mip(jobs: List[Job], time_limit: Optional[float] = None) -> Optional[int]:
+    """
+    Equivalente in-process di run_ampl: numero ottimo di tardy, None se errore.
+    """
+    res = solve_time_indexed(jobs, relax=False, time_limit=time_limit)
+    return res["tardy"] if res["status"] == "optimal" else None
+
+
+def run_mip_relax_node(T, S, jobs: List[Job]) -> int:
+    """
+    Equivalente in-process di run_ampl_relax_node: ceil del rilassamento LP
+    con i fissaggi del nodo. Se il nodo è infeasible restituisce +inf.
+    """
+    res = solve_time_indexed(jobs, relax=True, T=T, S=S)
+    if res["tardy"] is None:
+        return float("inf")
+    return math.ceil(res["tardy"] - 1e-6)
+
+
+# ===========================
+# 3) LETTURA .dat AMPL
+# ===========================
+def read_ampl_dat(path: str) -> List[Job]:
+    """
+    Legge un file .dat nel formato di export_to_ampl_dat / ampl_model/test_dat
+    (param r, p, d indicizzati per job) e restituisce la lista di Job.
+    """
+    with open(path) as f:
+        text = f.read()
+
+    params = {}
+    for name in ("r", "p", "d"):
+        match = re.search(rf"param\s+{name}\s*:=(.*?);", text, re.S)
+        if match is None:
+            raise ValueError(f"param {name} non trovato in {path}")
+        values = [int(v) for v in match.group(1).split()]
+        params[name] = dict(zip(values[0::2], values[1::2]))
+
+    return [Job(j, params["r"][j], params["p"][j], params["d"][j]) for j in sorted(params["r"])]
@@ -1,14 +1,20 @@
 from pathlib import Path
 import re
 import subprocess
+import sys
+import os
 import time
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from lower_bound.mip_interface import read_ampl_dat, solve_time_indexed
+
 # ---------------- PATH ----------------
 DATA_DIR = Path("/home/giulia/Documenti/AMOD_project/Tardy-solver/")
 DAT_FILE = DATA_DIR / "instance.dat"
 MODEL_EXACT = Path("/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/model.mod")
 MODEL_RELAX = Path("/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl_model/relax_model.mod")
 AMPL_EXE = "/home/giulia/Documenti/AMOD_project/Tardy-solver/ampl.linux-intel64/ampl"
+BACKEND = "highs"  # "ampl" per usare il binario AMPL
 
 # ---------------- UTIL ----------------
 def run_ampl(model_file, datfile):
@@ -39,16 +45,26 @@ display sum{{j in JOBS}} U[j];
     else:
         raise ValueError(f"Impossibile leggere il risultato AMPL:\n{output}")
 
+def run_highs(model_file, datfile):
+    """Come run_ampl, ma in-process con HiGHS: il modello rilassato è quello con relax_integrality."""
+    jobs = read_ampl_dat(str(datfile))
+    res = solve_time_indexed(jobs, relax=(Path(model_file) == MODEL_RELAX))
+    if res["tardy"] is None:
+        raise ValueError(f"HiGHS non ha risolto {datfile}: {res['status']}")
+    return res["tardy"], res["time"]
+
 # ---------------- TEST ----------------
 def test_ampl_vs_ub(dat_file, model_exact, model_relax, ub):
     """Confronta AMPL completo e rilassato con l'UB."""
+    solve = run_highs if BACKEND == "highs" else run_ampl
+
     # Risolvo modello completo
-    opt, t_exact = run_ampl(model_exact, dat_file)
-    print(f"AMPL completo: {opt} tardy in {t_exact:.2f}s")
+    opt, t_exact = solve(model_exact, dat_file)
+    print(f"{BACKEND} completo: {opt} tardy in {t_exact:.2f}s")
 
     # Risolvo modello rilassato
-    lb, t_relax = run_ampl(model_relax, dat_file)
-    print(f"AMPL rilassato: {lb} tardy in {t_relax:.2f}s")
+    lb, t_relax = solve(model_relax, dat_file)
+    print(f"{BACKEND} rilassato: {lb} tardy in {t_relax:.2f}s")
 
     # Confronti
     assert lb <= opt, f"LB {lb} > OPT {opt}"
@@ -1,14 +1,23 @@
 import sys
 import os
 import time
+import tempfile
 
 # Aggiusta il path al progetto
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../branch_and_bound/')))
 
-from bb import reset, branch_and_bound, get_best_solution, stats, heuristic_upper_bound
+import bb
+from bb import reset, branch_and_bound, resume, get_best_solution, get_solution_count, stats, heuristic_upper_bound
+from config import SolverConfig
 from util import is_on_time_schedulable, select_job
 from node import Node
 from job import Job
+from job_generator import JobGenerator
+from incremental import IncrementalSolver
+from subset_dp import earliest_completion, optimal_masks, mask_to_ids
+from callbacks import SearchCallbacks, PRUNE_REASONS
+from search_trace import record_trace, load_trace, prune_histogram, bound_strength, subtree_sizes, heavy_path, REASONS
+from algorithm_selection import FEATURES, instance_features, train, select_config
 from lower_bound.lower_bound import compute_lb_moore
 
 
@@ -212,6 +221,378 @@ def test_moore_strict_lb():
     return run_test(jobs, expected_opt=0, name="moore_strict_lb")
 
 
+def test_solution_modes():
+    """
+    Stesso caso di symmetry_many_opt: C(5,3) = 10 set ottimi con 2 tardy.
+      - enumerate: li trova tutti (e con pool_limit ne tiene al più 4)
+      - count    : ne conta 10 tenendone uno
+      - proof    : un solo ottimo
+    """
+    jobs = [Job(i+1, 0, 1, 3) for i in range(5)]
+    ok = True
+    for mode, limit, n_kept, n_count in (("enumerate", None, 10, 10),
+                                         ("enumerate", 4, 4, 10),
+                                         ("count", None, 1, 10),
+                                         ("proof", None, 1, 1)):
+        reset(jobs)
+        branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                         config=SolverConfig(solutions=mode, pool_limit=limit))
+        opt, all_T = get_best_solution()
+        good = (opt == 2 and len(all_T) == n_kept and get_solution_count() == n_count
+                and all(len(T) == 2 for T in all_T))
+        ok = ok and good
+        print(f"[solution_modes:{mode}, limit={limit}] opt = {opt}, set = {len(all_T)}, "
+              f"contati = {get_solution_count()} -> {'✅ PASS' if good else '❌ FAIL'}")
+
+    # ripristina la configurazione di default per gli altri test
+    branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job, config=SolverConfig())
+    return ok
+
+
+class _FixedChannel:
+    """Canale del portfolio finto: un altro processo ha già (value, T)."""
+    def __init__(self, value, T):
+        self.value, self.T = value, set(T)
+
+    def read(self):
+        return self.value, set(self.T)
+
+    def publish(self, value, T):
+        pass
+
+
+def test_shared_incumbent(n=24):
+    """
+    Incumbent adottato da un altro processo (portfolio) e mai battuto in
+    "proof": il B&B restituisce il suo set, non un pool vuoto.
+    """
+    jobs = JobGenerator(seed=9).generate(n_jobs=n, r_range=(0, 2 * n), p_range=(1, 8), mode="mix")
+    reset(jobs)
+    branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job, config=SolverConfig(solutions="proof"))
+    opt, opt_sets = get_best_solution()
+    ub, ub_set = heuristic_upper_bound(jobs)
+
+    bb.incumbent_channel = _FixedChannel(opt, opt_sets[0])
+    try:
+        value, T = bb.improve(jobs, set(), ub_set, is_on_time_schedulable, select_job,
+                              config=SolverConfig(solutions="proof"))
+    finally:
+        bb.incumbent_channel = None
+    ok = value == opt and T == opt_sets[0] and value < ub
+    print(f"[shared_incumbent] UB={ub} condiviso={opt} -> ({value}, {len(T)} job) "
+          f"-> {'✅ PASS' if ok else '❌ FAIL'}")
+    return ok
+
+
+def test_adaptive_deterministic(n=36):
+    """
+    La pipeline adattiva decide solo su conteggi: due ricerche identiche
+    danno gli stessi nodi, le stesse chiamate e gli stessi salti per bound.
+    """
+    jobs = JobGenerator(seed=4).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 8), mode="mix")
+    runs = []
+    for _ in range(2):
+        reset(jobs)
+        branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                         config=SolverConfig(solutions="proof", bound_warmup=10))
+        runs.append((stats.nodi_generati, dict(stats.bound_calls), dict(stats.bound_skips)))
+    ok = runs[0] == runs[1] and sum(runs[0][2].values()) > 0
+    print(f"[adaptive_deterministic] nodi={runs[0][0]} chiamate={runs[0][1]} saltati={runs[0][2]} "
+          f"-> {'✅ PASS' if ok else '❌ FAIL'}")
+    return ok
+
+
+def test_checkpoint_resume(node_step=60):
+    """
+    Ricerca spezzata con node_limit + resume() dal checkpoint scritto al
+    limite: stesso ottimo, stessi set ottimi e stessi nodi della ricerca intera.
+    Bound non adattivi: resume() riparte con le statistiche della pipeline
+    adattiva azzerate (non sono nel checkpoint), quindi cambierebbe i nodi.
+    Niente DP sui sottoinsiemi: chiuderebbe l'istanza (12 job) alla radice.
+    """
+    bounds = dict(bounds=("moore", "kp"), adaptive_bounds=False, subset_dp=0)
+    jobs = [Job(i+1, r, p, d) for i, (r, p, d) in enumerate(
+        [(0, 4, 6), (1, 3, 7), (2, 5, 9), (0, 2, 5), (4, 3, 10), (3, 4, 12),
+         (6, 2, 11), (5, 5, 14), (8, 3, 15), (7, 4, 16), (9, 2, 13), (10, 3, 18)])]
+
+    reset(jobs)
+    branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job, config=SolverConfig(**bounds))
+    opt, all_T = get_best_solution()
+    expected = (opt, sorted(map(sorted, all_T)), stats.nodi_generati)
+
+    path = os.path.join(tempfile.mkdtemp(), "bb.ckpt")
+    limit = node_step
+    reset(jobs)
+    branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                     config=SolverConfig(node_limit=limit, checkpoint_path=path, **bounds))
+    n_resume = 0
+    while stats.hit_node_limit:
+        limit += node_step
+        n_resume += 1
+        resume(path, config=SolverConfig(node_limit=limit, checkpoint_path=path, **bounds))
+    opt, all_T = get_best_solution()
+    got = (opt, sorted(map(sorted, all_T)), stats.nodi_generati)
+
+    # un test non serializzabile si rifiuta prima di visitare nodi
+    reset(jobs)
+    try:
+        branch_and_bound(Node(), jobs, lambda js: is_on_time_schedulable(js), select_job,
+                         config=SolverConfig(checkpoint_path=path, **bounds))
+        rejected = False
+    except ValueError:
+        rejected = stats.nodi_generati == 0
+
+    ok = got == expected and n_resume > 0 and rejected
+    print(f"[checkpoint_resume] ottimo = {got[0]}, set = {len(got[1])}, nodi = {got[2]} "
+          f"(atteso {expected[0]}, {len(expected[1])}, {expected[2]}), ripartenze = {n_resume}, "
+          f"lambda rifiutata = {rejected} -> {'✅ PASS' if ok else '❌ FAIL'}")
+    return ok
+
+
+def test_subset_dp_oracle(n_grid=(8, 11, 14), reps=4):
+    """
+    La DP sui sottoinsiemi come verità di riferimento: il B&B (senza DP)
+    deve trovare lo stesso ottimo e gli stessi set T ottimi.
+    """
+    ok = True
+    for n in n_grid:
+        for rep in range(reps):
+            jobs = JobGenerator(seed=1000 * n + rep).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 8))
+            C = earliest_completion(jobs)
+            all_ids = {job.id for job in jobs}
+            dp_sets = sorted(sorted(all_ids - mask_to_ids(jobs, int(m))) for m in optimal_masks(C))
+
+            reset(jobs)
+            branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                             config=SolverConfig(subset_dp=0, fast_paths=False))
+            opt, all_T = get_best_solution()
+            bb_sets = sorted(map(sorted, all_T))
+
+            good = opt == len(dp_sets[0]) and bb_sets == dp_sets
+            ok = ok and good
+            print(f"[subset_dp_oracle] n={n:2d} rep={rep} DP={len(dp_sets[0])} ({len(dp_sets)} ottimi) "
+                  f"B&B={opt} ({len(bb_sets)} ottimi) -> {'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def test_incremental(n=24, edits=12):
+    """
+    Re-solve incrementale dopo modifiche what-if (r, p, d, aggiunte,
+    cancellazioni): stesso ottimo di un B&B a freddo sull'istanza modificata,
+    con meno nodi in totale. Senza DP sui sottoinsiemi, che chiuderebbe
+    l'istanza alla radice: così le cache di oracolo e tabella di
+    trasposizione (update_job / remove_job, keep_caches) lavorano davvero.
+    """
+    jobs = JobGenerator(seed=11).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 8))
+    inc = IncrementalSolver(jobs, config=SolverConfig(subset_dp=0, tt_size=200_000, name="incremental"))
+    inc.solve()
+    warm_nodes = cold_nodes = 0
+    script = [("d", 0, -4), ("r", 1, 5), ("add", Job(900, 10, 3, 16), None), ("p", 2, 3),
+              ("rm", 3, None), ("d", 4, 6), ("r", 5, -3), ("p", 6, -2), ("add", Job(901, 0, 2, 4), None),
+              ("rm", 900, None), ("d", 7, -10), ("r", 8, 12)][:edits]
+    ok = True
+    for kind, target, delta in script:
+        if kind == "add":
+            inc.add_job(target)
+        else:
+            jid = target if kind == "rm" and target >= 900 else inc.jobs[target].id
+            job = next(j for j in inc.jobs if j.id == jid)
+            if kind == "rm":
+                inc.remove_job(jid)
+            elif kind == "r":
+                inc.update_job(jid, r=max(0, job.r + delta))
+            elif kind == "p":
+                inc.update_job(jid, p=max(1, job.p + delta))
+            else:
+                inc.update_job(jid, d=max(job.r + job.p, job.d + delta))
+        value, T = inc.solve()
+
+        current = list(inc.jobs)
+        reset(current)
+        branch_and_bound(Node(), current, is_on_time_schedulable, select_job,
+                         config=SolverConfig(solutions="proof", subset_dp=0))
+        opt, _ = get_best_solution()
+        warm_nodes += inc.last["nodes"]
+        cold_nodes += stats.nodi_generati
+        good = (value == opt == len(T) and inc.last["proven"]
+                and is_on_time_schedulable([j for j in current if j.id not in T]))
+        ok = ok and good
+        print(f"[incremental] {kind:<3} -> tardy={value} (freddo {opt}), nodi={inc.last['nodes']} "
+              f"(freddo {stats.nodi_generati}) -> {'✅ PASS' if good else '❌ FAIL'}")
+    good = 0 < warm_nodes < cold_nodes
+    print(f"[incremental] nodi totali: incrementale {warm_nodes}, a freddo {cold_nodes} "
+          f"-> {'✅ PASS' if good else '❌ FAIL'}")
+    return ok and good
+
+
+def test_progress(n=24):
+    """
+    Report di avanzamento: righe durante la ricerca (progress_every=0 ->
+    una ogni PROGRESS_EVERY nodi), stima dell'albero >= nodi visti, e a
+    ricerca finita frazione esplorata 1 e gap 0. Con node_limit la stima
+    resta nelle statistiche.
+    """
+    jobs = JobGenerator(seed=31).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 8), mode="mix")
+    lines = []
+    bb.progress_out = lines.append
+    try:
+        reset(jobs)
+        branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                         config=SolverConfig(progress_every=0, subset_dp=0))
+        rows = bb.progress.lines
+        opt, _ = get_best_solution()
+        nodes = stats.nodi_generati
+        ok = (len(rows) == len(lines) >= 2 and abs(stats.frazione_esplorata - 1) < 1e-9
+              and rows[-1]["gap"] == 0 and rows[-1]["nodes"] == nodes
+              and all(r["tree_estimate"] is None or r["tree_estimate"] >= r["nodes"] for r in rows)
+              and "conclusa" in lines[-1])
+
+        reset(jobs)
+        branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                         config=SolverConfig(progress_every=0, subset_dp=0, node_limit=nodes // 2))
+        last = bb.progress.last
+        ok = ok and stats.hit_node_limit and 0 < stats.frazione_esplorata < 1 and last["eta"] is not None
+    finally:
+        bb.progress_out = None
+    print(f"[progress] {len(lines)} righe, nodi={nodes}, ottimo={opt}, "
+          f"a metà: albero≈{last['tree_estimate']:.0f} ({last['fraction']:.1%}) "
+          f"-> {'✅ PASS' if ok else '❌ FAIL'}")
+    return ok
+
+
+class _Counter(SearchCallbacks):
+    def __init__(self):
+        self.nodes = self.branches = self.bounds = 0
+        self.prunes = dict.fromkeys(PRUNE_REASONS, 0)
+        self.incumbents = []
+
+    def on_node(self, node):
+        self.nodes += 1
+
+    def on_prune(self, node, reason):
+        self.prunes[reason] += 1
+
+    def on_incumbent(self, value, T):
+        self.incumbents.append((value, set(T)))
+
+    def on_branch(self, node, job):
+        self.branches += 1
+
+    def on_bound(self, provider, value, seconds):
+        self.bounds += 1
+
+
+def test_callbacks(n=20):
+    """
+    Callback della ricerca (DFS e best-first): gli eventi tornano con le
+    statistiche (nodi = potature + branching), gli incumbent scendono fino
+    all'ottimo con set T ammissibili. Un callback con solo on_prune lascia
+    gli altri eventi spenti.
+    """
+    jobs = JobGenerator(seed=41).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 8), mode="mix")
+    ok = True
+    for selection in ("dfs", "best_first"):
+        cb = _Counter()
+        bb.set_callbacks(cb)
+        try:
+            reset(jobs)
+            branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                             config=SolverConfig(node_selection=selection, tt_size=10_000, subset_dp=0))
+        finally:
+            bb.set_callbacks(None)
+        opt, _ = get_best_solution()
+        values = [v for v, _ in cb.incumbents]
+        good = (cb.nodes == stats.nodi_generati == sum(cb.prunes.values()) + cb.branches
+                and cb.prunes["bound"] == stats.fathom_lb and cb.prunes["tt"] == stats.fathom_tt
+                and cb.prunes["dp"] == stats.chiamate_dp
+                and cb.bounds == sum(stats.bound_calls.values())
+                and values == sorted(set(values), reverse=True) and (not values or values[-1] == opt)
+                and all(len(T) == v and is_on_time_schedulable([j for j in jobs if j.id not in T])
+                        for v, T in cb.incumbents))
+        ok = ok and good
+        print(f"[callbacks] {selection:10s} nodi={cb.nodes} branching={cb.branches} potature={cb.prunes} "
+              f"incumbent={values} -> {'✅ PASS' if good else '❌ FAIL'}")
+
+    class OnlyPrune(SearchCallbacks):
+        def on_prune(self, node, reason):
+            pass
+    bb.set_callbacks(OnlyPrune())
+    only = bb._on_prune is not None and bb._on_node is None and bb.pipeline.on_bound is None
+    bb.set_callbacks(None)
+    ok = ok and only and bb._on_prune is None
+    return ok
+
+
+def test_search_trace(n=20):
+    """
+    Traccia binaria (blocchi piccoli per forzare più scritture): un record
+    per nodo, padri coerenti (profondità - 1, branching), chiusure e bound
+    che tornano con le statistiche, sottoalbero della radice = tutti i nodi.
+    """
+    jobs = JobGenerator(seed=41).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 8), mode="mix")
+    path = os.path.join(tempfile.mkdtemp(), "run.trace")
+    ok = True
+    for selection in ("dfs", "best_first"):
+        reset(jobs)
+        with record_trace(path, chunk=500):
+            branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job,
+                             config=SolverConfig(node_selection=selection, subset_dp=0))
+        header, rec = load_trace(path)
+        hist = prune_histogram(rec)
+        child = rec["parent"] >= 0
+        parents = rec[rec["parent"][child]]
+        strength = bound_strength(rec, header["providers"])
+        sizes = subtree_sizes(rec)
+        good = (len(rec) == stats.nodi_generati and child.sum() == len(rec) - 1
+                and (parents["depth"] == rec["depth"][child] - 1).all()
+                and (parents["reason"] == REASONS.index("branch")).all()
+                and (rec["parent"][child] < rec["id"][child]).all()
+                and hist["bound"].sum() == stats.fathom_lb and hist["open"].sum() == 0
+                and hist["branch"].sum() * 2 == len(rec) - 1
+                and all(strength[b]["calls"].sum() == stats.bound_calls.get(b, 0) for b in header["providers"])
+                and sizes[0] == len(rec) and heavy_path(rec, sizes)[0]["size"] == len(rec))
+        ok = ok and good
+        print(f"[search_trace] {selection:10s} record={len(rec)} (nodi {stats.nodi_generati}), "
+              f"file={os.path.getsize(path)} byte -> {'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def test_algorithm_selection():
+    """
+    Feature su un'istanza a mano (due blocchi separati) e selezione da un
+    modello giocattolo: "PEDD_only" vince sulle istanze piccole, "adaptive"
+    sulle grandi. La configurazione scelta deve dare lo stesso ottimo.
+    """
+    jobs = [Job(1, 0, 3, 4), Job(2, 1, 2, 4), Job(3, 10, 2, 13), Job(4, 11, 4, 15)]
+    f = instance_features(jobs)
+    ok = f["blocks"] == 2 and f["H"] == 15 and abs(f["load"] - 11 / 15) < 1e-9 and set(f) == set(FEATURES)
+
+    rows = []
+    for n in (10, 12, 14, 100, 120, 140):
+        feats = instance_features(JobGenerator(seed=n).generate(n_jobs=n, r_range=(0, 2 * n)))
+        small = n < 50
+        rows.append({**feats, "config": "PEDD_only", "runtime_s": 0.01 if small else 5.0})
+        rows.append({**feats, "config": "adaptive", "runtime_s": 0.1 if small else 1.0})
+    model = train(rows, k=2)
+
+    small_jobs = JobGenerator(seed=7).generate(n_jobs=12, r_range=(0, 24))
+    big_jobs = JobGenerator(seed=8).generate(n_jobs=110, r_range=(0, 220))
+    cfg_small = select_config(small_jobs, model=model, solutions="proof")
+    cfg_big = select_config(big_jobs, model=model)
+    ok = ok and cfg_small.name == "PEDD_only" and cfg_small.bounds == ("moore",) and cfg_big.name == "adaptive"
+
+    reset(small_jobs)
+    branch_and_bound(Node(), small_jobs, is_on_time_schedulable, select_job, config=cfg_small)
+    chosen, _ = get_best_solution()
+    reset(small_jobs)
+    branch_and_bound(Node(), small_jobs, is_on_time_schedulable, select_job)
+    opt, _ = get_best_solution()
+    ok = ok and chosen == opt
+    print(f"[algorithm_selection] blocchi={f['blocks']:.0f}, piccola -> {cfg_small.name}, "
+          f"grande -> {cfg_big.name}, ottimo {chosen} (default {opt}) -> {'✅ PASS' if ok else '❌ FAIL'}")
+    return ok
+
+
 if __name__ == "__main__":
     print("== Running basic validation tests ==\n", flush=True)
 
@@ -222,6 +603,16 @@ if __name__ == "__main__":
         ("release_forced", test_release_forced),
         ("symmetry_many_opt", test_symmetry_many_opt),
         ("moore_strict_lb", test_moore_strict_lb),
+        ("solution_modes", test_solution_modes),
+        ("shared_incumbent", test_shared_incumbent),
+        ("adaptive_deterministic", test_adaptive_deterministic),
+        ("checkpoint_resume", test_checkpoint_resume),
+        ("subset_dp_oracle", test_subset_dp_oracle),
+        ("incremental", test_incremental),
+        ("algorithm_selection", test_algorithm_selection),
+        ("progress", test_progress),
+        ("callbacks", test_callbacks),
+        ("search_trace", test_search_trace),
     ]
 
     n_pass = 0
@@ -0,0 +1,280 @@
+import sys
+import os
+import random
+import time
+
+# Aggiusta il path al progetto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../branch_and_bound/')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bb import reset, branch_and_bound, get_best_solution, iterative_deepening, heuristic_upper_bound
+from util import is_on_time_schedulable, select_job
+from node import Node
+from job import Job
+from job_generator import JobGenerator
+from edd_astar import solve_edd_astar
+from special_cases import solve_special
+from beam_search import beam_search
+from lns import lns
+from rolling_horizon import rolling_horizon
+from portfolio import solve_portfolio
+from lower_bound.mip_interface import read_ampl_dat, solve_time_indexed
+
+TESTS = os.path.abspath(os.path.join(os.path.dirname(__file__), '../ampl_model/test_dat'))
+
+# stessi casi (e stessi ottimi attesi) di ampl_test.py
+known = [
+    ("test_all_on_time.dat", 0),
+    ("test_one_tardy.dat", 1),
+    ("test_k_tardy_block.dat", 3),
+    ("test_release_forced.dat", 1),
+    ("test_symmetry_many_opt.dat", 2),
+    ("moore_strict_lb.dat", 0),
+]
+
+
+def test_known_dat():
+    ok = True
+    for datfile, expected in known:
+        jobs = read_ampl_dat(os.path.join(TESTS, datfile))
+        res = solve_time_indexed(jobs)
+        relax = solve_time_indexed(jobs, relax=True)
+
+        # il tardy set deve essere coerente con l'obiettivo
+        good = (res["tardy"] == expected
+                and len(res["tardy_set"]) == expected
+                and relax["tardy"] <= expected + 1e-6)
+        ok = ok and good
+        print(f"[{datfile}] HiGHS = {res['tardy']} (LP {relax['tardy']:.3f}), atteso = {expected} -> "
+              f"{'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def test_mip_vs_bb(n_grid=(8, 12), reps=3, r_range=(0, 0), deepening=False):
+    """
+    Il B&B è esatto (anche con release date): HiGHS deve restituire lo stesso ottimo.
+    deepening=True usa iterative_deepening invece di branch_and_bound.
+    """
+    ok = True
+    for n in n_grid:
+        for rep in range(reps):
+            jobs = JobGenerator(seed=100 * n + rep).generate(n_jobs=n, r_range=r_range, p_range=(1, 5))
+
+            if deepening:
+                opt_bb, _ = iterative_deepening(jobs, is_on_time_schedulable, select_job)
+            else:
+                reset(jobs)
+                branch_and_bound(Node(), jobs, is_on_time_schedulable, select_job)
+                opt_bb, _ = get_best_solution()
+
+            res = solve_time_indexed(jobs)
+            good = res["tardy"] == opt_bb
+            ok = ok and good
+            print(f"n={n:3d} rep={rep} | BB={opt_bb:3d} HiGHS={res['tardy']:3d} "
+                  f"({res['time']:.3f}s) {'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def _agreeable_instance(n, seed):
+    """Release e due date nello stesso ordine (caso in cui la sequenza EDD è dominante)."""
+    rnd = random.Random(seed)
+    r = sorted(rnd.randint(0, 3 * n) for _ in range(n))
+    jobs, d = [], 0
+    for j in range(n):
+        p = rnd.randint(1, 6)
+        d = max(d, r[j] + p + rnd.randint(0, 4))
+        jobs.append(Job(j + 1, r[j], p, d))
+    rnd.shuffle(jobs)
+    return jobs
+
+
+def test_edd_astar_vs_mip(n_grid=(10, 16), reps=3):
+    """
+    Motore A* in ordine EDD: esatto (= HiGHS) con r_j = 0, con r/d agreeable
+    e con release arbitrarie (grazie ai rinvii); la sequenza restituita
+    mette tutti i job non tardy on-time.
+    """
+    ok = True
+    # in EDD B (d=20) va prima di A, che finisce a 30 > 25; A subito e poi B: nessun tardy
+    jobs = [Job(1, 0, 10, 25), Job(2, 10, 10, 20)]
+    res = solve_edd_astar(jobs)
+    good = res["tardy"] == 0 and res["sequence"] == [1, 2] and not res["edd_dominant"]
+    ok = ok and good
+    print(f"A prima di B (non EDD) | A*={res['tardy']} sequenza={res['sequence']} "
+          f"{'✅ PASS' if good else '❌ FAIL'}")
+    for n in n_grid:
+        for rep in range(reps):
+            seed = 100 * n + rep
+            cases = [("r=0", JobGenerator(seed=seed).generate(n_jobs=n, r_range=(0, 0), p_range=(1, 5))),
+                     ("agreeable", _agreeable_instance(n, seed)),
+                     ("r generiche", JobGenerator(seed=seed).generate(n_jobs=n, r_range=(0, 20), p_range=(1, 5)))]
+            for kind, jobs in cases:
+                res = solve_edd_astar(jobs)
+                opt = solve_time_indexed(jobs)["tardy"]
+                by_id = {job.id: job for job in jobs}
+                t = 0
+                on_time = True
+                for jid in res["sequence"]:
+                    t = max(t, by_id[jid].r) + by_id[jid].p
+                    on_time = on_time and t <= by_id[jid].d
+                good = res["tardy"] == opt == len(res["tardy_set"]) and on_time
+                good = good and set(res["sequence"]) | res["tardy_set"] == set(by_id)
+                good = good and (kind == "r generiche" or res["edd_dominant"])
+                ok = ok and good
+                print(f"n={n:3d} rep={rep} {kind:<12}| A*={res['tardy']:3d} (EDD dominante={res['edd_dominant']}, "
+                      f"stati={res['states']}) HiGHS={opt:3d} {'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def test_special_cases_vs_mip(n_grid=(10, 16), reps=3):
+    """Percorsi rapidi (release uguali, p = 1, agreeable): classe giusta e ottimo = HiGHS."""
+    ok = True
+    for n in n_grid:
+        for rep in range(reps):
+            seed = 100 * n + rep
+            unit = JobGenerator(seed=seed).generate(n_jobs=n, r_range=(0, n), p_range=(1, 1))
+            cases = [("equal_release", JobGenerator(seed=seed).generate(n_jobs=n, r_range=(3, 3), p_range=(1, 5))),
+                     ("unit_p", unit),
+                     ("agreeable", _agreeable_instance(n, seed))]
+            for kind, jobs in cases:
+                res = solve_special(jobs)
+                opt = solve_time_indexed(jobs)["tardy"]
+                good = (res is not None and res["class"] == kind and res["tardy"] == opt
+                        and len(res["tardy_set"]) == opt
+                        and is_on_time_schedulable([j for j in jobs if j.id not in res["tardy_set"]]))
+                ok = ok and good
+                print(f"n={n:3d} rep={rep} {kind:<14}| fast={res and res['tardy']} HiGHS={opt:3d} "
+                      f"{'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def test_beam_search(n_grid=(20, 30), reps=3, n_large=10_000):
+    """
+    Beam search: lb <= HiGHS <= beam su istanze piccole, e su n_large job
+    una soluzione ammissibile con lb <= tardy in pochi secondi.
+    """
+    ok = True
+    for n in n_grid:
+        for rep in range(reps):
+            jobs = JobGenerator(seed=100 * n + rep).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 10))
+            res = beam_search(jobs)
+            opt = solve_time_indexed(jobs)["tardy"]
+            good = res["lower_bound"] <= opt <= res["tardy"] == len(res["tardy_set"])
+            ok = ok and good
+            print(f"n={n:3d} rep={rep} | beam={res['tardy']:3d} HiGHS={opt:3d} lb={res['lower_bound']:3d} "
+                  f"{'✅ PASS' if good else '❌ FAIL'}")
+
+    jobs = JobGenerator(seed=7).generate(n_jobs=n_large, r_range=(0, 3 * n_large), p_range=(1, 10))
+    res = beam_search(jobs)
+    good = res["lower_bound"] <= res["tardy"] == len(res["tardy_set"]) and res["time"] < 10
+    ok = ok and good
+    print(f"n={n_large} | beam={res['tardy']} lb={res['lower_bound']} gap={res['gap']} "
+          f"tempo={res['time']:.2f}s {'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def test_beam_parameters():
+    """
+    width e lookahead cambiano il risultato: il primo job entra on-time ma
+    blocca gli altri due. Greedy (width=1, lookahead=0) tiene il primo e
+    trova 2 tardy; un beam più largo o il bound sui job successivi trovano 1.
+    """
+    jobs = [Job(1, 0, 10, 10), Job(2, 0, 5, 12), Job(3, 0, 5, 13)]
+    opt = solve_time_indexed(jobs)["tardy"]
+    got = {(w, la): beam_search(jobs, width=w, lookahead=la)["tardy"]
+           for w, la in ((1, 0), (8, 0), (1, 24))}
+    good = opt == 1 and got == {(1, 0): 2, (8, 0): 1, (1, 24): 1}
+    print(f"beam width/lookahead | {got} HiGHS={opt} {'✅ PASS' if good else '❌ FAIL'}")
+    return good
+
+
+def test_lns(n_grid=(40, 60), max_iter=60):
+    """LNS (B&B come sotto-solver): HiGHS <= LNS <= euristica e set on-time schedulabile."""
+    ok = True
+    for n in n_grid:
+        jobs = JobGenerator(seed=n).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 10))
+        res = lns(jobs, max_iter=max_iter, seed=n)
+        opt = solve_time_indexed(jobs)["tardy"]
+        ub = heuristic_upper_bound(jobs)[0]
+        good = (opt <= res["tardy"] <= ub and res["tardy"] == len(res["tardy_set"])
+                and is_on_time_schedulable([j for j in jobs if j.id not in res["tardy_set"]]))
+        ok = ok and good
+        print(f"n={n:3d} | LNS={res['tardy']:3d} (euristica {ub}, {res['accepted']}/{res['iterations']} "
+              f"accettate) HiGHS={opt:3d} {'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def _committed_schedule_ok(committed):
+    """Job fissati on-time: nessuna sovrapposizione, release e due date rispettate."""
+    t = 0
+    for job, start in sorted((c for c in committed if c[1] is not None), key=lambda c: c[1]):
+        if start < t or start < job.r or start + job.p > job.d:
+            return False
+        t = start + job.p
+    return True
+
+
+def test_rolling_horizon(n=60, n_stream=20_000):
+    """Orizzonte mobile: schedula valida e >= HiGHS; flusso lungo da generatore."""
+    ok = True
+    jobs = sorted(JobGenerator(seed=n).generate(n_jobs=n, r_range=(0, 3 * n), p_range=(1, 10)),
+                  key=lambda j: j.r)
+    opt = solve_time_indexed(jobs)["tardy"]
+    for engine in ("bb", "beam"):
+        committed = []
+        res = rolling_horizon(iter(jobs), window=20, engine=engine,
+                              on_commit=lambda job, start: committed.append((job, start)))
+        good = (len(committed) == n and res["tardy"] >= opt and _committed_schedule_ok(committed)
+                and res["tardy"] == len(res["tardy_set"]))
+        ok = ok and good
+        print(f"n={n:3d} {engine:<5}| rolling={res['tardy']:3d} HiGHS={opt:3d} finestre={res['windows']} "
+              f"{'✅ PASS' if good else '❌ FAIL'}")
+
+    gen = JobGenerator(seed=5)
+    stream = (job for chunk in range(n_stream // 1000)
+              for job in sorted(gen.generate(n_jobs=1000, r_range=(3000 * chunk, 3000 * (chunk + 1) - 1),
+                                             p_range=(1, 10)), key=lambda j: j.r))
+    res = rolling_horizon(stream, keep_tardy_set=False)
+    good = res["jobs"] == n_stream == res["tardy"] + res["on_time"]
+    ok = ok and good
+    print(f"flusso n={n_stream} | tardy={res['tardy']} {res['jobs_per_sec']:.0f} job/s "
+          f"{'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+def test_portfolio(n_grid=(16, 22), r_range=(0, 40)):
+    """Portfolio (special, B&B con più regole, MIP): ottimo dimostrato = HiGHS."""
+    ok = True
+    for n in n_grid:
+        for rr in (r_range, (0, 0)):
+            jobs = JobGenerator(seed=n).generate(n_jobs=n, r_range=rr, p_range=(1, 8))
+            res = solve_portfolio(jobs)
+            opt = solve_time_indexed(jobs)["tardy"]
+            good = (res["proven"] and res["tardy"] == opt == len(res["tardy_set"])
+                    and is_on_time_schedulable([j for j in jobs if j.id not in res["tardy_set"]]))
+            ok = ok and good
+            print(f"n={n:3d} r={rr} | portfolio={res['tardy']:3d} (vince {res['winner']}, "
+                  f"trovata da {res['found_by']}) HiGHS={opt:3d} {'✅ PASS' if good else '❌ FAIL'}")
+
+    # strategia che fallisce: il portfolio non si blocca e restituisce l'euristica
+    jobs = JobGenerator(seed=3).generate(n_jobs=12, r_range=(0, 30), p_range=(1, 8))
+    t0 = time.time()
+    res = solve_portfolio(jobs, strategies=[("bad", "bb", {"branching": "nope"})], time_limit=30)
+    good = (not res["proven"] and res["finished"]["bad"][0] is None and time.time() - t0 < 10
+            and res["tardy"] == len(res["tardy_set"]))
+    ok = ok and good
+    print(f"strategia rotta | finita in {time.time() - t0:.1f}s, tardy={res['tardy']} "
+          f"{'✅ PASS' if good else '❌ FAIL'}")
+    return ok
+
+
+if __name__ == "__main__":
+    print("== HiGHS backend tests ==\n", flush=True)
+    results = [test_known_dat(), test_mip_vs_bb(), test_mip_vs_bb(n_grid=(10, 14), reps=4, r_range=(0, 20)),
+               test_mip_vs_bb(n_grid=(10, 14), reps=4, r_range=(0, 20), deepening=True),
+               test_edd_astar_vs_mip(), test_special_cases_vs_mip(),
+               test_beam_search(), test_beam_parameters(), test_lns(),
+               test_rolling_horizon(), test_portfolio()]
+    n_fail = results.count(False)
+    print(f"\n==== SUMMARY: {len(results) - n_fail} PASS, {n_fail} FAIL ====", flush=True)
+    sys.exit(0 if n_fail == 0 else 1)
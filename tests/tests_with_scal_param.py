@@ -15,27 +15,34 @@ from bb import reset, branch_and_bound, get_best_solution, stats, heuristic_uppe
 from node import Node
 from job_generator import JobGenerator
 from util import is_on_time_schedulable, select_job
+from config import SolverConfig
+from algorithm_selection import CANDIDATES, instance_features
 
 
 # ---------------------------
-# Helpers: metrics + patch LB
+# Helpers: metrics
 # ---------------------------
 
-def _collect_metrics(jobs, run_name=""):
+def _collect_metrics(jobs, run_name="", config=None):
     """
     Esegue 1 run di B&B e raccoglie metriche.
 
+    config (SolverConfig): configurazione del solver; le sue impostazioni
+    finiscono in ogni riga (default = SolverConfig()).
+
     In particolare:
       - ub_heur = bound euristico (tipo Moore/EDD sul problema rilassato, r_j=finti)
       - opt     = ottimo esatto di B&B per 1|r_j|∑U_j
       - gap     = ub_heur - opt (idealmente >= 0 se l'UB è ben definito come upper bound)
     """
+    if config is None:
+        config = SolverConfig(name="default")
     ub_heur, _ = heuristic_upper_bound(jobs)
 
     reset(jobs)
     root = Node()
     t0 = time.time()
-    branch_and_bound(root, jobs, is_on_time_schedulable, select_job)
+    branch_and_bound(root, jobs, is_on_time_schedulable, select_job, config=config)
     t1 = time.time()
 
     opt, _all_T = get_best_solution()
@@ -44,7 +51,7 @@ def _collect_metrics(jobs, run_name=""):
     nd = getattr(stats, 'nodi_generati', 0)
     dep_avg = (getattr(stats, 'profondità_totale', 0) / nd) if nd else 0.0
 
-    return {
+    row = {
         "run": run_name,
         "n": len(jobs),
         "opt_tardy": opt,
@@ -58,57 +65,16 @@ def _collect_metrics(jobs, run_name=""):
         "fathom_leaf": getattr(stats, 'fathom_leaf', 0),
         "runtime_s": (t1 - t0),
         "tightness": TIGHTNESS,
+        "hit_node_limit": getattr(stats, 'hit_node_limit', False),
     }
-
-
-class KnapsackToggle:
-    """
-    Abilita/Disabilita il sotto-bound knapsack senza toccare il codice di bb.py.
-
-    L'idea è confrontare:
-      - solo bound tipo-Moore/EDD (KP disattivato)
-      - bound Moore + knapsack (KP attivo)
-      - no-LB (PEDD e KP entrambi disattivati)
-    """
-    def __init__(self, enable: bool):
-        self.enable = enable
-        import bb as _bb
-        self._bb = _bb
-        self.prev_n = getattr(_bb, "KP_N_MAX", None)
-        self.prev_h = getattr(_bb, "KP_H_MAX", None)
-
-    def __enter__(self):
-        if self.prev_n is None or self.prev_h is None:
-            return
-        if not self.enable:
-            self._bb.KP_N_MAX = -1
-            self._bb.KP_H_MAX = -1
-
-    def __exit__(self, exc_type, exc, tb):
-        if self.prev_n is not None:
-            self._bb.KP_N_MAX = self.prev_n
-        if self.prev_h is not None:
-            self._bb.KP_H_MAX = self.prev_h
-
-
-class NoLBPatch:
-    """
-    Azzera qualunque LB (Node.compute_lb -> 0) per la configurazione 'no_LB'.
-
-    Serve come baseline: B&B puro senza pruning da lower bound,
-    per misurare quanto il bound tipo-Moore + knapsack riduca lo spazio di ricerca.
-    """
-    def __init__(self):
-        self.orig = getattr(Node, "compute_lb", None)
-
-    def __enter__(self):
-        def _noop_compute_lb(self_node, jobs_remain):
-            self_node.lb = 0
-        Node.compute_lb = _noop_compute_lb
-
-    def __exit__(self, exc_type, exc, tb):
-        if self.orig is not None:
-            Node.compute_lb = self.orig
+    for name in getattr(stats, 'bound_calls', {}):
+        row[f"calls_{name}"] = stats.bound_calls[name]
+        row[f"prunes_{name}"] = stats.bound_prunes[name]
+        row[f"time_{name}_s"] = stats.bound_time[name]
+    row.update(config.as_dict())
+    # feature dell'istanza per algorithm_selection (retrain)
+    row.update({f"feat_{k}": v for k, v in instance_features(jobs).items()})
+    return row
 
 
 # ---------------------------
@@ -152,7 +118,7 @@ def experiment_scaling_n(
     out_csv="results_scaling_n.csv",
 ):
     """
-    Esperimento di scaling in n con tightness fissa.
+    Esperimento di scaling in n con tightness fissa (configurazione di default).
 
     Default:
       - r_range = (0,0)  -> r_j = 0, quindi il bound tipo-Moore è formalmente
@@ -191,13 +157,15 @@ def experiment_lb_ablation(
     r_range=(0, 0),
     p_range=(1, 5),
     out_csv="results_lb_ablation.csv",
+    no_lb_node_limit=200_000,
 ):
     """
-    Confronta tre configurazioni di lower bound:
+    Confronta configurazioni di lower bound (SolverConfig):
 
-      A) "PEDD_only" : solo bound principale tipo-Moore/EDD (knapsack OFF)
-      B) "PEDD+KP"   : bound Moore/EDD + knapsack (KP ON)
-      C) "no_LB"     : nessun lower bound (compute_lb -> 0, knapsack OFF)
+      A) "PEDD_only" : solo bound principale tipo-Moore
+      B) "PEDD+KP"   : Moore + knapsack
+      C) "adaptive"  : pipeline adattiva Moore -> knapsack -> Lagrangiano
+      D) "no_LB"     : nessun lower bound (con limite sui nodi)
 
     Default r_range=(0,0) per coerenza con il bound di Moore:
       - i release time sono tutti 0, quindi l'istante di rilascio non interferisce
@@ -209,29 +177,69 @@ def experiment_lb_ablation(
     rows = []
     print(f"== ABLATION dei lower bound (tightness fissa = {TIGHTNESS}, r_range={r_range}) ==")
 
-    def _runs(label, context_managers):
+    configs = [
+        SolverConfig(name="PEDD_only", bounds=("moore",)),
+        SolverConfig(name="PEDD+KP", bounds=("moore", "kp"), adaptive_bounds=False),
+        SolverConfig(name="adaptive"),
+        SolverConfig(name="no_LB", bounds=(), node_limit=no_lb_node_limit),
+    ]
+
+    for cfg in configs:
         for r in range(reps):
             seed = 3000 + r
             jobs = make_jobs(n, mode=mode, r_range=r_range, p_range=p_range, seed=seed)
-            with _chain(context_managers):
-                m = _collect_metrics(jobs, run_name=f"{label}-rep={r}")
-            m["config"] = label
+            m = _collect_metrics(jobs, run_name=f"{cfg.name}-rep={r}", config=cfg)
             rows.append(m)
             print(
-                f"{label:14s} rep={r}  "
+                f"{cfg.name:14s} rep={r}  "
                 f"opt={m['opt_tardy']:3d} ub={m['ub_heur']:3d} gap={m['gap']:3d} "
                 f"nodes={m['nodes']:7d} time={m['runtime_s']:.3f}s"
+                f"{'  [node limit]' if m['hit_node_limit'] else ''}"
             )
 
-    # A) solo PEDD: knapsack OFF
-    _runs("PEDD_only", [KnapsackToggle(enable=False)])
+    _write_csv(rows, out_csv)
+    _print_summary(rows, key="config")
+    print(f"[OK] CSV salvato in {out_csv}")
+
 
-    # B) PEDD + knapsack
-    _runs("PEDD+KP", [KnapsackToggle(enable=True)])
+# ------------------------------------------------
+# Esperimento 3: dati per la selezione dell'algoritmo
+# ------------------------------------------------
 
-    # C) no-LB: azzera anche PEDD
-    _runs("no_LB", [NoLBPatch(), KnapsackToggle(enable=False)])
+def experiment_selection(
+    n_grid=(20, 30, 40),
+    reps=3,
+    modes=("tight", "mix"),
+    r_factors=(0, 1, 3),
+    p_range=(1, 5),
+    node_limit=20_000,
+    out_csv="results_selection.csv",
+):
+    """
+    Esegue tutte le configurazioni di algorithm_selection.CANDIDATES sulle
+    stesse istanze (n, mode e release r_j in [0, r_factor * n] variabili),
+    così che il CSV serva da training set:
+
+        python branch_and_bound/algorithm_selection.py retrain results_selection.csv
 
+    Le run ferme a node_limit restano nel CSV (hit_node_limit) e il modello
+    le penalizza.
+    """
+    rows = []
+    print(f"== SELEZIONE ALGORITMO ({len(CANDIDATES)} configurazioni, node_limit={node_limit}) ==")
+    for n in n_grid:
+        for mode in modes:
+            for rf in r_factors:
+                for r in range(reps):
+                    seed = 5000 * n + 100 * rf + r + (50 if mode == "mix" else 0)
+                    jobs = make_jobs(n, mode=mode, r_range=(0, rf * n), p_range=p_range, seed=seed)
+                    for name, params in CANDIDATES.items():
+                        cfg = SolverConfig(name=name, node_limit=node_limit, **params)
+                        m = _collect_metrics(jobs, run_name=f"n={n}-{mode}-r{rf}-rep={r}", config=cfg)
+                        rows.append(m)
+                    best = min(rows[-len(CANDIDATES):], key=lambda m: m["runtime_s"])
+                    print(f"n={n:3d} {mode:5s} r_factor={rf} rep={r}  migliore={best['config']} "
+                          f"({best['runtime_s']:.3f}s)")
     _write_csv(rows, out_csv)
     _print_summary(rows, key="config")
     print(f"[OK] CSV salvato in {out_csv}")
@@ -241,30 +249,13 @@ def experiment_lb_ablation(
 # Utility interne
 # ---------------
 
-class _chain:
-    """Permette 'with' annidati in una sola riga: with _chain([cm1, cm2, ...])"""
-    def __init__(self, cms):
-        self.cms = cms
-        self._exited = []
-
-    def __enter__(self):
-        for cm in self.cms:
-            cm.__enter__()
-            self._exited.append(cm)
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        while self._exited:
-            cm = self._exited.pop()
-            cm.__exit__(exc_type, exc, tb)
-
-
 def _write_csv(rows, path):
     if not rows:
         return
-    fieldnames = list(rows[0].keys())
+    # le colonne per-bound dipendono dalla configurazione: unione ordinata
+    fieldnames = list(dict.fromkeys(k for r in rows for k in r))
     with open(path, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w = csv.DictWriter(f, fieldnames=fieldnames, restval="")
         w.writeheader()
         for r in rows:
             w.writerow(r)
@@ -327,4 +318,7 @@ if __name__ == "__main__":
         out_csv=os.path.join(outdir, "results_lb_ablation.csv"),
     )
 
+    # 3) Training set per algorithm_selection
+    experiment_selection(out_csv=os.path.join(outdir, "results_selection.csv"))
+
     print(f"Tutti i CSV sono in: {outdir}")